@@ -63,13 +63,12 @@ def estado_serializado(torres):
 """
 
 def estado_serializado(torres):
-    estado = []
-    for nombre in ["Origen", "Auxiliar", "Destino"]:
-        if nombre != "Origen":
-            estado.append(0)  # Separador al principio de cada torre
+    # 2 bits por disco con el índice de su torre ("Origen" = 0 no aporta bits)
+    estado = 0
+    for indice, nombre in ((1, "Auxiliar"), (2, "Destino")):
         for d in torres[nombre]:
-            estado.append(d.tamanio)
-    return tuple(estado)
+            estado |= indice << (2 * (d.tamanio - 1))
+    return estado
 
 def copiar_torres(torres):
     nuevas_torres = {}
@@ -97,28 +96,69 @@ def heuristica_prioridad_discos_pequeños(torres):
     return total_discos - correcto
 
 
+def presupuestos_restantes(torres):
+    # Movimientos que le quedan a cada disco frágil, ordenados por tamaño
+    restantes = []
+    for nombre in ["Origen", "Auxiliar", "Destino"]:
+        for d in torres[nombre]:
+            if isinstance(d, DiscoFragil):
+                restantes.append((d.tamanio, d.max_movimientos - d.movimientos_realizados))
+    restantes.sort()
+    return tuple(r for _, r in restantes)
+
+
+def esta_dominado(frente, costo, restantes):
+    """
+    Un estado con la misma posición de discos ya alcanzado con costo <= y con al menos los mismos
+    movimientos restantes en cada disco frágil puede hacer todo lo que haga éste, así que éste se poda.
+    """
+    for costo_previo, restantes_previos in frente:
+        if costo_previo <= costo and all(a >= b for a, b in zip(restantes_previos, restantes)):
+            return True
+    return False
+
+
+def reconstruir_camino(camino):
+    movimientos = []
+    while camino is not None:
+        camino, movimiento = camino
+        movimientos.append(movimiento)
+    movimientos.reverse()
+    return movimientos
+
+
 def hanoi_branch_and_bound(torres_iniciales):
     inicio = time.time()
     heap = []
     visitados = {}
-    mejor_solucion = None
+    mejor_camino = None
+    mejor_costo = None
     contador = itertools.count()
     nodos_explorados = 0
 
     estado_inicial = estado_serializado(torres_iniciales)
-    heapq.heappush(heap, (0, 0, next(contador), estado_inicial, torres_iniciales, []))
+    # camino es el último eslabón (camino_padre, movimiento): los hijos comparten el prefijo en vez de copiarlo
+    heapq.heappush(heap, (0, 0, next(contador), estado_inicial, torres_iniciales, None))
 
     while heap:
         _, costo, _, estado, torres, camino = heapq.heappop(heap)
         nodos_explorados += 1
 
-        if estado in visitados and visitados[estado] <= costo:
+        # visitados guarda, por posición de los discos, el frente de Pareto (costo, presupuestos restantes)
+        restantes = presupuestos_restantes(torres)
+        frente = visitados.setdefault(estado, [])
+        if esta_dominado(frente, costo, restantes):
             continue
-        visitados[estado] = costo
+        frente[:] = [
+            (c, r) for c, r in frente
+            if not (costo <= c and all(a >= b for a, b in zip(restantes, r)))
+        ]
+        frente.append((costo, restantes))
 
         if len(torres["Destino"]) == total_discos:
-            if mejor_solucion is None or len(camino) < len(mejor_solucion):
-                mejor_solucion = list(camino)
+            if mejor_costo is None or costo < mejor_costo:
+                mejor_camino = camino
+                mejor_costo = costo
             continue
 
         for origen in torres:
@@ -136,24 +176,23 @@ def hanoi_branch_and_bound(torres_iniciales):
                 torres[origen].pop()
                 torres[destino].append(disco)
                 disco.mover()
-                camino.append((origen, destino, disco.tamanio))
 
                 nuevo_estado = estado_serializado(torres)
                 nuevo_costo = costo + 1
                 heuristica = heuristica_prioridad_discos_pequeños(torres)
                 estimado_total = nuevo_costo + heuristica
 
-                if mejor_solucion is None or estimado_total < len(mejor_solucion):
+                if mejor_costo is None or estimado_total < mejor_costo:
                     heapq.heappush(
                         heap,
-                        (estimado_total, nuevo_costo, next(contador), nuevo_estado, copiar_torres(torres), list(camino))
+                        (estimado_total, nuevo_costo, next(contador), nuevo_estado, copiar_torres(torres), (camino, (origen, destino, disco.tamanio)))
                     )
 
-                camino.pop()
                 torres[destino].pop()
                 disco.deshacer_movimiento()
                 torres[origen].append(disco)
 
+    mejor_solucion = None if mejor_costo is None else reconstruir_camino(mejor_camino)
     fin = time.time()
     return mejor_solucion, nodos_explorados, fin - inicio
 
@@ -0,0 +1,191 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import e6_backtracking_iterativo as motor
+from estadisticas_soluciones import EstadisticasSoluciones, acumular
+
+# Estrategias exhaustivas que se pueden repartir: la 3 corta en la primera solución y la 4 no usa visitados
+ESTRATEGIAS_PARALELAS = (1, 2, 5)
+
+
+def describir_torres(torres):
+    """
+    Convierte las torres en datos simples (sin objetos Disco) para mandarlas a otro proceso.
+    Returns:
+        dict: Para cada torre, lista de (tamanio, max_movimientos o None, movimientos_realizados).
+    """
+    descripcion = {}
+    for nombre, pila in torres.items():
+        descripcion[nombre] = [
+            (d.tamanio, getattr(d, "max_movimientos", None), getattr(d, "movimientos_realizados", 0)) for d in pila
+        ]
+    return descripcion
+
+
+def construir_torres(descripcion):
+    """Inversa de describir_torres, con los discos de e6_backtracking_iterativo."""
+    torres = {}
+    for nombre, pila in descripcion.items():
+        torres[nombre] = []
+        for tamanio, maximo, realizados in pila:
+            if maximo is None:
+                disco = motor.Disco(tamanio)
+            else:
+                disco = motor.DiscoFragil(tamanio, maximo)
+                disco.movimientos_realizados = realizados
+            torres[nombre].append(disco)
+    return torres
+
+
+def dividir(torres, total_discos, estrategia, profundidad, movimientos, visitados):
+    """
+    Recorre los primeros niveles del árbol con las mismas podas y en el mismo orden que el motor serial.
+    Yields:
+        tuple: ("solucion", movimientos) para las soluciones que aparecen antes de 'profundidad', o
+               ("subarbol", prefijo, visitados) para cada nodo a esa profundidad: los movimientos que llevan a él y
+               los estados del camino, que es todo lo que el motor necesita para seguir desde ahí.
+    """
+    if len(movimientos) == profundidad:
+        yield ("subarbol", list(movimientos), list(visitados))
+        return
+
+    estado_actual = motor.estado_serializado(torres)
+    if estado_actual in visitados:
+        return
+    visitados.add(estado_actual)
+
+    if len(torres["Destino"]) == total_discos:
+        yield ("solucion", list(movimientos))
+        visitados.remove(estado_actual)
+        return
+
+    nombres = motor.TORRES if estrategia == 5 else list(torres)
+    for origen in nombres:
+        if not torres[origen]:
+            continue
+        disco = torres[origen][-1]
+        for destino in nombres:
+            if (
+                origen == destino or
+                (torres[destino] and torres[destino][-1].tamanio < disco.tamanio) or
+                not disco.puede_moverse() or
+                (estrategia != 1 and movimientos and disco.tamanio == movimientos[-1][2])
+            ):
+                continue
+
+            torres[origen].pop()
+            torres[destino].append(disco)
+            disco.mover()
+            movimientos.append((origen, destino, disco.tamanio))
+
+            yield from dividir(torres, total_discos, estrategia, profundidad, movimientos, visitados)
+
+            movimientos.pop()
+            torres[destino].pop()
+            disco.deshacer_movimiento()
+            torres[origen].append(disco)
+    visitados.remove(estado_actual)
+
+
+def explorar_subarbol(descripcion, total_discos, estrategia, prefijo, visitados, resumir):
+    """
+    Trabajo de cada proceso: rehace el prefijo sobre torres nuevas y sigue con el motor serial desde ese nodo.
+    Returns:
+        EstadisticasSoluciones si 'resumir', si no la lista de soluciones del subárbol en el orden serial.
+    """
+    torres = construir_torres(descripcion)
+    for origen, destino, _ in prefijo:
+        disco = torres[origen].pop()
+        disco.mover()
+        torres[destino].append(disco)
+    soluciones = motor.iter_soluciones(
+        torres, total_discos, estrategia, movimientos=list(prefijo), visitados=set(visitados), copiar=not resumir
+    )
+    return acumular(soluciones) if resumir else list(soluciones)
+
+
+def repartir(torres, total_discos, estrategia, profundidad, procesos, resumir):
+    """
+    Divide el árbol y manda los subárboles a un ProcessPoolExecutor.
+    Yields:
+        Por cada tarea, en el orden serial: ("solucion", movimientos) o ("subarbol", resultado de explorar_subarbol).
+    """
+    if estrategia not in ESTRATEGIAS_PARALELAS:
+        raise ValueError(f"La estrategia {estrategia} no se puede repartir (usar una de {ESTRATEGIAS_PARALELAS})")
+    descripcion = describir_torres(torres)
+    tareas = list(dividir(construir_torres(descripcion), total_discos, estrategia, profundidad, [], set()))
+    with ProcessPoolExecutor(max_workers=procesos or os.cpu_count()) as ejecutor:
+        futuros = [
+            ejecutor.submit(explorar_subarbol, descripcion, total_discos, estrategia, tarea[1], tarea[2], resumir)
+            if tarea[0] == "subarbol" else None
+            for tarea in tareas
+        ]
+        try:
+            for tarea, futuro in zip(tareas, futuros):
+                if futuro is None:
+                    yield tarea
+                else:
+                    yield ("subarbol", futuro.result())
+        finally:
+            # Si el consumidor corta antes, no tiene sentido seguir con los subárboles pendientes
+            for futuro in futuros:
+                if futuro is not None:
+                    futuro.cancel()
+
+
+def iter_soluciones_paralelo(torres, total_discos, estrategia=1, profundidad=3, procesos=None):
+    """
+    Enumera las mismas soluciones, en el mismo orden, que hanoi_backtracking de la estrategia (1, 2 o 5), repartiendo
+    los subárboles que cuelgan de 'profundidad' entre varios procesos. Cada subárbol se devuelve entero cuando su
+    proceso termina, respetando el orden.
+    Args:
+        torres (dict): Diccionario con las torres como claves y listas de discos como valores (no se modifica).
+        total_discos (int): Número total de discos a mover.
+        estrategia (int): Poda de e1, e2 o e5 (ver e6_backtracking_iterativo).
+        profundidad (int): Cantidad de movimientos que se expanden antes de repartir.
+        procesos (int): Cantidad de procesos (por defecto, uno por núcleo).
+    Yields:
+        list: Los movimientos de cada solución.
+    """
+    for tipo, resultado in repartir(torres, total_discos, estrategia, profundidad, procesos, False):
+        if tipo == "solucion":
+            yield resultado
+        else:
+            yield from resultado
+
+
+def estadisticas_paralelo(torres, total_discos, estrategia=1, profundidad=3, procesos=None):
+    """
+    Igual que iter_soluciones_paralelo pero cada proceso solo devuelve el resumen de su subárbol.
+    Returns:
+        EstadisticasSoluciones: El mismo resumen que daría acumular() sobre el motor serial.
+    """
+    estadisticas = EstadisticasSoluciones()
+    for tipo, resultado in repartir(torres, total_discos, estrategia, profundidad, procesos, True):
+        if tipo == "solucion":
+            estadisticas.agregar(resultado)
+        else:
+            estadisticas.unir(resultado)
+    return estadisticas
+
+
+if __name__ == "__main__":
+    import time
+
+    total_discos = 4
+    torres_iniciales = {
+        "Origen": [motor.Disco(4), motor.Disco(3), motor.DiscoFragil(2, 12), motor.DiscoFragil(1, 20)],
+        "Auxiliar": [],
+        "Destino": []
+    }
+
+    inicio = time.time()
+    estadisticas = acumular(motor.iter_soluciones(torres_iniciales, total_discos, estrategia=2, copiar=False))
+    fin = time.time()
+    print(f"🔹 Serial: {len(estadisticas)} soluciones en {fin - inicio:.4f} segundos")
+
+    inicio = time.time()
+    estadisticas_paralelas = estadisticas_paralelo(torres_iniciales, total_discos, estrategia=2, profundidad=4)
+    fin = time.time()
+    print(f"🔹 Paralelo ({os.cpu_count()} procesos): {len(estadisticas_paralelas)} soluciones en {fin - inicio:.4f} segundos")
+    print(f"\n✅ Mismo resumen: {estadisticas.histograma == estadisticas_paralelas.histograma}")
@@ -1,3 +1,6 @@
+from empaquetado import empaquetar_movimiento
+
+
 class Disco:
     def __init__(self, tamanio):
         self.tamanio = tamanio
@@ -30,94 +33,124 @@ class DiscoFragil(Disco):
 
 def estado_serializado(torres):
     """
-    Guarda en una tupla el estado actual de las torres.
+    Empaqueta el estado actual de las torres en un único entero.
 
     Args:
         torres (dict): Diccionario con las torres como claves y listas de discos como valores. 
 
     Returns:
-        tuple: Estado serializado de las torres usando un 0 como separador entre torres.
+        int: Estado empaquetado con 2 bits por disco (en la posición 2 * (tamaño - 1)) que indican el índice de su torre.
     """
-    estado = []
-    for nombre in ["Origen", "Auxiliar", "Destino"]:
-        if nombre != "Origen":
-            estado.append(0)  # Separador entre torres
+    estado = 0
+    # "Origen" tiene índice 0, así que sus discos no aportan bits
+    for indice, nombre in ((1, "Auxiliar"), (2, "Destino")):
         for d in torres[nombre]:
-            estado.append(d.tamanio)
-    return tuple(estado)
+            estado |= indice << (2 * (d.tamanio - 1))
+    return estado
 
 
-def hanoi_backtracking(torres, total_discos, movimientos, soluciones, visitados):
+def iter_soluciones(torres, total_discos, movimientos=None, visitados=None, empaquetados=False, copiar=True):
     """
-    Resuelve el problema de la Torre de Hanoi utilizando backtracking, almacenando todas las soluciones posibles.
-    
+    Mismo recorrido que hanoi_backtracking, pero como generador: devuelve la primera solución apenas la encuentra y termina.
+
+    Se puede cortar en cualquier momento con break o close(); al cortar se deshacen los movimientos pendientes, así que las
+    torres y 'visitados' quedan como estaban.
+
     Args:
         torres (dict): Diccionario con las torres como claves y listas de discos como valores.
         total_discos (int): Número total de discos a mover.
-        movimientos (list): Lista de movimientos realizados hasta el momento, cada uno como una tupla (origen, destino, tamaño).
-        soluciones (list): Lista donde se almacenan todas las soluciones encontradas, cada una como una lista de movimientos.
-        visitados (set): Conjunto de estados serializados ya visitados para evitar ciclos y repeticiones.
-    Returns:
-        None: Las soluciones se almacenan en el parámetro 'soluciones' pasado por referencia.
+        movimientos (list): Lista de movimientos realizados hasta el momento (por defecto, una lista vacía).
+        visitados (set): Conjunto de estados serializados ya visitados (por defecto, un conjunto vacío).
+        empaquetados (bool): Si es True, cada movimiento se devuelve como un entero (ver empaquetar_movimiento).
+        copiar (bool): Si es False no se copia la solución: se devuelve la lista de movimientos en uso, que solo es válida
+            hasta pedir la siguiente (alcanza para resumirla, ver estadisticas_soluciones).
+    Yields:
+        list: Una lista nueva con los movimientos de la solución encontrada (como mucho una).
     """
+    if movimientos is None:
+        movimientos = []
+    if visitados is None:
+        visitados = set()
     estado_actual = estado_serializado(torres)
 
-    # Verificar si el estado actual ya fue visitado o si ya se encontró una solución
-    if soluciones or estado_actual in visitados:
+    # Verificar si el estado actual ya fue visitado
+    if estado_actual in visitados:
         return
     # Marcar el estado actual como visitado
     visitados.add(estado_actual)
 
-    # Verificar si se ha alcanzado la solución
-    if len(torres["Destino"]) == total_discos:
-        soluciones.append(list(movimientos))
+    try:
+        # Verificar si se ha alcanzado la solución
+        if len(torres["Destino"]) == total_discos:
+            if empaquetados:
+                yield [empaquetar_movimiento(m) for m in movimientos]
+            else:
+                # Sin copiar se entrega la lista en uso, que solo vale hasta pedir la siguiente solución
+                yield list(movimientos) if copiar else movimientos
+            return
+
+        # Intentar mover discos entre torres
+        for origen in torres:
+            # Si la torre de origen está vacía, no hay disco para mover
+            if not torres[origen]:
+                continue
+            # Tomar el disco superior de la torre de origen
+            disco = torres[origen][-1]
+            # Intentar mover el disco a cada torre de destino
+            for destino in torres:
+                # No mover el disco a la misma torre de origen
+                # No mover si el disco no puede moverse
+                # No mover a una torre que ya tiene un disco más grande en la parte superior
+                # Evitar mover el mismo disco en dos turnos seguidos
+                if (
+                origen == destino or
+                not disco.puede_moverse() or
+                (torres[destino] and torres[destino][-1].tamanio < disco.tamanio) or
+                (movimientos and disco.tamanio == movimientos[-1][2])
+                ):
+                    continue
+
+                # Mover disco
+                torres[origen].pop()
+                torres[destino].append(disco)
+                disco.mover()
+
+                # Registrar el movimiento
+                movimientos.append((origen, destino, disco.tamanio))
+
+                try:
+                    # Solución única: después de la primera se corta toda la búsqueda
+                    for solucion in iter_soluciones(torres, total_discos, movimientos, visitados, empaquetados, copiar):
+                        yield solucion
+                        return
+                finally:
+                    # Deshacer movimiento
+                    movimientos.pop()
+                    torres[destino].pop()
+                    disco.deshacer_movimiento()
+                    torres[origen].append(disco)
+    finally:
+        # Desmarcar el estado actual como visitado
         visitados.remove(estado_actual)
-        return
 
-    # Intentar mover discos entre torres
-    for origen in torres:
-        # Si la torre de origen está vacía, no hay disco para mover
-        if not torres[origen]:
-            continue
-        # Tomar el disco superior de la torre de origen
-        disco = torres[origen][-1]
-        # Intentar mover el disco a cada torre de destino
-        for destino in torres:
-            # No mover el disco a la misma torre de origen
-            # No mover si el disco no puede moverse
-            # No mover a una torre que ya tiene un disco más grande en la parte superior
-            # Evitar mover el mismo disco en dos turnos seguidos
-            if (
-            origen == destino or
-            not disco.puede_moverse() or
-            (torres[destino] and torres[destino][-1].tamanio < disco.tamanio) or
-            (movimientos and disco.tamanio == movimientos[-1][2])
-            ):
-                continue
 
-            # Mover disco
-            torres[origen].pop()
-            torres[destino].append(disco)
-            disco.mover()
-
-            # Registrar el movimiento
-            movimientos.append((origen, destino, disco.tamanio))
-
-            hanoi_backtracking(
-                torres,
-                total_discos,
-                movimientos,
-                soluciones,
-                visitados
-            )
-
-            # Deshacer movimiento
-            movimientos.pop()
-            torres[destino].pop()
-            disco.deshacer_movimiento()
-            torres[origen].append(disco)
-    # Desmarcar el estado actual como visitado
-    visitados.remove(estado_actual)
+def hanoi_backtracking(torres, total_discos, movimientos, soluciones, visitados):
+    """
+    Resuelve el problema de la Torre de Hanoi utilizando backtracking, almacenando todas las soluciones posibles.
+    
+    Args:
+        torres (dict): Diccionario con las torres como claves y listas de discos como valores.
+        total_discos (int): Número total de discos a mover.
+        movimientos (list): Lista de movimientos realizados hasta el momento, cada uno como una tupla (origen, destino, tamaño).
+        soluciones (list): Lista donde se almacenan todas las soluciones encontradas, cada una como una lista de movimientos.
+        visitados (set): Conjunto de estados serializados ya visitados para evitar ciclos y repeticiones.
+    Returns:
+        None: Las soluciones se almacenan en el parámetro 'soluciones' pasado por referencia.
+    """
+    # Si ya se encontró una solución no se busca otra
+    if soluciones:
+        return
+    soluciones.extend(iter_soluciones(torres, total_discos, movimientos, visitados))
 
 
 if __name__ == "__main__":
@@ -1,3 +1,6 @@
+from empaquetado import empaquetar_movimiento
+
+
 class Disco:
     def __init__(self, tamanio):
         self.tamanio = tamanio
@@ -30,22 +33,29 @@ class DiscoFragil(Disco):
 
 
 def estado_serializado(torres):
-    estado = []
-    for nombre in ["Origen", "Auxiliar", "Destino"]:
-        if nombre != "Origen":
-            estado.append(0)  # Separador entre torres
+    # 2 bits por disco con el índice de su torre ("Origen" = 0 no aporta bits)
+    estado = 0
+    for indice, nombre in ((1, "Auxiliar"), (2, "Destino")):
         for d in torres[nombre]:
-            estado.append(d.tamanio)
-    return tuple(estado)
+            estado |= indice << (2 * (d.tamanio - 1))
+    return estado
 
 
-def hanoi_backtracking(torres, total_discos, movimientos, soluciones, max_movimientos_permitidos):
-   
+def iter_soluciones(torres, total_discos, max_movimientos_permitidos, movimientos=None, empaquetados=False, copiar=True):
+    # Generador con el mismo recorrido que hanoi_backtracking: devuelve cada solución apenas la encuentra.
+    # Si se corta con break/close() se deshacen los movimientos pendientes y las torres quedan como estaban.
+    if movimientos is None:
+        movimientos = []
+
     if len(movimientos) > max_movimientos_permitidos:
         return  # Corte por exceso de movimientos
 
     if len(torres["Destino"]) == total_discos:
-        soluciones.append(list(movimientos))
+        if empaquetados:
+            yield [empaquetar_movimiento(m) for m in movimientos]
+        else:
+            # Sin copiar se entrega la lista en uso, que solo vale hasta pedir la siguiente solución
+            yield list(movimientos) if copiar else movimientos
         return
 
     for origen in torres:
@@ -66,19 +76,18 @@ def hanoi_backtracking(torres, total_discos, movimientos, soluciones, max_movimi
             disco.mover()
             movimientos.append((origen, destino, disco.tamanio))
 
-            hanoi_backtracking(
-                torres,
-                total_discos,
-                movimientos,
-                soluciones,
-                max_movimientos_permitidos
-            )
-
-            # Deshacer movimiento
-            movimientos.pop()
-            torres[destino].pop()
-            disco.deshacer_movimiento()
-            torres[origen].append(disco)
+            try:
+                yield from iter_soluciones(torres, total_discos, max_movimientos_permitidos, movimientos, empaquetados, copiar)
+            finally:
+                # Deshacer movimiento
+                movimientos.pop()
+                torres[destino].pop()
+                disco.deshacer_movimiento()
+                torres[origen].append(disco)
+
+
+def hanoi_backtracking(torres, total_discos, movimientos, soluciones, max_movimientos_permitidos):
+    soluciones.extend(iter_soluciones(torres, total_discos, max_movimientos_permitidos, movimientos))
 
 
 if __name__ == "__main__":
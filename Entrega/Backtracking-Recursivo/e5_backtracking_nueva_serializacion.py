@@ -1,3 +1,5 @@
+from empaquetado import empaquetar_movimiento
+
 TORRES = ["Origen", "Auxiliar", "Destino"]
 
 class Disco:
@@ -31,47 +33,69 @@ class DiscoFragil(Disco):
 
 
 def estado_serializado(torres):
-    return tuple(tuple(d.tamanio for d in torres[nombre]) for nombre in TORRES)
+    # 2 bits por disco con el índice de su torre ("Origen" = 0 no aporta bits)
+    estado = 0
+    for indice, nombre in ((1, "Auxiliar"), (2, "Destino")):
+        for d in torres[nombre]:
+            estado |= indice << (2 * (d.tamanio - 1))
+    return estado
+
+
+def iter_soluciones(torres, total_discos, movimientos=None, visitados=None, empaquetados=False, copiar=True):
+    # Generador con el mismo recorrido que hanoi_backtracking: devuelve cada solución apenas la encuentra.
+    # Si se corta con break/close() se deshacen los movimientos pendientes y las torres quedan como estaban.
+    if movimientos is None:
+        movimientos = []
+    if visitados is None:
+        visitados = set()
 
-def hanoi_backtracking(torres, total_discos, movimientos, soluciones, visitados):
     estado_actual = estado_serializado(torres)
     if estado_actual in visitados:
         return
 
     visitados.add(estado_actual)
 
-    if len(torres["Destino"]) == total_discos:
-        soluciones.append(list(movimientos))
-        visitados.remove(estado_actual)
-        return
-
-    for origen in TORRES:
-        if not torres[origen]:
-            continue
-
-        disco = torres[origen][-1]
-
-        for destino in TORRES:
-            if (origen == destino or
-                not disco.puede_moverse() or
-                (torres[destino] and torres[destino][-1].tamanio < disco.tamanio) or
-                (movimientos and disco.tamanio == movimientos[-1][2])):
+    try:
+        if len(torres["Destino"]) == total_discos:
+            if empaquetados:
+                yield [empaquetar_movimiento(m) for m in movimientos]
+            else:
+                # Sin copiar se entrega la lista en uso, que solo vale hasta pedir la siguiente solución
+                yield list(movimientos) if copiar else movimientos
+            return
+
+        for origen in TORRES:
+            if not torres[origen]:
                 continue
 
-            torres[origen].pop()
-            torres[destino].append(disco)
-            disco.mover()
-
-            movimientos.append((origen, destino, disco.tamanio))
-
-            hanoi_backtracking(torres, total_discos, movimientos, soluciones, visitados)
+            disco = torres[origen][-1]
+
+            for destino in TORRES:
+                if (origen == destino or
+                    not disco.puede_moverse() or
+                    (torres[destino] and torres[destino][-1].tamanio < disco.tamanio) or
+                    (movimientos and disco.tamanio == movimientos[-1][2])):
+                    continue
+
+                torres[origen].pop()
+                torres[destino].append(disco)
+                disco.mover()
+
+                movimientos.append((origen, destino, disco.tamanio))
+
+                try:
+                    yield from iter_soluciones(torres, total_discos, movimientos, visitados, empaquetados, copiar)
+                finally:
+                    movimientos.pop()
+                    torres[destino].pop()
+                    disco.deshacer_movimiento()
+                    torres[origen].append(disco)
+    finally:
+        visitados.remove(estado_actual)
 
-            movimientos.pop()
-            torres[destino].pop()
-            disco.deshacer_movimiento()
-            torres[origen].append(disco)
 
-    visitados.remove(estado_actual)
+def hanoi_backtracking(torres, total_discos, movimientos, soluciones, visitados):
+    soluciones.extend(iter_soluciones(torres, total_discos, movimientos, visitados))
 
 
 if __name__ == "__main__":
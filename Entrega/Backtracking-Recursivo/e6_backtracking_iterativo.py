@@ -0,0 +1,231 @@
+from empaquetado import empaquetar_movimiento
+
+TORRES = ["Origen", "Auxiliar", "Destino"]
+
+
+class Disco:
+    def __init__(self, tamanio):
+        self.tamanio = tamanio
+
+    def puede_moverse(self):
+        return True
+
+    def mover(self):
+        pass
+
+    def deshacer_movimiento(self):
+        pass
+
+
+class DiscoFragil(Disco):
+    def __init__(self, tamanio, max_movimientos):
+        super().__init__(tamanio)
+        self.max_movimientos = max_movimientos
+        self.movimientos_realizados = 0
+
+    def puede_moverse(self):
+        return self.movimientos_realizados < self.max_movimientos
+
+    def mover(self):
+        self.movimientos_realizados += 1
+
+    def deshacer_movimiento(self):
+        self.movimientos_realizados -= 1
+
+
+def estado_serializado(torres):
+    """
+    Empaqueta el estado actual de las torres en un único entero.
+
+    Args:
+        torres (dict): Diccionario con las torres como claves y listas de discos como valores.
+
+    Returns:
+        int: Estado empaquetado con 2 bits por disco (en la posición 2 * (tamaño - 1)) que indican el índice de su torre.
+    """
+    estado = 0
+    # "Origen" tiene índice 0, así que sus discos no aportan bits
+    for indice, nombre in ((1, "Auxiliar"), (2, "Destino")):
+        for d in torres[nombre]:
+            estado |= indice << (2 * (d.tamanio - 1))
+    return estado
+
+
+def iter_soluciones(torres, total_discos, estrategia=1, max_movimientos_permitidos=None, movimientos=None,
+                    visitados=None, empaquetados=False, copiar=True):
+    """
+    Backtracking sin recursión: recorre el mismo árbol, en el mismo orden, que hanoi_backtracking de la estrategia elegida,
+    pero con una pila explícita, así que la profundidad no está limitada por el límite de recursión de Python.
+
+    Cada nivel de la pila guarda solo el índice del próximo movimiento a probar (origen * 3 + destino); la lista
+    'movimientos' hace de registro para deshacer, porque el disco movido siempre queda arriba de su torre destino.
+
+    Estrategias (mismas podas que los módulos e1 a e5):
+        1: estados visitados en el camino actual.
+        2: como 1, y además no mueve el mismo disco dos veces seguidas.
+        3: como 2, y termina en la primera solución.
+        4: sin visitados, corta los caminos con más de max_movimientos_permitidos movimientos.
+        5: como 2, recorriendo las torres en el orden fijo de TORRES.
+
+    Args:
+        torres (dict): Diccionario con las torres como claves y listas de discos como valores.
+        total_discos (int): Número total de discos a mover.
+        estrategia (int): Poda a usar, de 1 a 5.
+        max_movimientos_permitidos (int): Límite de movimientos (solo para la estrategia 4).
+        movimientos (list): Lista de movimientos realizados hasta el momento (por defecto, una lista vacía).
+        visitados (set): Conjunto de estados serializados ya visitados (por defecto, un conjunto vacío).
+        empaquetados (bool): Si es True, cada movimiento se devuelve como un entero (ver empaquetar_movimiento).
+        copiar (bool): Si es False no se copia la solución: se devuelve la lista de movimientos en uso, que solo es válida
+            hasta pedir la siguiente.
+    Yields:
+        list: Los movimientos de cada solución encontrada.
+    """
+    if estrategia not in (1, 2, 3, 4, 5):
+        raise ValueError(f"Estrategia desconocida: {estrategia}")
+    if estrategia == 4 and max_movimientos_permitidos is None:
+        raise ValueError("La estrategia 4 necesita max_movimientos_permitidos")
+    if movimientos is None:
+        movimientos = []
+    if visitados is None:
+        visitados = set()
+
+    usa_visitados = estrategia != 4
+    evita_repetir = estrategia in (2, 3, 5)
+    nombres = TORRES if estrategia == 5 else list(torres)
+    # Los 9 pares (origen, destino) en el orden de los dos for anidados de hanoi_backtracking
+    pares = [(origen, destino) for origen in nombres for destino in nombres]
+
+    pila = []               # índice del próximo movimiento a probar en cada nivel expandido
+    estados = []            # estado marcado como visitado por cada nivel expandido
+    movimientos_iniciales = len(movimientos)
+    nuevo_nodo = True
+
+    def deshacer():
+        origen, destino, _ = movimientos.pop()
+        disco = torres[destino].pop()
+        disco.deshacer_movimiento()
+        torres[origen].append(disco)
+
+    try:
+        while True:
+            if nuevo_nodo:
+                nuevo_nodo = False
+                podar = False
+                if usa_visitados:
+                    estado_actual = estado_serializado(torres)
+                    # Verificar si el estado actual ya fue visitado
+                    if estado_actual in visitados:
+                        podar = True
+                    else:
+                        visitados.add(estado_actual)
+                        estados.append(estado_actual)
+                elif len(movimientos) > max_movimientos_permitidos:
+                    podar = True  # Corte por exceso de movimientos
+
+                if not podar:
+                    # Verificar si se ha alcanzado la solución
+                    if len(torres["Destino"]) == total_discos:
+                        if empaquetados:
+                            yield [empaquetar_movimiento(m) for m in movimientos]
+                        else:
+                            yield list(movimientos) if copiar else movimientos
+                        if estrategia == 3:
+                            return
+                        if usa_visitados:
+                            visitados.remove(estados.pop())
+                    else:
+                        pila.append(0)
+                        continue
+
+                # El nodo no se expande: se vuelve al padre
+                if not pila:
+                    return
+                deshacer()
+                continue
+
+            # Buscar el próximo movimiento válido del nivel actual
+            indice = pila[-1]
+            while indice < 9:
+                origen, destino = pares[indice]
+                indice += 1
+                # Si la torre de origen está vacía, no hay disco para mover
+                if not torres[origen]:
+                    indice = (indice + 2) // 3 * 3
+                    continue
+                disco = torres[origen][-1]
+                if (
+                    origen == destino or
+                    (torres[destino] and torres[destino][-1].tamanio < disco.tamanio) or
+                    not disco.puede_moverse() or
+                    (evita_repetir and movimientos and disco.tamanio == movimientos[-1][2])
+                ):
+                    continue
+
+                # Mover disco
+                pila[-1] = indice
+                torres[origen].pop()
+                torres[destino].append(disco)
+                disco.mover()
+                movimientos.append((origen, destino, disco.tamanio))
+                nuevo_nodo = True
+                break
+            else:
+                # Nivel agotado: desmarcar el estado y deshacer el movimiento que llevó a él
+                pila.pop()
+                if usa_visitados:
+                    visitados.remove(estados.pop())
+                if not pila:
+                    return
+                deshacer()
+    finally:
+        # Si se cortó antes de terminar (break, close() o la estrategia 3), dejar todo como estaba
+        while len(movimientos) > movimientos_iniciales:
+            deshacer()
+        for estado in estados:
+            visitados.discard(estado)
+
+
+def hanoi_backtracking(torres, total_discos, movimientos, soluciones, visitados, estrategia=1, max_movimientos_permitidos=None):
+    """
+    Misma interfaz que hanoi_backtracking de los módulos e1 a e5, con la estrategia como parámetro.
+
+    Args:
+        torres (dict): Diccionario con las torres como claves y listas de discos como valores.
+        total_discos (int): Número total de discos a mover.
+        movimientos (list): Lista de movimientos realizados hasta el momento, cada uno como una tupla (origen, destino, tamaño).
+        soluciones (list): Lista donde se almacenan todas las soluciones encontradas, cada una como una lista de movimientos.
+        visitados (set): Conjunto de estados serializados ya visitados para evitar ciclos y repeticiones.
+        estrategia (int): Poda a usar, de 1 a 5 (ver iter_soluciones).
+        max_movimientos_permitidos (int): Límite de movimientos para la estrategia 4.
+    Returns:
+        None: Las soluciones se almacenan en el parámetro 'soluciones' pasado por referencia.
+    """
+    # La estrategia 3 no busca otra solución si ya hay una
+    if estrategia == 3 and soluciones:
+        return
+    soluciones.extend(iter_soluciones(torres, total_discos, estrategia, max_movimientos_permitidos, movimientos, visitados))
+
+
+if __name__ == "__main__":
+    import time
+
+    total_discos = 4
+    torres_iniciales = {
+        "Origen": [Disco(4), Disco(3), DiscoFragil(2, 12), DiscoFragil(1, 20)],
+        "Auxiliar": [],
+        "Destino": []
+    }
+
+    inicio = time.time()
+    cantidad = 0
+    mas_corta = None
+    for solucion in iter_soluciones(torres_iniciales, total_discos, estrategia=2, copiar=False):
+        cantidad += 1
+        if mas_corta is None or len(solucion) < mas_corta:
+            mas_corta = len(solucion)
+    fin = time.time()
+
+    print("-----------  BACKTRACKING ITERATIVO ------------")
+    print(f"\n Total de soluciones encontradas: {cantidad}")
+    print(f"✅ Solución más corta con {mas_corta} movimientos")
+    print(f"\n🕒 Tiempo de ejecución: {fin - inicio:.4f} segundos")
@@ -0,0 +1,11 @@
+INDICE_TORRE = {"Origen": 0, "Auxiliar": 1, "Destino": 2}
+
+
+def empaquetar_movimiento(movimiento):
+    """
+    Empaqueta un movimiento (origen, destino, tamaño) en un entero: 2 bits para cada torre y el tamaño del disco por
+    encima. Todas las estrategias usan este mismo formato, así que sus soluciones empaquetadas se pueden comparar y
+    acumular (ver estadisticas_soluciones) sin importar qué módulo las generó.
+    """
+    origen, destino, tamanio = movimiento
+    return (tamanio << 4) | (INDICE_TORRE[origen] << 2) | INDICE_TORRE[destino]
@@ -0,0 +1,82 @@
+class EstadisticasSoluciones:
+    """
+    Resumen de un conjunto de soluciones que se va actualizando de a una, sin guardar ninguna.
+
+    Lleva la cantidad, el largo mínimo, máximo y promedio, un histograma de largos y, para cada disco, cuántas
+    soluciones lo movieron una cantidad dada de veces. La memoria depende de la cantidad de largos distintos, no de
+    la cantidad de soluciones.
+    """
+
+    __slots__ = ("cantidad", "minimo", "maximo", "suma", "histograma", "movimientos_por_disco")
+
+    def __init__(self):
+        self.cantidad = 0
+        self.minimo = None
+        self.maximo = None
+        self.suma = 0
+        # histograma[largo] = cantidad de soluciones con ese largo
+        self.histograma = {}
+        # movimientos_por_disco[tamanio][veces] = cantidad de soluciones que movieron ese disco esas veces
+        self.movimientos_por_disco = {}
+
+    def __len__(self):
+        return self.cantidad
+
+    def agregar(self, movimientos):
+        """
+        Suma una solución al resumen. Solo la recorre, así que puede ser la lista de movimientos en uso del motor.
+        Args:
+            movimientos (list): Tuplas (origen, destino, tamanio) o movimientos empaquetados en enteros.
+        """
+        largo = len(movimientos)
+        self.cantidad += 1
+        self.suma += largo
+        if self.minimo is None or largo < self.minimo:
+            self.minimo = largo
+        if self.maximo is None or largo > self.maximo:
+            self.maximo = largo
+        self.histograma[largo] = self.histograma.get(largo, 0) + 1
+
+        veces = {}
+        for movimiento in movimientos:
+            tamanio = movimiento >> 4 if isinstance(movimiento, int) else movimiento[2]
+            veces[tamanio] = veces.get(tamanio, 0) + 1
+        for tamanio, cantidad in veces.items():
+            distribucion = self.movimientos_por_disco.setdefault(tamanio, {})
+            distribucion[cantidad] = distribucion.get(cantidad, 0) + 1
+
+    def unir(self, otra):
+        """Suma al resumen las soluciones de otro resumen (por ejemplo, el de otro proceso)."""
+        if not otra.cantidad:
+            return
+        self.cantidad += otra.cantidad
+        self.suma += otra.suma
+        if self.minimo is None or otra.minimo < self.minimo:
+            self.minimo = otra.minimo
+        if self.maximo is None or otra.maximo > self.maximo:
+            self.maximo = otra.maximo
+        for largo, cantidad in otra.histograma.items():
+            self.histograma[largo] = self.histograma.get(largo, 0) + cantidad
+        for tamanio, distribucion_otra in otra.movimientos_por_disco.items():
+            distribucion = self.movimientos_por_disco.setdefault(tamanio, {})
+            for veces, cantidad in distribucion_otra.items():
+                distribucion[veces] = distribucion.get(veces, 0) + cantidad
+
+    @property
+    def promedio(self):
+        return self.suma / self.cantidad if self.cantidad else None
+
+
+def acumular(soluciones, estadisticas=None):
+    """
+    Args:
+        soluciones (iterable): Soluciones a resumir, por ejemplo iter_soluciones(..., copiar=False) o una lista.
+        estadisticas (EstadisticasSoluciones): Resumen a continuar (por defecto, uno nuevo).
+    Returns:
+        EstadisticasSoluciones: El resumen con todas las soluciones agregadas.
+    """
+    if estadisticas is None:
+        estadisticas = EstadisticasSoluciones()
+    for movimientos in soluciones:
+        estadisticas.agregar(movimientos)
+    return estadisticas
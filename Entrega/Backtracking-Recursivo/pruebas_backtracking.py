@@ -1,10 +1,11 @@
 import time
 import tracemalloc
-from e1_backtracking_estados_visitados import hanoi_backtracking as estrategia_1
-from e2_backtracking_sin_repeticion import hanoi_backtracking as estrategia_2
-from e3_backtracking_solucion_unica import hanoi_backtracking as estrategia_3
-from e4_backtracking_limite_movimientos import hanoi_backtracking as estrategia_4
-from e5_backtracking_nueva_serializacion import hanoi_backtracking as estrategia_5
+from estadisticas_soluciones import acumular
+from e1_backtracking_estados_visitados import iter_soluciones as estrategia_1
+from e2_backtracking_sin_repeticion import iter_soluciones as estrategia_2
+from e3_backtracking_solucion_unica import iter_soluciones as estrategia_3
+from e4_backtracking_limite_movimientos import iter_soluciones as estrategia_4
+from e5_backtracking_nueva_serializacion import iter_soluciones as estrategia_5
 
 class Disco:
     def __init__(self, tamanio):
@@ -51,22 +52,33 @@ def copiar_torres(torres):
     return nuevas_torres
 
 
-def imprimir_resultados(estrategia_num, soluciones, tiempo, mem_actual, mem_pico):
+def imprimir_resultados(estrategia_num, estadisticas, tiempo, mem_actual, mem_pico):
+    # Acepta el resumen de estadisticas_soluciones o, como antes, la lista de soluciones
+    if isinstance(estadisticas, list):
+        estadisticas = acumular(estadisticas)
+
     print(f"\n-----------  Estrategia {estrategia_num} ------------")
 
-    if len(soluciones) == 0:
+    if len(estadisticas) == 0:
         print("\n❌ No se encontraron soluciones.")
     else:
-        soluciones.sort(key=len, reverse=True)
-        print(f"\n✅ Solución más larga con {len(soluciones[0])} movimientos:")
+        print(f"\n✅ Solución más larga con {estadisticas.maximo} movimientos:")
+
+        print(f"\n✅ Solución más corta con {estadisticas.minimo} movimientos:")
 
-        soluciones.sort(key=len, reverse=False)
-        print(f"\n✅ Solución más corta con {len(soluciones[0])} movimientos:")
+        print(f"\n📏 Largo promedio: {estadisticas.promedio:.2f} movimientos")
+        print("\n📊 Soluciones por cantidad de movimientos:")
+        for largo in sorted(estadisticas.histograma):
+            print(f"   {largo} movimientos: {estadisticas.histograma[largo]}")
+        print("\n🔁 Veces que se mueve cada disco (mínimo - máximo entre las soluciones):")
+        for tamanio in sorted(estadisticas.movimientos_por_disco):
+            veces = estadisticas.movimientos_por_disco[tamanio]
+            print(f"   Disco {tamanio}: {min(veces)} - {max(veces)}")
 
     print(f"\n🕒 Tiempo de ejecución: {tiempo:.4f} segundos")
     print(f"📈 Memoria actual usada: {mem_actual / 1024:.2f} KB")
     print(f"🚀 Pico de memoria: {mem_pico / 1024:.2f} KB")
-    print(f"\n Total de soluciones encontradas: {len(soluciones)}")
+    print(f"\n Total de soluciones encontradas: {len(estadisticas)}")
 
 
 ### PRUEBAS
@@ -81,85 +93,84 @@ total_discos = len(torres_iniciales["Origen"])
 
 # Estrategia 1
 copia_torres = copiar_torres(torres_iniciales)
-soluciones = []
 visitados = set()
 
 tracemalloc.start()
 inicio = time.time()
 
-estrategia_1(copia_torres, total_discos, [], soluciones, visitados)
+# Solo se resumen las soluciones, sin copiarlas
+estadisticas = acumular(estrategia_1(copia_torres, total_discos, [], visitados, copiar=False))
 
 fin = time.time()
 mem_actual, mem_pico = tracemalloc.get_traced_memory()
 tracemalloc.stop()
 
-imprimir_resultados(1, soluciones, fin - inicio, mem_actual, mem_pico)
+imprimir_resultados(1, estadisticas, fin - inicio, mem_actual, mem_pico)
 
 
 # Estrategia 2
 copia_torres = copiar_torres(torres_iniciales)
-soluciones = []
 visitados = set()
 
 tracemalloc.start()
 inicio = time.time()
 
-estrategia_2(copia_torres, total_discos, [], soluciones, visitados)
+# Solo se resumen las soluciones, sin copiarlas
+estadisticas = acumular(estrategia_2(copia_torres, total_discos, [], visitados, copiar=False))
 
 fin = time.time()
 mem_actual, mem_pico = tracemalloc.get_traced_memory()
 tracemalloc.stop()
 
-imprimir_resultados(2, soluciones, fin - inicio, mem_actual, mem_pico)
+imprimir_resultados(2, estadisticas, fin - inicio, mem_actual, mem_pico)
 
 
 # Estrategia 3
 copia_torres = copiar_torres(torres_iniciales)
-soluciones = []
 visitados = set()
 
 tracemalloc.start()
 inicio = time.time()
 
-estrategia_3(copia_torres, total_discos, [], soluciones, visitados)
+# Solo se resumen las soluciones, sin copiarlas
+estadisticas = acumular(estrategia_3(copia_torres, total_discos, [], visitados, copiar=False))
 
 fin = time.time()
 mem_actual, mem_pico = tracemalloc.get_traced_memory()
 tracemalloc.stop()
 
-imprimir_resultados(3, soluciones, fin - inicio, mem_actual, mem_pico)
+imprimir_resultados(3, estadisticas, fin - inicio, mem_actual, mem_pico)
 
 
 # # Estrategia 4
 # copia_torres = copiar_torres(torres_iniciales)
 # max_movimientos = (2 ** total_discos) * 2
-# soluciones = []
 # visitados = set()
 
 # tracemalloc.start()
 # inicio = time.time()
 
-# estrategia_4(copia_torres, total_discos, [], soluciones, max_movimientos)
+# estadisticas = acumular(estrategia_4(copia_torres, total_discos, max_movimientos, [], copiar=False))
 
 # fin = time.time()
 # mem_actual, mem_pico = tracemalloc.get_traced_memory()
 # tracemalloc.stop()
 
-# imprimir_resultados(4, soluciones, fin - inicio, mem_actual, mem_pico)
+# imprimir_resultados(4, estadisticas, fin - inicio, mem_actual, mem_pico)
 
 
 # Estrategia 5
 copia_torres = copiar_torres(torres_iniciales)
-soluciones = []
 visitados = set()
 
 tracemalloc.start()
 inicio = time.time()
 
-estrategia_5(copia_torres, total_discos, [], soluciones, visitados)
+# Solo se resumen las soluciones, sin copiarlas
+estadisticas = acumular(estrategia_5(copia_torres, total_discos, [], visitados, copiar=False))
 
 fin = time.time()
 mem_actual, mem_pico = tracemalloc.get_traced_memory()
 tracemalloc.stop()
 
-imprimir_resultados(5, soluciones, fin - inicio, mem_actual, mem_pico)
+imprimir_resultados(5, estadisticas, fin - inicio, mem_actual, mem_pico)
@@ -0,0 +1,205 @@
+import hashlib
+import mmap
+import os
+from array import array
+from collections import deque
+
+from estado_compacto import ModeloTorres
+
+INALCANZABLE = 255          # Valor de la tabla para estados abstractos que no pueden llegar a la meta
+LIMITE_PRESUPUESTO = 32     # Presupuestos mayores se tratan como "sin límite" dentro del patrón
+TAMANIO_MAXIMO_TABLA = 1 << 18
+DIRECTORIO_TABLAS = os.environ.get(
+    "HANOI_PATRONES_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "patrones")
+)
+# Tablas ya mapeadas por este proceso, para que resolver muchas instancias seguidas no vuelva a abrir los archivos
+TABLAS_CARGADAS = {}
+
+
+def describir_patron(modelo, tamanios):
+    """
+    Lo único que importa del patrón es la cantidad de discos y el presupuesto de cada uno (su tamaño absoluto no),
+    así que dos patrones con la misma descripción comparten tabla.
+    Args:
+        modelo (ModeloTorres): Modelo de la instancia.
+        tamanios (list): Tamaños de los discos del patrón, de menor a mayor.
+    Returns:
+        tuple: Para cada disco, None si es común o el máximo de movimientos (recortado a LIMITE_PRESUPUESTO + 1).
+    """
+    descripcion = []
+    for tamanio in tamanios:
+        maximo = modelo.maximos[tamanio]
+        descripcion.append(None if maximo is None else min(maximo, LIMITE_PRESUPUESTO + 1))
+    return tuple(descripcion)
+
+
+def radios_patron(descripcion):
+    """
+    Base de la dimensión de presupuesto de cada disco del patrón (1 para discos comunes).
+    Si el máximo supera LIMITE_PRESUPUESTO, el último valor representa "LIMITE_PRESUPUESTO o más" y se trata como
+    ilimitado: la tabla subestima la distancia, así que la heurística sigue siendo admisible.
+    """
+    return [1 if maximo is None else maximo + 1 for maximo in descripcion]
+
+
+def tamanio_tabla(descripcion):
+    tamanio = 3 ** len(descripcion)
+    for radio in radios_patron(descripcion):
+        tamanio *= radio
+    return tamanio
+
+
+def construir_tabla(descripcion):
+    """
+    Búsqueda retrógrada exacta (BFS hacia atrás desde las metas) sobre el subproblema de los discos del patrón.
+
+    El índice de un estado abstracto es: torre de cada disco en base 3 (disco 0 = el más chico) y, por encima,
+    los movimientos restantes de cada disco frágil en base mixta.
+    Args:
+        descripcion (tuple): Resultado de describir_patron.
+    Returns:
+        array: Distancia mínima a la meta de cada estado abstracto (INALCANZABLE si no hay forma de llegar).
+    """
+    k = len(descripcion)
+    radios = radios_patron(descripcion)
+    ilimitado = [maximo is not None and maximo > LIMITE_PRESUPUESTO for maximo in descripcion]
+    potencias = [3 ** i for i in range(k)]
+    pesos = []
+    peso = 3 ** k
+    for radio in radios:
+        pesos.append(peso)
+        peso *= radio
+    total = peso
+
+    distancias = array("B", [INALCANZABLE]) * total
+    cola = deque()
+    # Metas: todos los discos en "Destino" (2), con cualquier presupuesto restante
+    meta_posiciones = sum(2 * p for p in potencias)
+    for resto in range(total // (3 ** k)):
+        indice = meta_posiciones + resto * 3 ** k
+        distancias[indice] = 0
+        cola.append(indice)
+
+    while cola:
+        indice = cola.popleft()
+        distancia = distancias[indice]
+        siguiente = min(distancia + 1, INALCANZABLE - 1)
+        torres = [(indice // potencias[i]) % 3 for i in range(k)]
+        cima = [k, k, k]
+        for i in range(k - 1, -1, -1):
+            cima[torres[i]] = i
+        for i in range(k):
+            b = torres[i]
+            if cima[b] != i:
+                continue
+            # Presupuesto que tenía el disco antes de moverse
+            if radios[i] == 1:
+                delta_presupuesto = 0
+            else:
+                restante = (indice // pesos[i]) % radios[i]
+                if ilimitado[i] and restante == radios[i] - 1:
+                    delta_presupuesto = 0
+                elif restante + 1 < radios[i] and not (ilimitado[i] and restante + 1 == radios[i] - 1):
+                    delta_presupuesto = pesos[i]
+                else:
+                    continue
+            for a in range(3):
+                if a == b or cima[a] < i:
+                    continue
+                previo = indice + (a - b) * potencias[i] + delta_presupuesto
+                if distancias[previo] == INALCANZABLE:
+                    distancias[previo] = siguiente
+                    cola.append(previo)
+    return distancias
+
+
+def cargar_tabla(descripcion, directorio=DIRECTORIO_TABLAS):
+    """
+    Devuelve la tabla del patrón mapeada en memoria; la construye y la guarda si todavía no existe.
+    El archivo se escribe en uno temporal y se renombra, así que varios procesos pueden compartir el directorio.
+    Dentro de un proceso cada tabla se mapea una sola vez (ver TABLAS_CARGADAS).
+    """
+    cargada = TABLAS_CARGADAS.get((descripcion, directorio))
+    if cargada is not None:
+        return cargada
+    nombre = hashlib.sha1(repr(descripcion).encode()).hexdigest()[:16]
+    ruta = os.path.join(directorio, f"pdb_{len(descripcion)}_{nombre}.bin")
+    if not os.path.exists(ruta):
+        tabla = construir_tabla(descripcion)
+        os.makedirs(directorio, exist_ok=True)
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        with open(temporal, "wb") as archivo:
+            tabla.tofile(archivo)
+        os.replace(temporal, ruta)
+    with open(ruta, "rb") as archivo:
+        tabla = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+    TABLAS_CARGADAS[(descripcion, directorio)] = tabla
+    return tabla
+
+
+def particion_por_defecto(modelo, tamanio_maximo=TAMANIO_MAXIMO_TABLA):
+    """Agrupa discos consecutivos, desde los más grandes, mientras la tabla de cada grupo no supere el máximo."""
+    grupos = []
+    grupo = []
+    for tamanio in range(modelo.total_discos, 0, -1):
+        candidato = [tamanio] + grupo
+        if grupo and tamanio_tabla(describir_patron(modelo, candidato)) > tamanio_maximo:
+            grupos.append(grupo)
+            candidato = [tamanio]
+        grupo = candidato
+    if grupo:
+        grupos.append(grupo)
+    return [grupos]
+
+
+class BasePatrones:
+    """
+    Heurística de base de patrones (pattern database) para hanoi_branch_and_bound.
+
+    Cada partición es una lista de grupos disjuntos de discos; dentro de una partición se suman las distancias de
+    cada grupo (cada movimiento real mueve un disco de un único grupo) y entre particiones se toma el máximo.
+    Se usa como heuristica(modelo, clave) y devuelve float('inf') si algún grupo no puede llegar a la meta.
+    """
+
+    def __init__(self, torres_iniciales, particiones=None, directorio=DIRECTORIO_TABLAS):
+        modelo = ModeloTorres(torres_iniciales)
+        if particiones is None:
+            particiones = particion_por_defecto(modelo)
+        self.particiones = []
+        for particion in particiones:
+            grupos = []
+            for grupo in particion:
+                tamanios = sorted(grupo)
+                descripcion = describir_patron(modelo, tamanios)
+                radios = radios_patron(descripcion)
+                peso = 3 ** len(tamanios)
+                pesos = []
+                for radio in radios:
+                    pesos.append(peso)
+                    peso *= radio
+                grupos.append((tamanios, radios, pesos, cargar_tabla(descripcion, directorio)))
+            self.particiones.append(grupos)
+
+    def indice(self, modelo, clave, tamanios, radios, pesos):
+        indice = 0
+        potencia = 1
+        for i, tamanio in enumerate(tamanios):
+            indice += ((clave >> (2 * (tamanio - 1))) & 3) * potencia
+            potencia *= 3
+            if radios[i] > 1:
+                consumidos = (clave // modelo.pesos[tamanio]) % modelo.radios[tamanio]
+                indice += min(modelo.maximos[tamanio] - consumidos, radios[i] - 1) * pesos[i]
+        return indice
+
+    def __call__(self, modelo, clave):
+        mejor = 0
+        for grupos in self.particiones:
+            suma = 0
+            for tamanios, radios, pesos, tabla in grupos:
+                distancia = tabla[self.indice(modelo, clave, tamanios, radios, pesos)]
+                if distancia == INALCANZABLE:
+                    return float('inf')
+                suma += distancia
+            if suma > mejor:
+                mejor = suma
+        return mejor
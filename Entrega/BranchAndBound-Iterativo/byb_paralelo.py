@@ -0,0 +1,249 @@
+import multiprocessing
+import os
+import queue
+
+from cache_soluciones import nombre_en_cache, resolver_con_cache
+from cola_prioridad import nueva_cola
+from e1_byb_heuristica_simple import heuristica
+from estado_compacto import TORRES, ModeloTorres, empaquetar_movimiento
+from tabla_estados import nueva_tabla
+
+DONAR_CADA = 256        # Cada cuántos nodos expandidos un proceso mira si hay otros esperando trabajo
+ESPERA_TAREA = 0.05     # Segundos que un proceso ocioso espera una tarea antes de revisar si terminó todo
+
+
+def aplanar_camino(camino):
+    """Pasa un camino de eslabones (padre, movimiento) a una tupla de movimientos empaquetados, para enviarlo a otro proceso."""
+    movimientos = []
+    while camino is not None:
+        camino, movimiento = camino
+        movimientos.append(movimiento)
+    movimientos.reverse()
+    return tuple(movimientos)
+
+
+def encadenar_camino(movimientos):
+    """Inversa de aplanar_camino."""
+    camino = None
+    for movimiento in movimientos:
+        camino = (camino, movimiento)
+    return camino
+
+
+def trabajador(numero, modelo, heuristica, tareas, resultados, incumbente, pendientes, ociosos, donar_cada=DONAR_CADA):
+    """
+    Proceso de la búsqueda: saca subproblemas de la cola compartida y los resuelve con el mismo Branch and Bound que
+    e1_byb_heuristica_simple, podando contra el incumbente compartido. Si hay procesos esperando, les cede los
+    mejores nodos vivos de su cola local.
+
+    Al terminar manda (numero, nodos expandidos, nodos cedidos, mejor costo local, movimientos de la mejor solución local).
+    """
+    estados = nueva_tabla(modelo)   # se conserva entre tareas: un estado ya expandido con menos movimientos no se repite
+    nodos = 0
+    cedidos = 0
+    mejor_costo = float('inf')
+    mejor_movimientos = None
+
+    while True:
+        with ociosos.get_lock():
+            ociosos.value += 1
+        try:
+            tarea = tareas.get(timeout=ESPERA_TAREA)
+        except queue.Empty:
+            tarea = None
+        with ociosos.get_lock():
+            ociosos.value -= 1
+        if tarea is None:
+            if pendientes.value == 0:
+                break
+            continue
+
+        costo, clave, profundidad, prefijo = tarea
+        nodos_vivos = nueva_cola()
+        # La tarea entra sin pasar por el filtro de registrar: si la cedió este mismo proceso, el estado ya está
+        # registrado con el mismo g y se perdería el subárbol. Solo se registra para que expandir lo encuentre,
+        # y expandir la descarta si la tabla ya tiene un camino mejor (que alguien está expandiendo o ya expandió).
+        estados.registrar(clave, profundidad)
+        nodos_vivos.push(costo, (costo, clave, profundidad, encadenar_camino(prefijo)))
+
+        while nodos_vivos:
+            costo_estimado, clave, profundidad, camino = nodos_vivos.pop()
+            if not estados.expandir(clave, profundidad):
+                continue
+
+            # Poda contra la mejor solución de todos los procesos
+            cota = incumbente.value
+            if profundidad >= cota or costo_estimado >= cota:
+                continue
+            nodos += 1
+
+            if modelo.es_solucion(clave):
+                with incumbente.get_lock():
+                    if profundidad < incumbente.value:
+                        incumbente.value = profundidad
+                if profundidad < mejor_costo:
+                    mejor_costo = profundidad
+                    mejor_movimientos = aplanar_camino(camino)
+                continue
+
+            for origen, destino, tamanio in modelo.generar_movimientos_posibles(clave):
+                if camino is not None and camino[1] >> 4 == tamanio: # si estoy moviendo el mismo disco dos veces podo
+                    continue
+                nueva_clave = modelo.mover(clave, origen, destino, tamanio)
+                nuevo_costo = profundidad + 1 + heuristica(modelo, nueva_clave)
+                if nuevo_costo >= cota:
+                    continue
+                if not estados.registrar(nueva_clave, profundidad + 1):
+                    continue
+                nuevo_camino = (camino, empaquetar_movimiento(origen, destino, tamanio))
+                nodos_vivos.push(nuevo_costo, (nuevo_costo, nueva_clave, profundidad + 1, nuevo_camino))
+
+            # Redistribución: si otros procesos se quedaron sin trabajo, se les ceden nodos vivos
+            if nodos % donar_cada == 0 and ociosos.value > 0:
+                for _ in range(min(ociosos.value, len(nodos_vivos) - 1)):
+                    costo_cedido, clave_cedida, profundidad_cedida, camino_cedido = nodos_vivos.pop()
+                    with pendientes.get_lock():
+                        pendientes.value += 1
+                    tareas.put((costo_cedido, clave_cedida, profundidad_cedida, aplanar_camino(camino_cedido)))
+                    cedidos += 1
+
+        with pendientes.get_lock():
+            pendientes.value -= 1
+
+    resultados.put((numero, nodos, cedidos, mejor_costo, mejor_movimientos))
+
+
+def hanoi_branch_and_bound_paralelo(torres_iniciales, heuristica=heuristica, procesos=None, estadisticas=None, donar_cada=DONAR_CADA,
+                                    cache=None):
+    """
+    Branch and Bound repartido entre varios procesos con un incumbente compartido.
+
+    Los procesos sacan subproblemas de una cola compartida y publican cada mejora del mejor costo en un valor de memoria
+    compartida (multiprocessing.Value), así que todos podan enseguida contra la mejor solución global. Cuando la cola se
+    vacía y hay procesos esperando, los que siguen trabajando les ceden parte de sus nodos vivos. La búsqueda termina
+    cuando no queda ninguna tarea pendiente.
+    Args:
+        torres_iniciales (dict): Diccionario con las torres iniciales
+        heuristica (callable): heuristica(modelo, clave) admisible, como en hanoi_branch_and_bound. Con el método de
+            inicio "spawn" tiene que poder serializarse con pickle.
+        procesos (int): Cantidad de procesos (por defecto, uno por núcleo).
+        estadisticas (dict): Si se pasa, se completa con 'nodos_por_proceso' y 'cedidos_por_proceso'.
+        donar_cada (int): Cada cuántos nodos expandidos se revisa si hay procesos ociosos (ver DONAR_CADA). Con
+            valores chicos se reparte mucho más, lo que sirve para probar la redistribución.
+        cache (CacheSoluciones): Si se pasa, primero se busca la instancia en esa cache_soluciones.CacheSoluciones
+            y la solución nueva se guarda ahí (por defecto, sin cache).
+    Returns:
+        list: La secuencia óptima de movimientos (origen, destino, tamanio_disco), o None si no hay solución.
+    """
+    if cache is not None:
+        # Misma solución óptima que la búsqueda serie, pero se guarda aparte porque el camino puede ser otro
+        return resolver_con_cache(
+            cache, nombre_en_cache("paralelo", heuristica), torres_iniciales, estadisticas,
+            lambda torres, estadisticas: hanoi_branch_and_bound_paralelo(torres, heuristica, procesos, estadisticas, donar_cada),
+        )
+    if estadisticas is None:
+        estadisticas = {}
+    procesos = procesos or os.cpu_count()
+    modelo = ModeloTorres(torres_iniciales)
+    clave_ini = modelo.codificar(torres_iniciales)
+    costo_ini = heuristica(modelo, clave_ini)
+    if costo_ini == float('inf'):
+        return None
+
+    incumbente = multiprocessing.Value("d", float('inf'))
+    pendientes = multiprocessing.Value("i", 1)  # tareas en la cola o en proceso
+    ociosos = multiprocessing.Value("i", 0)
+    tareas = multiprocessing.Queue()
+    resultados = multiprocessing.Queue()
+    tareas.put((costo_ini, clave_ini, 0, ()))
+
+    trabajadores = [
+        multiprocessing.Process(
+            target=trabajador,
+            args=(numero, modelo, heuristica, tareas, resultados, incumbente, pendientes, ociosos, donar_cada),
+        )
+        for numero in range(procesos)
+    ]
+    for proceso in trabajadores:
+        proceso.start()
+    # Se leen los resultados antes del join para que ningún proceso quede bloqueado escribiendo en la cola
+    reportes = sorted(resultados.get() for _ in trabajadores)
+    for proceso in trabajadores:
+        proceso.join()
+
+    estadisticas["nodos_por_proceso"] = [nodos for _, nodos, _, _, _ in reportes]
+    estadisticas["cedidos_por_proceso"] = [cedidos for _, _, cedidos, _, _ in reportes]
+
+    mejor_costo, mejor_movimientos = min(((costo, movimientos) for _, _, _, costo, movimientos in reportes), key=lambda r: r[0])
+    if mejor_movimientos is None:
+        return None
+    return [(TORRES[(m >> 2) & 3], TORRES[m & 3], m >> 4) for m in mejor_movimientos]
+
+
+def verificar_contra_serial(instancias, procesos=4, donar_cada=1):
+    """
+    Resuelve cada instancia en serie (e1_byb_heuristica_simple) y en paralelo, con un 'donar_cada' chico para que
+    los procesos se cedan nodos todo el tiempo, y compara la cantidad de movimientos.
+    Args:
+        instancias (list): Funciones sin argumentos que arman las torres (cada motor recibe su propia copia).
+        procesos (int): Procesos de la búsqueda paralela.
+        donar_cada (int): Ver hanoi_branch_and_bound_paralelo.
+    Returns:
+        list: (índice, movimientos en serie, movimientos en paralelo) de cada instancia en la que difieren
+              (None si el motor no encontró solución).
+    """
+    from e1_byb_heuristica_simple import hanoi_branch_and_bound
+
+    diferencias = []
+    for indice, armar_torres in enumerate(instancias):
+        serial = hanoi_branch_and_bound(armar_torres())
+        paralelo = hanoi_branch_and_bound_paralelo(armar_torres(), procesos=procesos, donar_cada=donar_cada)
+        largos = tuple(None if solucion is None else len(solucion) for solucion in (serial, paralelo))
+        if largos[0] != largos[1]:
+            diferencias.append((indice, *largos))
+    return diferencias
+
+
+# 🔽 Ejemplo de uso:
+
+if __name__ == "__main__":
+
+    import random
+    import time
+    from e1_byb_heuristica_simple import Disco, DiscoFragil, hanoi_branch_and_bound
+
+    torres = {
+        "Origen": [Disco(7), Disco(6), Disco(5), Disco(4), Disco(3), DiscoFragil(2, 40), DiscoFragil(1, 64)],
+        "Auxiliar": [],
+        "Destino": [],
+    }
+
+    inicio = time.time()
+    serial = hanoi_branch_and_bound(torres)
+    fin = time.time()
+    print(f"🔹 Serial: {len(serial)} movimientos en {fin - inicio:.4f} segundos")
+
+    estadisticas = {}
+    inicio = time.time()
+    solucion = hanoi_branch_and_bound_paralelo(torres, estadisticas=estadisticas)
+    fin = time.time()
+    print(f"🔹 Paralelo: {len(solucion)} movimientos en {fin - inicio:.4f} segundos")
+    print(f"🔁 Nodos por proceso: {estadisticas['nodos_por_proceso']}")
+    print(f"📦 Nodos cedidos por proceso: {estadisticas['cedidos_por_proceso']}")
+
+    # Instancias chicas al azar, con y sin discos frágiles, cediendo nodos en cada expansión
+    def instancia_al_azar(semilla):
+        generador = random.Random(semilla)
+        n = generador.randint(3, 6)
+        origen = [(t, generador.randint(1, 2 ** (n - t) + 1) if generador.random() < 0.6 else None) for t in range(n, 0, -1)]
+        return lambda: {
+            "Origen": [Disco(t) if maximo is None else DiscoFragil(t, maximo) for t, maximo in origen],
+            "Auxiliar": [],
+            "Destino": [],
+        }
+
+    diferencias = verificar_contra_serial([instancia_al_azar(semilla) for semilla in range(30)], procesos=4)
+    for indice, serial, paralelo in diferencias:
+        print(f"❌ Instancia {indice}: {serial} movimientos en serie y {paralelo} en paralelo")
+    if not diferencias:
+        print("✅ Con donar_cada=1 el paralelo coincide con el serial en las 30 instancias")
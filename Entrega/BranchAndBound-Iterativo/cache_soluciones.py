@@ -0,0 +1,200 @@
+import json
+import os
+import sqlite3
+import time
+from array import array
+
+from estado_compacto import TORRES
+from simetria import espejar_movimientos, espejar_torres
+
+RUTA_CACHE = os.environ.get(
+    "HANOI_CACHE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "patrones", "soluciones.sqlite")
+)
+MAX_ENTRADAS = 10000
+
+
+def firma_instancia(torres, motor):
+    """
+    Firma canónica de una instancia: para cada disco, de mayor a menor, su torre, su máximo de movimientos (None si
+    es común) y los movimientos que ya hizo; y el nombre del motor. Dos diccionarios de torres con los mismos discos
+    en el mismo lugar dan la misma firma aunque los objetos sean otros.
+    """
+    discos = []
+    for indice, nombre in enumerate(TORRES):
+        for disco in torres[nombre]:
+            discos.append((
+                disco.tamanio, indice, getattr(disco, "max_movimientos", None), getattr(disco, "movimientos_realizados", 0)
+            ))
+    discos.sort(reverse=True)
+    return json.dumps([motor, discos], separators=(",", ":"))
+
+
+def firma_canonica(torres, motor):
+    """
+    La menor entre firma_instancia de las torres y la de su espejo (simetria.espejar_torres), así una instancia y
+    su espejo comparten la entrada.
+    Returns:
+        tuple: (firma, espejada). 'espejada' es True si la firma es la del espejo: los movimientos guardados están
+               con "Origen" y "Auxiliar" intercambiados respecto de estas torres.
+    """
+    firma = firma_instancia(torres, motor)
+    firma_espejo = firma_instancia(espejar_torres(torres), motor)
+    return (firma_espejo, True) if firma_espejo < firma else (firma, False)
+
+
+def empaquetar_solucion(movimientos):
+    """Movimientos (origen, destino, tamanio) con nombres -> bytes con un entero de 32 bits por movimiento."""
+    indice = {nombre: i for i, nombre in enumerate(TORRES)}
+    return array("I", [(t << 4) | (indice[o] << 2) | indice[d] for o, d, t in movimientos]).tobytes()
+
+
+def desempaquetar_solucion(datos):
+    empaquetados = array("I")
+    empaquetados.frombytes(datos)
+    return [(TORRES[(m >> 2) & 3], TORRES[m & 3], m >> 4) for m in empaquetados]
+
+
+class CacheSoluciones:
+    """
+    Cache persistente de soluciones en un archivo SQLite.
+
+    La clave es firma_canonica; se guardan los movimientos empaquetados (o NULL si no hay solución) y las
+    estadísticas del motor. Cada acierto actualiza la marca de último uso y, al guardar, si se pasa de
+    'max_entradas' se borran las menos usadas recientemente (LRU). El archivo se abre en modo WAL, así que varios
+    procesos pueden leer mientras otro escribe; si la base está ocupada, actualizar la marca de uso se saltea en
+    lugar de esperar.
+    """
+
+    def __init__(self, ruta=RUTA_CACHE, max_entradas=MAX_ENTRADAS, espera=5.0):
+        directorio = os.path.dirname(os.path.abspath(ruta))
+        os.makedirs(directorio, exist_ok=True)
+        self.max_entradas = max_entradas
+        self.conexion = sqlite3.connect(ruta, timeout=espera)
+        self.conexion.execute("PRAGMA journal_mode=WAL")
+        self.conexion.execute("PRAGMA synchronous=NORMAL")
+        self.conexion.execute(
+            "CREATE TABLE IF NOT EXISTS soluciones ("
+            " firma TEXT PRIMARY KEY, movimientos BLOB, largo INTEGER, estadisticas TEXT, ultimo_uso REAL)"
+        )
+        self.conexion.execute("CREATE INDEX IF NOT EXISTS por_uso ON soluciones (ultimo_uso)")
+        self.conexion.commit()
+
+    def __len__(self):
+        return self.conexion.execute("SELECT COUNT(*) FROM soluciones").fetchone()[0]
+
+    def buscar(self, torres, motor):
+        """
+        Returns:
+            tuple: (encontrada, movimientos, estadisticas). 'movimientos' es None si la instancia no tiene solución.
+        """
+        firma, espejada = firma_canonica(torres, motor)
+        fila = self.conexion.execute(
+            "SELECT movimientos, largo, estadisticas FROM soluciones WHERE firma = ?", (firma,)
+        ).fetchone()
+        if fila is None:
+            return False, None, None
+        try:
+            self.conexion.execute("UPDATE soluciones SET ultimo_uso = ? WHERE firma = ?", (time.time(), firma))
+            self.conexion.commit()
+        except sqlite3.OperationalError:
+            self.conexion.rollback()    # otro proceso está escribiendo: el orden LRU puede esperar
+        datos, largo, estadisticas = fila
+        movimientos = None if largo is None else desempaquetar_solucion(datos)
+        if espejada and movimientos is not None:
+            movimientos = espejar_movimientos(movimientos)
+        return True, movimientos, json.loads(estadisticas)
+
+    def guardar(self, torres, motor, movimientos, estadisticas=None):
+        firma, espejada = firma_canonica(torres, motor)
+        if espejada and movimientos is not None:
+            movimientos = espejar_movimientos(movimientos)
+        datos = None if movimientos is None else empaquetar_solucion(movimientos)
+        largo = None if movimientos is None else len(movimientos)
+        with self.conexion:
+            self.conexion.execute(
+                "INSERT OR REPLACE INTO soluciones VALUES (?, ?, ?, ?, ?)",
+                (firma, datos, largo, json.dumps(estadisticas or {}), time.time()),
+            )
+            sobrantes = len(self) - self.max_entradas
+            if sobrantes > 0:
+                self.conexion.execute(
+                    "DELETE FROM soluciones WHERE firma IN"
+                    " (SELECT firma FROM soluciones ORDER BY ultimo_uso LIMIT ?)",
+                    (sobrantes,),
+                )
+
+    def cerrar(self):
+        self.conexion.close()
+
+
+def nombre_en_cache(motor, heuristica=None):
+    """
+    Nombre con el que un motor guarda sus soluciones: el del motor y, si usa una, el de la heurística (por ejemplo
+    "simple/heuristica" o "ida/BasePatrones"), así el mismo motor con otra heurística no comparte la entrada.
+    """
+    if heuristica is None:
+        return motor
+    return f"{motor}/{getattr(heuristica, '__name__', type(heuristica).__name__)}"
+
+
+def resolver_con_cache(cache, nombre, torres, estadisticas, resolver):
+    """
+    Busca la instancia en la cache y, si no está, la resuelve con resolver(torres, estadisticas) y la guarda. En un
+    acierto las estadísticas guardadas se copian en 'estadisticas' junto con 'cache': True. Es lo que hacen los
+    puntos de entrada de los motores cuando reciben 'cache'.
+    Args:
+        cache (CacheSoluciones): La cache a consultar.
+        nombre (str): Nombre del motor en la cache (ver nombre_en_cache).
+        torres (dict): Diccionario con las torres iniciales.
+        estadisticas (dict): Estadísticas del motor (o None).
+        resolver (callable): resolver(torres, estadisticas), el motor sin cache.
+    Returns:
+        list: La secuencia de movimientos, o None si no hay solución.
+    """
+    if estadisticas is None:
+        estadisticas = {}
+    encontrada, movimientos, guardadas = cache.buscar(torres, nombre)
+    if encontrada:
+        estadisticas.update(guardadas)
+        estadisticas["cache"] = True
+        return movimientos
+    movimientos = resolver(torres, estadisticas)
+    if movimientos is not None:
+        movimientos = list(movimientos)
+    cache.guardar(torres, nombre, movimientos, estadisticas)
+    return movimientos
+
+
+def con_cache(motor, nombre, cache):
+    """
+    Envuelve un motor motor(torres, estadisticas) (como los de resolver_lote) para que primero consulte la cache
+    (ver resolver_con_cache).
+    """
+    def motor_con_cache(torres, estadisticas):
+        return resolver_con_cache(cache, nombre, torres, estadisticas, motor)
+    return motor_con_cache
+
+
+# 🔽 Ejemplo de uso:
+
+if __name__ == "__main__":
+
+    import tempfile
+    from e1_byb_heuristica_simple import hanoi_branch_and_bound
+    from estado_compacto import Disco, DiscoFragil
+
+    torres = {
+        "Origen": [Disco(7), Disco(6), Disco(5), Disco(4), Disco(3), DiscoFragil(2, 40), DiscoFragil(1, 64)],
+        "Auxiliar": [],
+        "Destino": [],
+    }
+
+    with tempfile.TemporaryDirectory() as directorio:
+        cache = CacheSoluciones(os.path.join(directorio, "soluciones.sqlite"))
+        for intento in ("Sin cache", "Con cache"):
+            estadisticas = {}
+            inicio = time.perf_counter()
+            solucion = hanoi_branch_and_bound(torres, estadisticas=estadisticas, cache=cache)
+            fin = time.perf_counter()
+            print(f"🔹 {intento}: {len(solucion)} movimientos en {(fin - inicio) * 1000:.3f} milisegundos {estadisticas}")
+        cache.cerrar()
@@ -0,0 +1,71 @@
+import heapq
+import itertools
+
+
+class ColaBuckets:
+    """
+    Cola de prioridad para costos enteros no negativos: una lista (bucket) por cada costo posible.
+
+    push y pop son O(1) amortizado. Entre nodos con el mismo costo sale primero el último que entró, que es el
+    mismo orden que daba ordenar la lista de nodos vivos con sort(reverse=True) y hacer pop(); como los hijos se
+    agregan después que sus padres, en un empate se expande primero el nodo más profundo.
+    """
+
+    __slots__ = ("buckets", "minimo", "cantidad")
+
+    def __init__(self):
+        self.buckets = []
+        self.minimo = 0
+        self.cantidad = 0
+
+    def __len__(self):
+        return self.cantidad
+
+    def push(self, costo, nodo):
+        buckets = self.buckets
+        if costo >= len(buckets):
+            buckets.extend([] for _ in range(costo + 1 - len(buckets)))
+        buckets[costo].append(nodo)
+        if self.cantidad == 0 or costo < self.minimo:
+            self.minimo = costo
+        self.cantidad += 1
+
+    def pop(self):
+        """Saca el nodo de menor costo. La cola no debe estar vacía."""
+        buckets = self.buckets
+        while not buckets[self.minimo]:
+            self.minimo += 1
+        self.cantidad -= 1
+        return buckets[self.minimo].pop()
+
+
+class ColaHeap:
+    """
+    Misma interfaz que ColaBuckets para costos no enteros (por ejemplo heurísticas con factores decimales).
+    El contador negativo mantiene el mismo desempate: ante igual costo sale el último que entró.
+    """
+
+    __slots__ = ("heap", "contador")
+
+    def __init__(self):
+        self.heap = []
+        self.contador = itertools.count()
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, costo, nodo):
+        heapq.heappush(self.heap, (costo, -next(self.contador), nodo))
+
+    def pop(self):
+        return heapq.heappop(self.heap)[2]
+
+
+def nueva_cola(costos_enteros=True):
+    """
+    Args:
+        costos_enteros (bool): True si el costo estimado (movimientos + heurística) es siempre un entero >= 0.
+    Returns:
+        ColaBuckets o ColaHeap: La cola de nodos vivos adecuada para esos costos.
+    """
+    return ColaBuckets() if costos_enteros else ColaHeap()
@@ -1,3 +1,10 @@
+from cache_soluciones import nombre_en_cache, resolver_con_cache
+from cola_prioridad import nueva_cola
+from estado_compacto import ModeloTorres, empaquetar_movimiento, reconstruir_movimientos
+from expansion_lotes import discos_fuera_de_destino, hanoi_por_capas
+from tabla_estados import nueva_tabla
+
+
 class Disco:
     def __init__(self, tamanio):
         self.tamanio = tamanio
@@ -28,121 +35,108 @@ class DiscoFragil(Disco):
         self.movimientos_realizados -= 1
 
 
-def estado_serializado(torres):
-    estado = []
-    for torre in ["Origen", "Auxiliar", "Destino"]:
-        if torre != "Origen":
-            estado.append(0)  # Separador
-        for disco in torres[torre]:
-            estado.append(disco.tamanio)
-    return tuple(estado)
-
-
-def copiar_torres(torres):
-    nuevas_torres = {}
-    for clave, pila in torres.items():
-        nueva_pila = []
-        for disco in pila:
-            if isinstance(disco, DiscoFragil):
-                nuevo_disco = DiscoFragil(disco.tamanio, disco.max_movimientos)
-                nuevo_disco.movimientos_realizados = disco.movimientos_realizados
-            else:
-                nuevo_disco = Disco(disco.tamanio)
-            nueva_pila.append(nuevo_disco)
-        nuevas_torres[clave] = nueva_pila
-    return nuevas_torres
-
-
-def generar_movimientos_posibles(torres):
-    movimientos = []
-    for origen in torres:
-        if not torres[origen]:
-            continue
-        disco = torres[origen][-1]
-        if not disco.puede_moverse():
-            continue
-        for destino in torres:
-            if origen == destino:
-                continue
-            if torres[destino] and torres[destino][-1].tamanio < disco.tamanio:
-                continue
-            movimientos.append((origen, destino, disco))
-    return movimientos
-
-
-def heuristica(torres, cantidad_discos):
+def heuristica(modelo, clave):
     """
     Heurística simple: Cantidad de discos que NO están en la torre de destino.
     Args:
-        torres (dict): Estado actual de las torres.
-        cantidad_discos (int): Cantidad de discos total.
+        modelo (ModeloTorres): Modelo compacto de las torres.
+        clave (int): Estado actual.
     Returns:
         int: Número de discos que aún no están en la torre destino.
     """
-    return  cantidad_discos - len(torres['Destino'])
+    return modelo.total_discos - modelo.discos_en(clave, 2)
 
 
-def hanoi_branch_and_bound(torres_iniciales):
+# Misma cuenta sobre un lote de claves, para el modo por capas (ver expansion_lotes.evaluar_lote)
+heuristica.lote = discos_fuera_de_destino
+
+
+def hanoi_branch_and_bound(torres_iniciales, heuristica=heuristica, capas=False, estadisticas=None, cache=None):
     """
     Resuelve el problema de la Torre de Hanoi utilizando el algoritmo de Branch and Bound.
     Args:
         torres_iniciales (dict): Diccionario con las torres iniciales
+        heuristica (callable): heuristica(modelo, clave). Tiene que ser admisible (no sobrestimar), porque se usa
+            para podar los nodos cuyo costo estimado ya no mejora la mejor solución. Por ejemplo base_patrones.BasePatrones.
+        capas (bool): Si es True, busca por niveles expandiendo cada capa entera en lote (con NumPy si está
+            instalado), ver expansion_lotes.hanoi_por_capas. Conviene para fronteras muy anchas.
+        estadisticas (dict): Si se pasa, se completa con 'nodos' (nodos expandidos).
+        cache (CacheSoluciones): Si se pasa, primero se busca la instancia en esa cache_soluciones.CacheSoluciones
+            y la solución nueva se guarda ahí (por defecto, sin cache).
     Returns:
         list: Una lista de tuplas representando la secuencia óptima de movimientos. Cada tupla es de la forma
               (origen, destino, tamanio_disco), donde 'origen' y 'destino' son los nombres de las torres y
               'tamanio_disco' es el tamaño del disco movido. Si no se encuentra solución, retorna None.
     """
-    total_discos = len(torres_iniciales['Origen'])
-    nodos_vivos = []
-    estado_ini = estado_serializado(torres_iniciales)
-    # Nodo raíz: (costo (heuristica+cantidad de movimientos realizados), torres, movimientos, estados visitados)
-    nodo_raiz = (heuristica(torres_iniciales, total_discos), copiar_torres(torres_iniciales), [], set([estado_ini]))
-    nodos_vivos.append(nodo_raiz)
-
-    mejor_solucion = None
+    if cache is not None:
+        return resolver_con_cache(
+            cache, nombre_en_cache("capas" if capas else "simple", heuristica), torres_iniciales, estadisticas,
+            lambda torres, estadisticas: hanoi_branch_and_bound(torres, heuristica, capas, estadisticas),
+        )
+    if estadisticas is None:
+        estadisticas = {}
+    if capas:
+        return hanoi_por_capas(torres_iniciales, heuristica, estadisticas=estadisticas)
+    estadisticas["nodos"] = 0
+
+    modelo = ModeloTorres(torres_iniciales)
+    nodos_vivos = nueva_cola()
+    clave_ini = modelo.codificar(torres_iniciales)
+    # Nodo raíz: (costo (heuristica+cantidad de movimientos realizados), estado, cantidad de movimientos, último eslabón del camino)
+    nodo_raiz = (heuristica(modelo, clave_ini), clave_ini, 0, None)
+    if nodo_raiz[0] == float('inf'): # la heurística ya sabe que no hay solución
+        return None
+    nodos_vivos.push(nodo_raiz[0], nodo_raiz)
+    # Un único registro de estados para toda la búsqueda, con el mejor g de cada uno (y dominancia de presupuestos)
+    estados = nueva_tabla(modelo)
+    estados.registrar(clave_ini, 0)
+
+    mejor_camino = None
     mejor_costo = float('inf')
+    nodos = 0
 
     while nodos_vivos:
-        # Ramificación: ordenar por heurística + profundidad
-        nodos_vivos.sort(key=lambda nodo: nodo[0], reverse=True)
-        costo_estimado, torres, movimientos, visitados = nodos_vivos.pop()
+        # Ramificación: sale el nodo de menor heurística + profundidad
+        costo_estimado, clave, profundidad, camino = nodos_vivos.pop()
+
+        # Si después se llegó al mismo estado con menos movimientos, este nodo quedó viejo
+        if not estados.expandir(clave, profundidad):
+            continue
 
-        # Poda: si ya es más largo que el mejor, descartamos
-        if len(movimientos) >= mejor_costo:
+        # Poda: si ya es más largo que el mejor (o la heurística asegura que lo será), descartamos
+        if profundidad >= mejor_costo or costo_estimado >= mejor_costo:
             continue
 
+        nodos += 1
+
         # ¿Es solución?
-        if len(torres["Destino"]) == total_discos:
-            mejor_solucion = movimientos
-            mejor_costo = len(movimientos)
+        if modelo.es_solucion(clave):
+            mejor_camino = camino
+            mejor_costo = profundidad
             continue
 
-        for origen, destino, disco in generar_movimientos_posibles(torres):
+        for origen, destino, tamanio in modelo.generar_movimientos_posibles(clave):
 
-            if movimientos and movimientos[-1][2] == disco.tamanio: # si estoy moviendo el mismo disco dos veces podo
-                continue
-            
-            if not disco.puede_moverse():
+            if camino is not None and camino[1] >> 4 == tamanio: # si estoy moviendo el mismo disco dos veces podo
                 continue
 
-            nuevas_torres = copiar_torres(torres)
-            disco_en_nuevas_torres = nuevas_torres[origen].pop()
-            nuevas_torres[destino].append(disco_en_nuevas_torres)
-            disco_en_nuevas_torres.mover()
+            nueva_clave = modelo.mover(clave, origen, destino, tamanio)
 
-            nuevo_estado = estado_serializado(nuevas_torres)
-            if nuevo_estado in visitados:
+            nuevo_costo = profundidad + 1 + heuristica(modelo, nueva_clave)
+            if nuevo_costo >= mejor_costo:
                 continue
 
-            nuevo_visitados = visitados.copy()
-            nuevo_visitados.add(nuevo_estado)
-            nuevos_movs = movimientos + [(origen, destino, disco_en_nuevas_torres.tamanio)]
-            nuevo_costo = len(nuevos_movs) + heuristica(nuevas_torres, total_discos)
+            if not estados.registrar(nueva_clave, profundidad + 1):
+                continue
 
-            
-            nodos_vivos.append((nuevo_costo, nuevas_torres, nuevos_movs, nuevo_visitados))
+            nuevo_camino = (camino, empaquetar_movimiento(origen, destino, tamanio))
+            nodos_vivos.push(nuevo_costo, (nuevo_costo, nueva_clave, profundidad + 1, nuevo_camino))
 
-    return mejor_solucion
+    estadisticas["nodos"] = nodos
+    if mejor_costo == float('inf'):
+        return None
+    # La lista de movimientos se arma una sola vez, para la mejor solución
+    return reconstruir_movimientos(mejor_camino)
 
 
 # 🔽 Ejemplo de uso:
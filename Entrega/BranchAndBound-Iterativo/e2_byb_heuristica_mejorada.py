@@ -1,3 +1,9 @@
+from cache_soluciones import resolver_con_cache
+from cola_prioridad import nueva_cola
+from estado_compacto import ModeloTorres, empaquetar_movimiento, reconstruir_movimientos
+from tabla_estados import nueva_tabla
+
+
 class Disco:
     def __init__(self, tamanio):
         self.tamanio = tamanio
@@ -28,49 +34,7 @@ class DiscoFragil(Disco):
         self.movimientos_realizados -= 1
 
 
-def estado_serializado(torres):
-    estado = []
-    for torre in ["Origen", "Auxiliar", "Destino"]:
-        if torre != "Origen":
-            estado.append(0)  # Separador
-        for disco in torres[torre]:
-            estado.append(disco.tamanio)
-    return tuple(estado)
-
-
-def copiar_torres(torres):
-    nuevas_torres = {}
-    for clave, pila in torres.items():
-        nueva_pila = []
-        for disco in pila:
-            if isinstance(disco, DiscoFragil):
-                nuevo_disco = DiscoFragil(disco.tamanio, disco.max_movimientos)
-                nuevo_disco.movimientos_realizados = disco.movimientos_realizados
-            else:
-                nuevo_disco = Disco(disco.tamanio)
-            nueva_pila.append(nuevo_disco)
-        nuevas_torres[clave] = nueva_pila
-    return nuevas_torres
-
-
-def generar_movimientos_posibles(torres):
-    movimientos = []
-    for origen in torres:
-        if not torres[origen]:
-            continue
-        disco = torres[origen][-1]
-        if not disco.puede_moverse():
-            continue
-        for destino in torres:
-            if origen == destino:
-                continue
-            if torres[destino] and torres[destino][-1].tamanio < disco.tamanio:
-                continue
-            movimientos.append((origen, destino, disco))
-    return movimientos
-
-
-def heuristica(torres):
+def heuristica(modelo, clave):
     """
     Calcula un valor heurístico para el estado actual de las Torres de Hanoi.
     La heurística asigna una suma ponderada a los discos según su posición:
@@ -78,81 +42,85 @@ def heuristica(torres):
     - Cada disco aporta un peso exponencial (2^(tamaño del disco - 1)) multiplicado por el factor de la torre.
     - El valor heurístico es la suma de todos los discos ponderados.
     Args:
-        torres (dict): Diccionario que mapea los nombres de las torres ('Origen', 'Auxiliar', 'Destino') a listas (pilas) de objetos disco.
+        modelo (ModeloTorres): Modelo compacto de las torres.
+        clave (int): Estado actual.
     Returns:
         int: El valor heurístico calculado para el estado dado.
     """
-    factor_map = {'Origen': 2, 'Auxiliar': 1, 'Destino': 0}
     h = 0
-    for torre_nombre, pila in torres.items():
-        factor = factor_map.get(torre_nombre, 0)
-        for disco in pila:
-            # peso exponencial según el tamaño del disco
-            peso = 2 ** (disco.tamanio - 1)
-            h += peso * factor
+    peso = 1
+    for _ in range(modelo.total_discos):
+        # el índice de la torre es 0, 1 o 2, así que el factor es 2 - índice
+        h += peso * (2 - (clave & 3))
+        peso <<= 1
+        clave >>= 2
     return h
 
 
-def hanoi_branch_and_bound(torres_iniciales):
+def hanoi_branch_and_bound(torres_iniciales, cache=None):
     """
     Resuelve el problema de la Torre de Hanoi utilizando el algoritmo de Branch and Bound con heurística mejorada.
     Args:
         torres_iniciales (dict): Diccionario con las torres iniciales
+        cache (CacheSoluciones): Si se pasa, primero se busca la instancia en esa cache_soluciones.CacheSoluciones
+            y la solución nueva se guarda ahí (por defecto, sin cache).
     Returns:
         list: Una lista de tuplas representando la secuencia óptima de movimientos. Cada tupla es de la forma
             (origen, destino, tamanio_disco), donde 'origen' y 'destino' son los nombres de las torres y
             'tamanio_disco' es el tamaño del disco movido. Si no se encuentra solución, retorna None.
     """
-    total_discos = len(torres_iniciales['Origen'])
-    nodos_vivos = []
-    estado_ini = estado_serializado(torres_iniciales)
-    nodo_raiz = (heuristica(torres_iniciales), copiar_torres(torres_iniciales), [], set([estado_ini]))
-    nodos_vivos.append(nodo_raiz)
-
-    mejor_solucion = None
+    if cache is not None:
+        return resolver_con_cache(cache, "mejorada", torres_iniciales, None, lambda torres, _: hanoi_branch_and_bound(torres))
+    modelo = ModeloTorres(torres_iniciales)
+    nodos_vivos = nueva_cola()
+    clave_ini = modelo.codificar(torres_iniciales)
+    nodo_raiz = (heuristica(modelo, clave_ini), clave_ini, 0, None)
+    nodos_vivos.push(nodo_raiz[0], nodo_raiz)
+    # Un único registro de estados para toda la búsqueda, con el mejor g de cada uno (y dominancia de presupuestos)
+    estados = nueva_tabla(modelo)
+    estados.registrar(clave_ini, 0)
+
+    mejor_camino = None
     mejor_costo = float('inf')
 
     while nodos_vivos:
-        # Ramificación: ordenar por heurística + profundidad
-        nodos_vivos.sort(key=lambda nodo: nodo[0], reverse=True)
-        costo_estimado, torres, movimientos, visitados = nodos_vivos.pop()
+        # Ramificación: sale el nodo de menor heurística + profundidad
+        costo_estimado, clave, profundidad, camino = nodos_vivos.pop()
+
+        # Si después se llegó al mismo estado con menos movimientos, este nodo quedó viejo
+        if not estados.expandir(clave, profundidad):
+            continue
 
         # Poda: si ya es más largo que el mejor, descartamos
-        if len(movimientos) >= mejor_costo:
+        if profundidad >= mejor_costo:
             continue
 
         # ¿Es solución?
-        if len(torres["Destino"]) == total_discos:
-            mejor_solucion = movimientos
-            mejor_costo = len(movimientos)
+        if modelo.es_solucion(clave):
+            mejor_camino = camino
+            mejor_costo = profundidad
             continue
 
-        for origen, destino, disco in generar_movimientos_posibles(torres):
+        for origen, destino, tamanio in modelo.generar_movimientos_posibles(clave):
 
-            if movimientos and movimientos[-1][2] == disco.tamanio: # si estoy moviendo el mismo disco dos veces podo
-                continue
-            
-            if not disco.puede_moverse():
+            if camino is not None and camino[1] >> 4 == tamanio: # si estoy moviendo el mismo disco dos veces podo
                 continue
 
-            nuevas_torres = copiar_torres(torres)
-            disco_en_nuevas_torres = nuevas_torres[origen].pop()
-            nuevas_torres[destino].append(disco_en_nuevas_torres)
-            disco_en_nuevas_torres.mover()
+            nueva_clave = modelo.mover(clave, origen, destino, tamanio)
 
-            nuevo_estado = estado_serializado(nuevas_torres)
-            if nuevo_estado in visitados:
+            if not estados.registrar(nueva_clave, profundidad + 1):
                 continue
 
-            nuevo_visitados = visitados.copy()
-            nuevo_visitados.add(nuevo_estado)
-            nuevos_movs = movimientos + [(origen, destino, disco_en_nuevas_torres.tamanio)]
-            nuevo_costo = len(nuevos_movs) + heuristica(nuevas_torres)
+            nuevo_camino = (camino, empaquetar_movimiento(origen, destino, tamanio))
+            nuevo_costo = profundidad + 1 + heuristica(modelo, nueva_clave)
 
             
-            nodos_vivos.append((nuevo_costo, nuevas_torres, nuevos_movs, nuevo_visitados))
+            nodos_vivos.push(nuevo_costo, (nuevo_costo, nueva_clave, profundidad + 1, nuevo_camino))
 
-    return mejor_solucion
+    if mejor_costo == float('inf'):
+        return None
+    # La lista de movimientos se arma una sola vez, para la mejor solución
+    return reconstruir_movimientos(mejor_camino)
 
 
 # 🔽 Ejemplo de uso:
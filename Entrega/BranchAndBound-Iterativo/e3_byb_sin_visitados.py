@@ -1,3 +1,8 @@
+from cache_soluciones import resolver_con_cache
+from cola_prioridad import nueva_cola
+from estado_compacto import ModeloTorres, empaquetar_movimiento, reconstruir_movimientos
+
+
 class Disco:
     def __init__(self, tamanio):
         self.tamanio = tamanio
@@ -28,111 +33,70 @@ class DiscoFragil(Disco):
         self.movimientos_realizados -= 1
 
 
-def estado_serializado(torres):
-    estado = []
-    for torre in ["Origen", "Auxiliar", "Destino"]:
-        if torre != "Origen":
-            estado.append(0)  # Separador
-        for disco in torres[torre]:
-            estado.append(disco.tamanio)
-    return tuple(estado)
-
-
-def copiar_torres(torres):
-    nuevas_torres = {}
-    for clave, pila in torres.items():
-        nueva_pila = []
-        for disco in pila:
-            if isinstance(disco, DiscoFragil):
-                nuevo_disco = DiscoFragil(disco.tamanio, disco.max_movimientos)
-                nuevo_disco.movimientos_realizados = disco.movimientos_realizados
-            else:
-                nuevo_disco = Disco(disco.tamanio)
-            nueva_pila.append(nuevo_disco)
-        nuevas_torres[clave] = nueva_pila
-    return nuevas_torres
-
-
-def generar_movimientos_posibles(torres):
-    movimientos = []
-    for origen in torres:
-        if not torres[origen]:
-            continue
-        disco = torres[origen][-1]
-        if not disco.puede_moverse():
-            continue
-        for destino in torres:
-            if origen == destino:
-                continue
-            if torres[destino] and torres[destino][-1].tamanio < disco.tamanio:
-                continue
-            movimientos.append((origen, destino, disco))
-    return movimientos
-
-
-def heuristica(torres, cantidad_discos):
+def heuristica(modelo, clave):
     """
     Heurística simple: Cantidad de discos que NO están en la torre de destino.
     Args:
-        torres (dict): Estado actual de las torres.
-        cantidad_discos (int): Cantidad de discos total.
+        modelo (ModeloTorres): Modelo compacto de las torres.
+        clave (int): Estado actual.
     Returns:
         int: Número de discos que aún no están en la torre destino.
     """
-    return  cantidad_discos - len(torres['Destino'])
+    return modelo.total_discos - modelo.discos_en(clave, 2)
 
 
-def hanoi_branch_and_bound(torres_iniciales):
+def hanoi_branch_and_bound(torres_iniciales, cache=None):
     """
     Resuelve el problema de la Torre de Hanoi utilizando el algoritmo de Branch and Bound.
     Args:
         torres_iniciales (dict): Diccionario con las torres iniciales
+        cache (CacheSoluciones): Si se pasa, primero se busca la instancia en esa cache_soluciones.CacheSoluciones
+            y la solución nueva se guarda ahí (por defecto, sin cache).
     Returns:
         list: Una lista de tuplas representando la secuencia de movimientos óptima. Cada tupla es de la forma
               (origen, destino, tamanio_disco), donde 'origen' y 'destino' son los nombres de las torres y
               'tamanio_disco' es el tamaño del disco movido. Si no se encuentra solución, retorna None.
     """
-    total_discos = len(torres_iniciales['Origen'])
-    nodos_vivos = []
-    nodo_raiz = (heuristica(torres_iniciales, total_discos), copiar_torres(torres_iniciales), [])
-    nodos_vivos.append(nodo_raiz)
+    if cache is not None:
+        return resolver_con_cache(cache, "sin_visitados", torres_iniciales, None, lambda torres, _: hanoi_branch_and_bound(torres))
+    modelo = ModeloTorres(torres_iniciales)
+    nodos_vivos = nueva_cola()
+    clave_ini = modelo.codificar(torres_iniciales)
+    nodo_raiz = (heuristica(modelo, clave_ini), clave_ini, 0, None)
+    nodos_vivos.push(nodo_raiz[0], nodo_raiz)
 
-    mejor_solucion = None
-    max_movimientos = 2 ** total_discos
+    mejor_camino = None
+    max_movimientos = 2 ** modelo.total_discos
 
     while nodos_vivos:
-        # Ramificación: ordenar por heurística + profundidad
-        nodos_vivos.sort(key=lambda nodo: nodo[0], reverse=True)
-        costo_estimado, torres, movimientos = nodos_vivos.pop()
+        # Ramificación: sale el nodo de menor heurística + profundidad
+        costo_estimado, clave, profundidad, camino = nodos_vivos.pop()
 
         # Poda: si ya es más largo que el mejor, descartamos
-        if len(movimientos) >= max_movimientos:
+        if profundidad >= max_movimientos:
             continue
 
         # Es solución?
-        if len(torres["Destino"]) == total_discos:
-            mejor_solucion = movimientos
-            max_movimientos = len(movimientos)
+        if modelo.es_solucion(clave):
+            mejor_camino = camino
+            max_movimientos = profundidad
             continue
 
-        for origen, destino, disco in generar_movimientos_posibles(torres):
-
-            if movimientos and movimientos[-1][2] == disco.tamanio: # si estoy moviendo el mismo disco dos veces podo
-                continue
+        for origen, destino, tamanio in modelo.generar_movimientos_posibles(clave):
 
-            if not disco.puede_moverse():
+            if camino is not None and camino[1] >> 4 == tamanio: # si estoy moviendo el mismo disco dos veces podo
                 continue
 
-            nuevas_torres = copiar_torres(torres) # Crear la copia del estado actual
-            disco_en_nuevas_torres = nuevas_torres[origen].pop()
-            nuevas_torres[destino].append(disco_en_nuevas_torres)
-            disco_en_nuevas_torres.mover()
+            nueva_clave = modelo.mover(clave, origen, destino, tamanio) # El estado nuevo es un entero, no hay copia
 
-            nuevos_movs = movimientos + [(origen, destino, disco_en_nuevas_torres.tamanio)]
-            nuevo_costo = len(nuevos_movs) + heuristica(nuevas_torres, total_discos)
-            nodos_vivos.append((nuevo_costo, nuevas_torres, nuevos_movs))
+            nuevo_camino = (camino, empaquetar_movimiento(origen, destino, tamanio))
+            nuevo_costo = profundidad + 1 + heuristica(modelo, nueva_clave)
+            nodos_vivos.push(nuevo_costo, (nuevo_costo, nueva_clave, profundidad + 1, nuevo_camino))
 
-    return mejor_solucion
+    if mejor_camino is None and max_movimientos == 2 ** modelo.total_discos:
+        return None
+    # La lista de movimientos se arma una sola vez, para la mejor solución
+    return reconstruir_movimientos(mejor_camino)
 
 
 # 🔽 Ejemplo de uso:
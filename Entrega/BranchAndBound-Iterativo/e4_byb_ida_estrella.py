@@ -0,0 +1,250 @@
+from array import array
+
+from cache_soluciones import nombre_en_cache, resolver_con_cache
+from e1_byb_heuristica_simple import heuristica
+from estado_compacto import TORRES, ModeloTorres
+from simetria import canonizador
+
+
+class Disco:
+    def __init__(self, tamanio):
+        self.tamanio = tamanio
+
+    def puede_moverse(self):
+        return True
+
+    def mover(self):
+        pass
+
+    def deshacer_movimiento(self):
+        pass
+
+
+class DiscoFragil(Disco):
+    def __init__(self, tamanio, max_movimientos):
+        super().__init__(tamanio)
+        self.max_movimientos = max_movimientos
+        self.movimientos_realizados = 0
+
+    def puede_moverse(self):
+        return self.movimientos_realizados < self.max_movimientos
+
+    def mover(self):
+        self.movimientos_realizados += 1
+
+    def deshacer_movimiento(self):
+        self.movimientos_realizados -= 1
+
+
+INDICE_TORRE = {nombre: indice for indice, nombre in enumerate(TORRES)}
+TAMANIO_TABLA = 1 << 16
+
+
+def copiar_torres(torres):
+    nuevas_torres = {}
+    for clave, pila in torres.items():
+        nueva_pila = []
+        for disco in pila:
+            if isinstance(disco, DiscoFragil) or hasattr(disco, "max_movimientos"):
+                nuevo_disco = DiscoFragil(disco.tamanio, disco.max_movimientos)
+                nuevo_disco.movimientos_realizados = disco.movimientos_realizados
+            else:
+                nuevo_disco = Disco(disco.tamanio)
+            nueva_pila.append(nuevo_disco)
+        nuevas_torres[clave] = nueva_pila
+    return nuevas_torres
+
+
+def generar_movimientos_posibles(torres):
+    movimientos = []
+    for origen in TORRES:
+        if not torres[origen]:
+            continue
+        disco = torres[origen][-1]
+        if not disco.puede_moverse():
+            continue
+        for destino in TORRES:
+            if origen == destino:
+                continue
+            if torres[destino] and torres[destino][-1].tamanio < disco.tamanio:
+                continue
+            movimientos.append((origen, destino, disco))
+    return movimientos
+
+
+class TablaTransposicion:
+    """
+    Tabla de tamaño fijo (potencia de 2) indexada por hash de la clave del estado.
+
+    Guarda con qué g se exploró cada estado en la iteración actual: si se vuelve a llegar con un g igual o mayor,
+    la cota restante es menor o igual y ese subárbol ya se recorrió, así que se poda. Ante una colisión se
+    reemplaza la entrada si es de una iteración anterior o si la nueva tiene g menor o igual (su subárbol es más
+    grande y vale más recordarlo). Con 'canonizar' (ver simetria.canonizador) un estado y su espejo ocupan la
+    misma entrada.
+    """
+
+    __slots__ = ("claves", "gs", "iteraciones", "mascara", "iteracion", "podados", "canonizar")
+
+    def __init__(self, tamanio=TAMANIO_TABLA, canonizar=None):
+        tamanio = 1 << max(tamanio - 1, 0).bit_length()
+        self.claves = [None] * tamanio
+        self.gs = array("l", [0]) * tamanio
+        self.iteraciones = array("l", [-1]) * tamanio
+        self.mascara = tamanio - 1
+        self.iteracion = 0
+        self.podados = 0
+        self.canonizar = canonizar
+
+    def nueva_iteracion(self):
+        # Las entradas viejas no se borran: quedan invalidadas por el número de iteración
+        self.iteracion += 1
+
+    def registrar(self, clave, g):
+        """
+        Returns:
+            bool: False si el estado ya se exploró en esta iteración con g <= al actual.
+        """
+        if self.canonizar is not None:
+            clave = self.canonizar(clave)
+        i = hash(clave) & self.mascara
+        if self.claves[i] == clave and self.iteraciones[i] == self.iteracion:
+            if self.gs[i] <= g:
+                self.podados += 1
+                return False
+            self.gs[i] = g
+            return True
+        if self.iteraciones[i] != self.iteracion or g <= self.gs[i]:
+            self.claves[i] = clave
+            self.gs[i] = g
+            self.iteraciones[i] = self.iteracion
+        return True
+
+
+def profundizar(torres, modelo, clave_ini, cota, heuristica, tabla, movimientos, estadisticas):
+    """
+    Búsqueda en profundidad acotada por costo (g + h <= cota), moviendo los discos en el lugar y deshaciendo los
+    movimientos al volver, igual que hanoi_backtracking. Usa una pila explícita para no depender del límite de
+    recursión, ya que las soluciones pueden tener miles de movimientos.
+    Returns:
+        True si encontró la solución (queda en 'movimientos'), si no el menor costo que superó la cota.
+    """
+    minimo_excedido = float('inf')
+    # Cada nivel guarda los movimientos pendientes (en orden inverso, para sacarlos con pop) y su clave
+    pendientes = [generar_movimientos_posibles(torres)[::-1]]
+    claves = [clave_ini]
+    while pendientes:
+        if not pendientes[-1]:
+            pendientes.pop()
+            claves.pop()
+            if pendientes:
+                # Deshacer el movimiento que llevó a este nivel
+                origen, destino, _ = movimientos.pop()
+                disco = torres[destino].pop()
+                disco.deshacer_movimiento()
+                torres[origen].append(disco)
+            continue
+
+        origen, destino, disco = pendientes[-1].pop()
+        if movimientos and movimientos[-1][2] == disco.tamanio: # si estoy moviendo el mismo disco dos veces podo
+            continue
+
+        g = len(movimientos) + 1
+        nueva_clave = modelo.mover(claves[-1], INDICE_TORRE[origen], INDICE_TORRE[destino], disco.tamanio)
+        costo = g + heuristica(modelo, nueva_clave)
+        if costo > cota:
+            minimo_excedido = min(minimo_excedido, costo)
+            continue
+        if not tabla.registrar(nueva_clave, g):
+            continue
+
+        # Mover disco
+        torres[origen].pop()
+        torres[destino].append(disco)
+        disco.mover()
+        movimientos.append((origen, destino, disco.tamanio))
+        estadisticas["nodos"] += 1
+
+        if modelo.es_solucion(nueva_clave):
+            return True
+
+        pendientes.append(generar_movimientos_posibles(torres)[::-1])
+        claves.append(nueva_clave)
+    return minimo_excedido
+
+
+def hanoi_ida_estrella(torres_iniciales, heuristica=heuristica, tamanio_tabla=TAMANIO_TABLA, estadisticas=None, cache=None):
+    """
+    Resuelve el problema de la Torre de Hanoi con IDA* (A* por profundización iterativa).
+
+    En lugar de guardar todos los nodos vivos como hanoi_branch_and_bound, repite búsquedas en profundidad con una
+    cota de costo creciente. La memoria es O(profundidad + tamaño de la tabla de transposición).
+    Args:
+        torres_iniciales (dict): Diccionario con las torres iniciales
+        heuristica (callable): heuristica(modelo, clave), admisible, como la de e1_byb_heuristica_simple o
+            base_patrones.BasePatrones.
+        tamanio_tabla (int): Cantidad de entradas de la tabla de transposición.
+        estadisticas (dict): Si se pasa, se completa con 'nodos', 'iteraciones' y 'podados_tabla'.
+        cache (CacheSoluciones): Si se pasa, primero se busca la instancia en esa cache_soluciones.CacheSoluciones
+            y la solución nueva se guarda ahí (por defecto, sin cache).
+    Returns:
+        list: La secuencia óptima de movimientos (origen, destino, tamanio_disco), o None si no hay solución.
+    """
+    if cache is not None:
+        return resolver_con_cache(
+            cache, nombre_en_cache("ida", heuristica), torres_iniciales, estadisticas,
+            lambda torres, estadisticas: hanoi_ida_estrella(torres, heuristica, tamanio_tabla, estadisticas),
+        )
+    if estadisticas is None:
+        estadisticas = {}
+    estadisticas.update(nodos=0, iteraciones=0, podados_tabla=0)
+
+    modelo = ModeloTorres(torres_iniciales)
+    torres = copiar_torres(torres_iniciales)
+    clave = modelo.codificar(torres)
+    if modelo.es_solucion(clave):
+        return []
+
+    # Un camino óptimo nunca repite un estado, así que no puede ser más largo que la cantidad de estados
+    limite = 3 ** modelo.total_discos
+    for radio in modelo.radios:
+        if radio:
+            limite *= radio
+
+    tabla = TablaTransposicion(tamanio_tabla, canonizador(modelo))
+    movimientos = []
+    cota = heuristica(modelo, clave)
+    while cota <= limite:
+        tabla.nueva_iteracion()
+        tabla.registrar(clave, 0)
+        estadisticas["iteraciones"] += 1
+        resultado = profundizar(torres, modelo, clave, cota, heuristica, tabla, movimientos, estadisticas)
+        estadisticas["podados_tabla"] = tabla.podados
+        if resultado is True:
+            return movimientos
+        cota = resultado
+    return None
+
+
+# 🔽 Ejemplo de uso:
+
+if __name__ == "__main__":
+
+    import time
+    from base_patrones import BasePatrones
+    torres = {
+        "Origen": [Disco(7), Disco(6), Disco(5), Disco(4), Disco(3), DiscoFragil(2, 32), DiscoFragil(1, 64)],
+        "Auxiliar": [],
+        "Destino": [],
+    }
+    estadisticas = {}
+    inicio = time.time()
+
+    solucion = hanoi_ida_estrella(torres, heuristica=BasePatrones(torres), estadisticas=estadisticas)
+
+    fin = time.time()
+    if solucion is None:
+        print("❌ No se encontró solución")
+    else:
+        print(f"✅ Solución encontrada con {len(solucion)} movimientos")
+    print(f"🔁 Nodos expandidos: {estadisticas['nodos']} en {estadisticas['iteraciones']} iteraciones")
+    print(f"\n🕒 Tiempo de ejecución: {fin - inicio:.4f} segundos")
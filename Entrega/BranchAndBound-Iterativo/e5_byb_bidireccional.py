@@ -0,0 +1,222 @@
+from cache_soluciones import resolver_con_cache
+from estado_compacto import TORRES, ModeloTorres, empaquetar_movimiento, reconstruir_movimientos
+from tabla_estados import nueva_tabla
+from tabla_movimientos import TABLA
+
+
+class Disco:
+    def __init__(self, tamanio):
+        self.tamanio = tamanio
+
+    def puede_moverse(self):
+        return True
+
+    def mover(self):
+        pass
+
+    def deshacer_movimiento(self):
+        pass
+
+
+class DiscoFragil(Disco):
+    def __init__(self, tamanio, max_movimientos):
+        super().__init__(tamanio)
+        self.max_movimientos = max_movimientos
+        self.movimientos_realizados = 0
+
+    def puede_moverse(self):
+        return self.movimientos_realizados < self.max_movimientos
+
+    def mover(self):
+        self.movimientos_realizados += 1
+
+    def deshacer_movimiento(self):
+        self.movimientos_realizados -= 1
+
+
+def movimientos_sin_presupuesto(modelo, posiciones):
+    """
+    Movimientos legales mirando solo la posición de los discos (sin límites de los discos frágiles).
+    Sin presupuestos todo movimiento se puede deshacer, así que sirven para buscar hacia adelante y hacia atrás.
+    Args:
+        modelo (ModeloTorres): Modelo de la instancia.
+        posiciones (int): Parte de la clave con la posición de los discos.
+    Returns:
+        list: Tuplas (origen, destino, tamanio) con los índices de las torres.
+    """
+    cimas, firma = modelo.cimas_y_firma(posiciones)
+    return [(origen, destino, cimas[origen]) for origen, destino in TABLA[firma << 3]]
+
+
+def expandir_nivel(modelo, frontera, propios, ajenos):
+    """
+    Expande un nivel completo de una de las dos búsquedas.
+    Args:
+        frontera (list): Posiciones del último nivel de esta búsqueda.
+        propios (dict): Posición -> último eslabón del camino, de esta búsqueda.
+        ajenos (dict): Lo mismo para la búsqueda del otro lado.
+    Returns:
+        tuple: (nueva frontera, posiciones donde se cruzó con la otra búsqueda).
+    """
+    nueva_frontera = []
+    encuentros = []
+    for posiciones in frontera:
+        camino = propios[posiciones]
+        for origen, destino, tamanio in movimientos_sin_presupuesto(modelo, posiciones):
+            if camino is not None and camino[1] >> 4 == tamanio: # mover dos veces el mismo disco nunca es óptimo
+                continue
+            vecino = posiciones + ((destino - origen) << (2 * (tamanio - 1)))
+            if vecino in propios:
+                continue
+            propios[vecino] = (camino, empaquetar_movimiento(origen, destino, tamanio))
+            nueva_frontera.append(vecino)
+            if vecino in ajenos:
+                encuentros.append(vecino)
+    return nueva_frontera, encuentros
+
+
+def unir_caminos(ida, vuelta):
+    """
+    Args:
+        ida (tuple): Eslabón del camino desde el inicio hasta el punto de encuentro.
+        vuelta (tuple): Eslabón del camino desde la meta hasta el punto de encuentro (movimientos al revés).
+    Returns:
+        list: Movimientos (origen, destino, tamanio_disco) desde el inicio hasta la meta.
+    """
+    movimientos = reconstruir_movimientos(ida)
+    for origen, destino, tamanio in reversed(reconstruir_movimientos(vuelta)):
+        movimientos.append((destino, origen, tamanio))
+    return movimientos
+
+
+def busqueda_bidireccional(modelo, inicio, estadisticas):
+    """
+    Búsqueda en anchura desde el inicio y desde la meta a la vez, sobre la posición de los discos, expandiendo
+    siempre la frontera más chica. Cuando un nivel se cruza con la otra búsqueda se termina el nivel y se toma el
+    encuentro con el camino total más corto.
+    Returns:
+        list: Camino más corto ignorando los presupuestos de los discos frágiles.
+    """
+    if inicio == modelo.meta:
+        return []
+    ida = {inicio: None}
+    vuelta = {modelo.meta: None}
+    frontera_ida = [inicio]
+    frontera_vuelta = [modelo.meta]
+    # profundidad[k] es la distancia al extremo de cada posición, para comparar encuentros del mismo nivel
+    profundidad_ida = {inicio: 0}
+    profundidad_vuelta = {modelo.meta: 0}
+    nivel_ida = nivel_vuelta = 0
+
+    while frontera_ida and frontera_vuelta:
+        if len(frontera_ida) <= len(frontera_vuelta):
+            nivel_ida += 1
+            frontera_ida, encuentros = expandir_nivel(modelo, frontera_ida, ida, vuelta)
+            estadisticas["nodos_ida"] += len(frontera_ida)
+            for posiciones in frontera_ida:
+                profundidad_ida[posiciones] = nivel_ida
+        else:
+            nivel_vuelta += 1
+            frontera_vuelta, encuentros = expandir_nivel(modelo, frontera_vuelta, vuelta, ida)
+            estadisticas["nodos_vuelta"] += len(frontera_vuelta)
+            for posiciones in frontera_vuelta:
+                profundidad_vuelta[posiciones] = nivel_vuelta
+
+        if encuentros:
+            mejor = min(encuentros, key=lambda p: profundidad_ida[p] + profundidad_vuelta[p])
+            return unir_caminos(ida[mejor], vuelta[mejor])
+    return None
+
+
+def respeta_presupuestos(modelo, clave, movimientos):
+    """Simula los movimientos sobre la clave completa y verifica que ningún disco frágil se pase de su límite."""
+    indice = {nombre: i for i, nombre in enumerate(TORRES)}
+    for origen, destino, tamanio in movimientos:
+        if not modelo.puede_moverse(clave, tamanio):
+            return False
+        clave = modelo.mover(clave, indice[origen], indice[destino], tamanio)
+    return True
+
+
+def busqueda_hacia_adelante(modelo, inicio, estadisticas):
+    """
+    Búsqueda en anchura solo desde el inicio, sobre la clave completa (con los movimientos consumidos), para
+    cuando los presupuestos importan. La tabla de estados poda también las llegadas dominadas.
+    """
+    estados = nueva_tabla(modelo)
+    estados.registrar(inicio, 0)
+    frontera = [(inicio, None)]
+    profundidad = 0
+    while frontera:
+        profundidad += 1
+        nueva_frontera = []
+        for clave, camino in frontera:
+            for origen, destino, tamanio in modelo.generar_movimientos_posibles(clave):
+                if camino is not None and camino[1] >> 4 == tamanio:
+                    continue
+                nueva_clave = modelo.mover(clave, origen, destino, tamanio)
+                if not estados.registrar(nueva_clave, profundidad):
+                    continue
+                nuevo_camino = (camino, empaquetar_movimiento(origen, destino, tamanio))
+                if modelo.es_solucion(nueva_clave):
+                    return reconstruir_movimientos(nuevo_camino)
+                nueva_frontera.append((nueva_clave, nuevo_camino))
+        estadisticas["nodos_ida"] += len(nueva_frontera)
+        frontera = nueva_frontera
+    return None
+
+
+def hanoi_bidireccional(torres_iniciales, estadisticas=None, cache=None):
+    """
+    Resuelve el problema de la Torre de Hanoi buscando a la vez desde el inicio y desde la meta.
+
+    La búsqueda hacia atrás solo es exacta sin presupuestos (no se sabe cuántos movimientos le quedan a cada disco
+    frágil en la meta), así que se busca sobre la posición de los discos. Ese camino es el más corto posible; si
+    además respeta los presupuestos es la solución óptima. Si no los respeta, se vuelve a buscar solo hacia
+    adelante sobre el estado completo.
+    Args:
+        torres_iniciales (dict): Diccionario con las torres iniciales
+        estadisticas (dict): Si se pasa, se completa con 'modo', 'nodos_ida' y 'nodos_vuelta'.
+        cache (CacheSoluciones): Si se pasa, primero se busca la instancia en esa cache_soluciones.CacheSoluciones
+            y la solución nueva se guarda ahí (por defecto, sin cache).
+    Returns:
+        list: La secuencia óptima de movimientos (origen, destino, tamanio_disco), o None si no hay solución.
+    """
+    if cache is not None:
+        return resolver_con_cache(cache, "bidireccional", torres_iniciales, estadisticas, hanoi_bidireccional)
+    if estadisticas is None:
+        estadisticas = {}
+    estadisticas.update(modo="bidireccional", nodos_ida=0, nodos_vuelta=0)
+
+    modelo = ModeloTorres(torres_iniciales)
+    clave = modelo.codificar(torres_iniciales)
+    movimientos = busqueda_bidireccional(modelo, modelo.posiciones(clave), estadisticas)
+    if not modelo.fragiles or respeta_presupuestos(modelo, clave, movimientos):
+        return movimientos
+
+    estadisticas["modo"] = "hacia_adelante"
+    return busqueda_hacia_adelante(modelo, clave, estadisticas)
+
+
+# 🔽 Ejemplo de uso:
+
+if __name__ == "__main__":
+
+    import time
+    torres = {
+        "Origen": [Disco(12), Disco(11), Disco(10), Disco(9), Disco(8), Disco(7), Disco(6), Disco(5), Disco(4), Disco(3), Disco(2), Disco(1)],
+        "Auxiliar": [],
+        "Destino": [],
+    }
+    estadisticas = {}
+    inicio = time.time()
+
+    solucion = hanoi_bidireccional(torres, estadisticas=estadisticas)
+
+    fin = time.time()
+    if solucion is None:
+        print("❌ No se encontró solución")
+    else:
+        print(f"✅ Solución encontrada con {len(solucion)} movimientos ({estadisticas['modo']})")
+    print(f"🔁 Estados generados: {estadisticas['nodos_ida']} desde el inicio, {estadisticas['nodos_vuelta']} desde la meta")
+    print(f"\n🕒 Tiempo de ejecución: {fin - inicio:.4f} segundos")
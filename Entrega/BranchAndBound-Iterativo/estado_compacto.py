@@ -0,0 +1,255 @@
+from tabla_movimientos import TABLA
+
+TORRES = ["Origen", "Auxiliar", "Destino"]
+
+
+class Disco:
+    def __init__(self, tamanio):
+        self.tamanio = tamanio
+
+    def puede_moverse(self):
+        return True
+
+    def mover(self):
+        pass
+
+    def deshacer_movimiento(self):
+        pass
+
+
+class DiscoFragil(Disco):
+    def __init__(self, tamanio, max_movimientos):
+        super().__init__(tamanio)
+        self.max_movimientos = max_movimientos
+        self.movimientos_realizados = 0
+
+    def puede_moverse(self):
+        return self.movimientos_realizados < self.max_movimientos
+
+    def mover(self):
+        self.movimientos_realizados += 1
+
+    def deshacer_movimiento(self):
+        self.movimientos_realizados -= 1
+
+
+def estado_serializado(torres):
+    """
+    Empaqueta la posición de los discos en un único entero.
+
+    Args:
+        torres (dict): Diccionario con las torres como claves y listas de discos como valores.
+
+    Returns:
+        int: 2 bits por disco (en la posición 2 * (tamaño - 1)) con el índice de la torre donde está.
+    """
+    estado = 0
+    # "Origen" tiene índice 0, así que sus discos no aportan bits
+    for indice, nombre in ((1, "Auxiliar"), (2, "Destino")):
+        for d in torres[nombre]:
+            estado |= indice << (2 * (d.tamanio - 1))
+    return estado
+
+
+class CodificadorEstado:
+    """
+    Codifica el estado completo de las torres (posiciones + movimientos de los discos frágiles) en un entero.
+
+    Los 2 * total_discos bits bajos son los de estado_serializado. Por encima se guarda un campo de base mixta
+    con los movimientos realizados por cada DiscoFragil, ordenados por tamaño: el disco frágil de tamaño t usa
+    la base max_movimientos + 1. Los discos comunes no ocupan lugar en ese campo.
+    """
+
+    __slots__ = ("total_discos", "maximos", "pesos", "mascara_posiciones")
+
+    def __init__(self, torres):
+        discos = [d for nombre in TORRES for d in torres[nombre]]
+        self.total_discos = len(discos)
+        # maximos[t] es el límite de movimientos del disco de tamaño t (None si es un disco común)
+        self.maximos = [None] * (self.total_discos + 1)
+        for d in discos:
+            if hasattr(d, "max_movimientos"):
+                self.maximos[d.tamanio] = d.max_movimientos
+        # pesos[t] es el valor de un movimiento del disco t dentro de la clave (0 para discos comunes)
+        self.pesos = [0] * (self.total_discos + 1)
+        peso = 1 << (2 * self.total_discos)
+        for tamanio in range(1, self.total_discos + 1):
+            if self.maximos[tamanio] is not None:
+                self.pesos[tamanio] = peso
+                peso *= self.maximos[tamanio] + 1
+        self.mascara_posiciones = (1 << (2 * self.total_discos)) - 1
+
+    def codificar(self, torres):
+        """
+        Args:
+            torres (dict): Diccionario con las torres como claves y listas de discos como valores.
+        Returns:
+            int: Clave del estado, incluyendo los movimientos consumidos por los discos frágiles.
+        """
+        clave = estado_serializado(torres)
+        pesos = self.pesos
+        for nombre in TORRES:
+            for d in torres[nombre]:
+                if pesos[d.tamanio]:
+                    clave += d.movimientos_realizados * pesos[d.tamanio]
+        return clave
+
+    def decodificar(self, clave):
+        """
+        Reconstruye las torres a partir de una clave generada por codificar().
+        Args:
+            clave (int): Clave del estado.
+        Returns:
+            dict: Torres con discos nuevos (Disco o DiscoFragil con sus movimientos realizados restaurados).
+        """
+        torres = {nombre: [] for nombre in TORRES}
+        # Se recorre de mayor a menor para apilar los discos en orden
+        for tamanio in range(self.total_discos, 0, -1):
+            torre = (clave >> (2 * (tamanio - 1))) & 3
+            if self.pesos[tamanio]:
+                disco = DiscoFragil(tamanio, self.maximos[tamanio])
+                disco.movimientos_realizados = (clave // self.pesos[tamanio]) % (self.maximos[tamanio] + 1)
+            else:
+                disco = Disco(tamanio)
+            torres[TORRES[torre]].append(disco)
+        return torres
+
+    def posiciones(self, clave):
+        """Devuelve solo la parte de la clave con la posición de los discos."""
+        return clave & self.mascara_posiciones
+
+
+class ModeloTorres(CodificadorEstado):
+    """
+    Modelo compacto de las torres para los motores de búsqueda.
+
+    El estado es directamente la clave entera de CodificadorEstado: las torres se identifican por su índice en
+    TORRES (0, 1, 2), la posición de cada disco ocupa 2 bits y los movimientos consumidos por los discos frágiles
+    viven en el campo de base mixta. Copiar un estado es copiar un entero y mover un disco es una suma, así que
+    los objetos Disco/DiscoFragil y los nombres de las torres solo se usan al construir el modelo y al devolver
+    los movimientos.
+    """
+
+    __slots__ = ("radios", "meta", "fragiles")
+
+    def __init__(self, torres):
+        super().__init__(torres)
+        # radios[t] es la base del campo del disco frágil t (0 para discos comunes)
+        self.radios = [0 if maximo is None else maximo + 1 for maximo in self.maximos]
+        self.fragiles = [tamanio for tamanio in range(1, self.total_discos + 1) if self.pesos[tamanio]]
+        # Todos los discos en "Destino" (índice 2)
+        self.meta = self.mascara_posiciones // 3 * 2
+
+    def cimas(self, clave):
+        """
+        Args:
+            clave (int): Estado actual.
+        Returns:
+            list: Tamaño del disco superior de cada torre, en el orden de TORRES (0 si la torre está vacía).
+        """
+        cimas = [0, 0, 0]
+        faltan = 3
+        for tamanio in range(1, self.total_discos + 1):
+            torre = clave & 3
+            if not cimas[torre]:
+                cimas[torre] = tamanio
+                faltan -= 1
+                if not faltan:
+                    break
+            clave >>= 2
+        return cimas
+
+    def cimas_y_firma(self, posiciones):
+        """
+        Como cimas, pero además devuelve la firma que indexa tabla_movimientos.TABLA: 2 bits por torre con el rango
+        de su disco superior (1 para la cima más chica, 3 para la más grande, 0 si está vacía). Se calcula en la
+        misma pasada que las cimas, que termina en cuanto aparecen las tres, así que no hace falta memorizarla.
+        Args:
+            posiciones (int): Parte de la clave con la posición de los discos (clave & mascara_posiciones).
+        Returns:
+            tuple: (cimas, firma).
+        """
+        cimas = [0, 0, 0]
+        firma = 0
+        rango = 0
+        resto = posiciones
+        for tamanio in range(1, self.total_discos + 1):
+            torre = resto & 3
+            if not cimas[torre]:
+                cimas[torre] = tamanio
+                rango += 1
+                firma |= rango << (2 * torre)
+                if rango == 3:
+                    break
+            resto >>= 2
+        return cimas, firma
+
+    def discos_en(self, clave, torre):
+        """Cantidad de discos en la torre de índice 'torre'."""
+        cantidad = 0
+        for _ in range(self.total_discos):
+            if clave & 3 == torre:
+                cantidad += 1
+            clave >>= 2
+        return cantidad
+
+    def es_solucion(self, clave):
+        return clave & self.mascara_posiciones == self.meta
+
+    def puede_moverse(self, clave, tamanio):
+        peso = self.pesos[tamanio]
+        return not peso or (clave // peso) % self.radios[tamanio] < self.maximos[tamanio]
+
+    def restantes(self, clave):
+        """Movimientos que le quedan a cada disco frágil, de menor a mayor tamaño."""
+        return tuple(
+            self.maximos[tamanio] - (clave // self.pesos[tamanio]) % self.radios[tamanio]
+            for tamanio in self.fragiles
+        )
+
+    def mover(self, clave, origen, destino, tamanio):
+        """Devuelve el estado que resulta de mover el disco 'tamanio' de la torre 'origen' a 'destino'."""
+        return clave + ((destino - origen) << (2 * (tamanio - 1))) + self.pesos[tamanio]
+
+    def generar_movimientos_posibles(self, clave):
+        """
+        Mismo recorrido que generar_movimientos_posibles sobre el diccionario de torres, pero con una sola consulta a
+        TABLA: la firma de las cimas sale de cimas_y_firma y los frágiles agotados se filtran con la máscara de
+        torres bloqueadas.
+        Args:
+            clave (int): Estado actual.
+        Returns:
+            list: Tuplas (origen, destino, tamanio) con los índices de las torres.
+        """
+        cimas, firma = self.cimas_y_firma(clave & self.mascara_posiciones)
+
+        # Filtro final: un bit por torre cuyo disco superior es un frágil sin movimientos restantes
+        bloqueadas = 0
+        pesos = self.pesos
+        for torre in range(3):
+            peso = pesos[cimas[torre]]
+            if peso and (clave // peso) % self.radios[cimas[torre]] >= self.maximos[cimas[torre]]:
+                bloqueadas |= 1 << torre
+        return [(origen, destino, cimas[origen]) for origen, destino in TABLA[firma << 3 | bloqueadas]]
+
+
+def empaquetar_movimiento(origen, destino, tamanio):
+    """Guarda un movimiento en un entero: 2 bits para cada torre y el tamaño del disco por encima."""
+    return (tamanio << 4) | (origen << 2) | destino
+
+
+def reconstruir_movimientos(camino):
+    """
+    Los nodos vivos no guardan la lista de movimientos sino un eslabón (eslabón_padre, movimiento_empaquetado),
+    con None como eslabón de la raíz, así que todos los hijos comparten el prefijo de su padre.
+    Args:
+        camino (tuple): Último eslabón del camino.
+    Returns:
+        list: Tuplas (origen, destino, tamanio_disco) con los nombres de las torres, desde la raíz.
+    """
+    movimientos = []
+    while camino is not None:
+        camino, movimiento = camino
+        movimientos.append((TORRES[(movimiento >> 2) & 3], TORRES[movimiento & 3], movimiento >> 4))
+    movimientos.reverse()
+    return movimientos
@@ -0,0 +1,241 @@
+from estado_compacto import TORRES, ModeloTorres
+
+try:
+    import numpy as np
+except ImportError:     # Sin NumPy se expande nodo por nodo, con el mismo recorrido y el mismo resultado
+    np = None
+
+
+def usa_numpy(modelo):
+    """True si hay NumPy y las claves de la instancia entran en un int64."""
+    if np is None:
+        return False
+    limite = 1 << (2 * modelo.total_discos)
+    for tamanio in modelo.fragiles:
+        limite *= modelo.radios[tamanio]
+    return limite < 1 << 63
+
+
+def discos_fuera_de_destino(modelo, claves):
+    """
+    La heurística de e1_byb_heuristica_simple (discos que no están en "Destino") para un lote de claves.
+    Args:
+        claves: Arreglo de NumPy (int64) o lista de claves.
+    Returns:
+        Arreglo de NumPy o lista con el valor de cada clave.
+    """
+    if np is not None and isinstance(claves, np.ndarray):
+        fuera = np.zeros(len(claves), dtype=np.int64)
+        for tamanio in range(1, modelo.total_discos + 1):
+            fuera += ((claves >> (2 * (tamanio - 1))) & 3) != 2
+        return fuera
+    return [modelo.total_discos - modelo.discos_en(clave, 2) for clave in claves]
+
+
+def evaluar_lote(modelo, claves, heuristica):
+    """
+    Usa heuristica.lote(modelo, claves) si la heurística tiene versión en lote; si no, la evalúa clave por clave.
+    Returns:
+        Valor de la heurística para cada clave (inf para los estados sin salida), en un arreglo o una lista.
+    """
+    lote = getattr(heuristica, "lote", None)
+    if lote is not None:
+        return lote(modelo, claves)
+    return [heuristica(modelo, int(clave)) for clave in claves]
+
+
+def expandir_lote_numpy(modelo, claves, ultimos):
+    """
+    Expande toda la frontera de una vez: las cimas, los frágiles agotados y la legalidad de los 6 pares se calculan
+    con operaciones sobre arreglos, sin un ciclo de Python por nodo.
+    Args:
+        claves (np.ndarray): Claves de la frontera (int64).
+        ultimos (np.ndarray): Tamaño del último disco movido para llegar a cada clave (0 en la raíz).
+    Returns:
+        tuple: (padres, hijos, movimientos) como arreglos: índice en 'claves' del padre de cada hijo, clave del hijo
+               y movimiento empaquetado. Los hijos de cada padre quedan juntos y en el orden de
+               ModeloTorres.generar_movimientos_posibles.
+    """
+    cantidad = len(claves)
+    indices = np.arange(cantidad)
+    pesos = np.array(modelo.pesos, dtype=np.int64)
+    radios = np.array([radio or 1 for radio in modelo.radios], dtype=np.int64)
+    maximos = np.array([0 if maximo is None else maximo for maximo in modelo.maximos], dtype=np.int64)
+    desplazamientos = np.array([0] + [1 << (2 * (t - 1)) for t in range(1, modelo.total_discos + 1)], dtype=np.int64)
+
+    # cimas[torre, i] = disco superior de esa torre en la clave i (0 si está vacía). De mayor a menor, así el
+    # último que se escribe en cada torre es el más chico.
+    cimas = np.zeros((3, cantidad), dtype=np.int64)
+    for tamanio in range(modelo.total_discos, 0, -1):
+        cimas[(claves >> (2 * (tamanio - 1))) & 3, indices] = tamanio
+
+    # Torres cuyo disco superior no se puede mover: frágil agotado o el mismo disco del movimiento anterior
+    bloqueadas = np.zeros((3, cantidad), dtype=bool)
+    for torre in range(3):
+        cima = cimas[torre]
+        peso = pesos[cima]
+        consumidos = (claves // np.maximum(peso, 1)) % radios[cima]
+        bloqueadas[torre] = ((peso > 0) & (consumidos >= maximos[cima])) | (cima == ultimos)
+
+    padres, hijos, movimientos = [], [], []
+    for origen in range(3):
+        for destino in range(3):
+            if origen == destino:
+                continue
+            cima, otra = cimas[origen], cimas[destino]
+            legales = np.nonzero((cima > 0) & ~bloqueadas[origen] & ((otra == 0) | (otra > cima)))[0]
+            tamanios = cima[legales]
+            padres.append(legales)
+            hijos.append(claves[legales] + (destino - origen) * desplazamientos[tamanios] + pesos[tamanios])
+            movimientos.append((tamanios << 4) | (origen << 2) | destino)
+
+    padres = np.concatenate(padres)
+    orden = np.argsort(padres, kind="stable")
+    return padres[orden], np.concatenate(hijos)[orden], np.concatenate(movimientos)[orden]
+
+
+def expandir_lote_python(modelo, claves, ultimos):
+    """Misma salida que expandir_lote_numpy, con listas."""
+    padres, hijos, movimientos = [], [], []
+    for indice, clave in enumerate(claves):
+        for origen, destino, tamanio in modelo.generar_movimientos_posibles(clave):
+            if tamanio == ultimos[indice]:
+                continue
+            padres.append(indice)
+            hijos.append(modelo.mover(clave, origen, destino, tamanio))
+            movimientos.append((tamanio << 4) | (origen << 2) | destino)
+    return padres, hijos, movimientos
+
+
+class ConjuntoOrdenado:
+    """
+    Conjunto de claves en arreglos ordenados de NumPy, para consultar un lote entero con searchsorted.
+
+    Se guardan varias tandas ordenadas; al agregar, las tandas de tamaño parecido se funden (como un contador
+    binario), así que cada clave se vuelve a copiar O(log n) veces en total y nunca hay más de O(log n) tandas.
+    Fundir todo en cada capa costaría O(visitados) por capa aunque la capa sea chica.
+    """
+
+    __slots__ = ("tandas",)
+
+    def __init__(self, claves):
+        self.tandas = [np.unique(claves)]
+
+    def contiene(self, claves):
+        """Arreglo de bool: True para las claves que ya están en el conjunto."""
+        presentes = np.zeros(len(claves), dtype=bool)
+        for tanda in self.tandas:
+            posiciones = np.minimum(np.searchsorted(tanda, claves), len(tanda) - 1)
+            presentes |= tanda[posiciones] == claves
+        return presentes
+
+    def agregar(self, claves):
+        """Agrega claves que no estaban en el conjunto (sin repetidas)."""
+        if not len(claves):
+            return
+        nueva = np.sort(claves)
+        while self.tandas and len(self.tandas[-1]) <= 2 * len(nueva):
+            # Las tandas no comparten claves, así que alcanza con ordenar la unión
+            nueva = np.sort(np.concatenate((self.tandas.pop(), nueva)), kind="stable")
+        self.tandas.append(nueva)
+
+
+def filtrar_nuevos(padres, hijos, movimientos, valores, visitados, con_numpy):
+    """
+    Se queda con la primera aparición de cada hijo que no esté en 'visitados' ni tenga heurística infinita.
+    Returns:
+        tuple: (padres, hijos, movimientos, visitados actualizado).
+    """
+    if con_numpy:
+        _, primeros = np.unique(hijos, return_index=True)
+        primeros.sort()
+        vivos = np.asarray(valores, dtype=float)[primeros] != float('inf')
+        primeros = primeros[vivos & ~visitados.contiene(hijos[primeros])]
+        visitados.agregar(hijos[primeros])
+        return padres[primeros], hijos[primeros], movimientos[primeros], visitados
+
+    nuevos_padres, nuevos_hijos, nuevos_movimientos = [], [], []
+    for padre, hijo, movimiento, valor in zip(padres, hijos, movimientos, valores):
+        if hijo in visitados or valor == float('inf'):
+            continue
+        visitados.add(hijo)
+        nuevos_padres.append(padre)
+        nuevos_hijos.append(hijo)
+        nuevos_movimientos.append(movimiento)
+    return nuevos_padres, nuevos_hijos, nuevos_movimientos, visitados
+
+
+def hanoi_por_capas(torres_iniciales, heuristica, cota_superior=None, estadisticas=None):
+    """
+    Búsqueda por niveles: cada capa (todos los estados a la misma cantidad de movimientos) se expande entera con
+    expandir_lote_numpy, o con expandir_lote_python si no hay NumPy o las claves no entran en 64 bits. La primera
+    capa que contiene una meta da la solución óptima.
+
+    La heurística se evalúa para todos los hijos de la capa a la vez (heuristica.lote si existe) y poda los estados
+    sin salida y, si se da 'cota_superior', los que ya no pueden terminar dentro de esa cantidad de movimientos.
+    Args:
+        torres_iniciales (dict): Diccionario con las torres iniciales.
+        heuristica (callable): heuristica(modelo, clave) admisible, como en hanoi_branch_and_bound.
+        cota_superior (int): Largo máximo de solución que interesa (por defecto, sin límite).
+        estadisticas (dict): Si se pasa, se completa con 'capas', 'nodos' y 'numpy'.
+    Returns:
+        list: La secuencia óptima de movimientos (origen, destino, tamanio_disco), o None si no hay solución.
+    """
+    if estadisticas is None:
+        estadisticas = {}
+    modelo = ModeloTorres(torres_iniciales)
+    con_numpy = usa_numpy(modelo)
+    expandir = expandir_lote_numpy if con_numpy else expandir_lote_python
+    estadisticas["numpy"] = con_numpy
+
+    clave_ini = modelo.codificar(torres_iniciales)
+    if heuristica(modelo, clave_ini) == float('inf'):
+        return None
+    if con_numpy:
+        frontera = np.array([clave_ini], dtype=np.int64)
+        ultimos = np.zeros(1, dtype=np.int64)
+        visitados = ConjuntoOrdenado(frontera)
+    else:
+        frontera, ultimos, visitados = [clave_ini], [0], {clave_ini}
+
+    capas = []      # (padres, movimientos) de cada capa, para reconstruir el camino al final
+    nodos = 0
+    while len(frontera):
+        if con_numpy:
+            metas = np.nonzero((frontera & modelo.mascara_posiciones) == modelo.meta)[0]
+            meta = int(metas[0]) if len(metas) else None
+        else:
+            meta = next((i for i, clave in enumerate(frontera) if modelo.es_solucion(clave)), None)
+        if meta is not None:
+            break
+        profundidad = len(capas) + 1
+        if cota_superior is not None and profundidad > cota_superior:
+            meta = None
+            break
+
+        nodos += len(frontera)
+        padres, hijos, movimientos = expandir(modelo, frontera, ultimos)
+        valores = evaluar_lote(modelo, hijos, heuristica)
+        if cota_superior is not None:
+            if con_numpy:
+                valores = np.where(profundidad + np.asarray(valores, dtype=float) <= cota_superior, valores, float('inf'))
+            else:
+                valores = [valor if profundidad + valor <= cota_superior else float('inf') for valor in valores]
+        padres, frontera, movimientos, visitados = filtrar_nuevos(padres, hijos, movimientos, valores, visitados, con_numpy)
+        ultimos = movimientos >> 4 if con_numpy else [movimiento >> 4 for movimiento in movimientos]
+        capas.append((padres, movimientos))
+    else:
+        meta = None
+
+    estadisticas["capas"] = len(capas)
+    estadisticas["nodos"] = nodos
+    if meta is None:
+        return None
+
+    movimientos = []
+    indice = meta
+    for padres, movimientos_capa in reversed(capas):
+        movimientos.append(int(movimientos_capa[indice]))
+        indice = int(padres[indice])
+    movimientos.reverse()
+    return [(TORRES[(m >> 2) & 3], TORRES[m & 3], m >> 4) for m in movimientos]
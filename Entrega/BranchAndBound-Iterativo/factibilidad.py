@@ -0,0 +1,157 @@
+from collections import deque
+from functools import lru_cache
+
+from estado_compacto import TORRES
+from simetria import espejar_posiciones
+
+LIMITE_PRESUPUESTO = 32         # Presupuestos mayores se tratan como "sin límite" dentro de la relajación
+TAMANIO_MAXIMO_VENTANA = 1 << 16
+
+
+def describir_discos(torres):
+    """
+    Returns:
+        tuple: (posicion, restantes). posicion[t] es el índice de la torre del disco t; restantes[t] son los
+               movimientos que le quedan (None para discos comunes). El índice 0 no se usa.
+    """
+    total_discos = sum(len(pila) for pila in torres.values())
+    posicion = [None] * (total_discos + 1)
+    restantes = [None] * (total_discos + 1)
+    for indice, nombre in enumerate(TORRES):
+        for disco in torres[nombre]:
+            posicion[disco.tamanio] = indice
+            if hasattr(disco, "max_movimientos"):
+                restantes[disco.tamanio] = disco.max_movimientos - disco.movimientos_realizados
+    return posicion, restantes
+
+
+def tamanio_ventana(presupuestos):
+    tamanio = 3 ** len(presupuestos)
+    for presupuesto in presupuestos[1:]:
+        if presupuesto is not None:
+            tamanio *= presupuesto + 1
+    return tamanio
+
+
+@lru_cache(maxsize=None)
+def minimo_movimientos(posiciones, presupuestos):
+    """
+    Subproblema relajado sobre una ventana de discos consecutivos (el primero es el disco a acotar): cuántas veces
+    como mínimo hay que mover ese disco para llevar la ventana entera a "Destino".
+
+    Los discos más grandes que la ventana nunca impiden mover uno más chico, y los más chicos se suponen libres de
+    moverse (siempre se pueden juntar en la otra torre), así que sacarlos solo agrega soluciones: el resultado es
+    una cota inferior para el problema completo. Se resuelve con una búsqueda 0-1 (mover el primer disco cuesta 1,
+    mover los demás cuesta 0 pero gasta su presupuesto). Se memoriza por ventana, así que las ventanas repetidas
+    entre discos o entre instancias no se recalculan.
+    Args:
+        posiciones (tuple): Torre de cada disco de la ventana, del más chico al más grande.
+        presupuestos (tuple): Movimientos restantes de cada disco (None si es común o si supera LIMITE_PRESUPUESTO).
+            El del primer disco no se usa: es justamente lo que se quiere acotar.
+    Returns:
+        float: La cantidad mínima de movimientos del primer disco, o inf si la ventana no puede llegar a "Destino".
+    """
+    k = len(posiciones)
+    inicio = (posiciones, presupuestos[1:])
+    distancias = {inicio: 0}
+    cola = deque([(0, inicio)])
+    while cola:
+        distancia, estado = cola.popleft()
+        if distancias[estado] != distancia:
+            continue
+        torres, restantes = estado
+        if all(torre == 2 for torre in torres):
+            return distancia
+        cima = [k, k, k]
+        for i in range(k - 1, -1, -1):
+            cima[torres[i]] = i
+        for i in range(k):
+            origen = torres[i]
+            if cima[origen] != i:
+                continue
+            if i and restantes[i - 1] is not None and restantes[i - 1] == 0:
+                continue
+            for destino in range(3):
+                if destino == origen or cima[destino] < i:
+                    continue
+                nuevas_torres = torres[:i] + (destino,) + torres[i + 1:]
+                nuevos_restantes = restantes
+                if i and restantes[i - 1] is not None:
+                    nuevos_restantes = restantes[:i - 1] + (restantes[i - 1] - 1,) + restantes[i:]
+                costo = 1 if i == 0 else 0
+                nuevo = (nuevas_torres, nuevos_restantes)
+                if distancia + costo < distancias.get(nuevo, float('inf')):
+                    distancias[nuevo] = distancia + costo
+                    if costo:
+                        cola.append((distancia + 1, nuevo))
+                    else:
+                        cola.appendleft((distancia, nuevo))
+    return float('inf')
+
+
+def analizar(torres, tamanio_maximo=TAMANIO_MAXIMO_VENTANA):
+    """
+    Cotas inferiores de cuántas veces tiene que moverse cada disco en cualquier solución, para descartar antes de
+    buscar las instancias cuyos discos frágiles no alcanzan.
+
+    Para cada disco t se toma la ventana t, t+1, ... más grande cuya búsqueda no supere 'tamanio_maximo' estados y se
+    calcula minimo_movimientos. Si la cota de un disco frágil supera sus movimientos restantes, no hay solución.
+    Args:
+        torres (dict): Diccionario con las torres iniciales.
+        tamanio_maximo (int): Límite de estados de cada subproblema relajado.
+    Returns:
+        tuple: (factible, disco_limitante, cotas). 'disco_limitante' es el tamaño del primer disco (de mayor a menor)
+               cuyo presupuesto no alcanza, o None. cotas[t] es la cota del disco t (cotas[0] no se usa).
+    """
+    posicion, restantes = describir_discos(torres)
+    total_discos = len(posicion) - 1
+    presupuestos = [
+        None if presupuesto is None or presupuesto > LIMITE_PRESUPUESTO else presupuesto
+        for presupuesto in restantes
+    ]
+    cotas = [0] * (total_discos + 1)
+    # De mayor a menor: si un disco grande no alcanza, ese es el que limita
+    for tamanio in range(total_discos, 0, -1):
+        fin = tamanio + 1
+        while fin <= total_discos and tamanio_ventana(presupuestos[tamanio:fin + 1]) <= tamanio_maximo:
+            fin += 1
+        ventana = tuple(posicion[tamanio:fin])
+        # La ventana y su espejo tienen la misma cota: se memoriza una sola
+        ventana = min(ventana, espejar_posiciones(ventana))
+        cotas[tamanio] = minimo_movimientos(ventana, tuple(presupuestos[tamanio:fin]))
+        if cotas[tamanio] == float('inf') or (restantes[tamanio] is not None and cotas[tamanio] > restantes[tamanio]):
+            return False, tamanio, cotas
+    return True, None, cotas
+
+
+def es_factible(torres):
+    """False solo si analizar demuestra que no hay solución (True no garantiza que la haya)."""
+    return analizar(torres)[0]
+
+
+# 🔽 Ejemplo de uso:
+
+if __name__ == "__main__":
+
+    import time
+    from e1_byb_heuristica_simple import Disco, DiscoFragil, hanoi_branch_and_bound
+
+    torres = {
+        "Origen": [Disco(5), Disco(4), DiscoFragil(3, 3), DiscoFragil(2, 6), DiscoFragil(1, 20)],
+        "Auxiliar": [],
+        "Destino": [],
+    }
+
+    inicio = time.time()
+    factible, disco, cotas = analizar(torres)
+    fin = time.time()
+    if factible:
+        print(f"✅ No se descartó la instancia. Cotas por disco: {cotas[1:]}")
+    else:
+        print(f"❌ Sin solución: el disco {disco} necesita al menos {cotas[disco]} movimientos")
+    print(f"🕒 Análisis: {(fin - inicio) * 1000:.2f} milisegundos")
+
+    inicio = time.time()
+    solucion = hanoi_branch_and_bound(torres)
+    fin = time.time()
+    print(f"🔎 Búsqueda completa: {'sin solución' if solucion is None else f'{len(solucion)} movimientos'} en {fin - inicio:.4f} segundos")
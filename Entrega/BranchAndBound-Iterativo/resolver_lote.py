@@ -0,0 +1,229 @@
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from base_patrones import BasePatrones
+from cache_soluciones import RUTA_CACHE, CacheSoluciones, con_cache, nombre_en_cache
+from e1_byb_heuristica_simple import hanoi_branch_and_bound, heuristica
+from e4_byb_ida_estrella import hanoi_ida_estrella
+from e5_byb_bidireccional import hanoi_bidireccional
+from estado_compacto import TORRES, Disco, DiscoFragil
+from solucion_directa import resolver
+
+MOTOR_POR_DEFECTO = "directo"
+TAREAS_POR_PROCESO = 4      # Instancias enviadas por adelantado a cada proceso (el resto se lee a medida que se resuelve)
+CACHES_ABIERTAS = {}        # Una conexión a cada cache por proceso
+
+
+def motor_simple(torres, estadisticas):
+    return hanoi_branch_and_bound(torres, estadisticas=estadisticas)
+
+
+def motor_patrones(torres, estadisticas):
+    return hanoi_branch_and_bound(torres, heuristica=BasePatrones(torres), estadisticas=estadisticas)
+
+
+def motor_capas(torres, estadisticas):
+    return hanoi_branch_and_bound(torres, capas=True, estadisticas=estadisticas)
+
+
+def motor_ida(torres, estadisticas):
+    return hanoi_ida_estrella(torres, heuristica=BasePatrones(torres), estadisticas=estadisticas)
+
+
+def motor_bidireccional(torres, estadisticas):
+    return hanoi_bidireccional(torres, estadisticas=estadisticas)
+
+
+def motor_directo(torres, estadisticas):
+    solucion = resolver(torres, motor=lambda t: motor_patrones(t, estadisticas))
+    return None if solucion is None else list(solucion)
+
+
+MOTORES = {
+    "simple": motor_simple,
+    "patrones": motor_patrones,
+    "capas": motor_capas,
+    "ida": motor_ida,
+    "bidireccional": motor_bidireccional,
+    "directo": motor_directo,
+}
+
+# Nombre de cada motor en la cache: los mismos que usan los puntos de entrada con cache=, así el lote y una
+# llamada directa comparten las soluciones ("directo" guarda también la solución directa, ver motor_directo)
+NOMBRES_CACHE = {
+    "simple": nombre_en_cache("simple", heuristica),
+    "patrones": nombre_en_cache("simple", BasePatrones),
+    "capas": nombre_en_cache("capas", heuristica),
+    "ida": nombre_en_cache("ida", BasePatrones),
+    "bidireccional": "bidireccional",
+    "directo": "directo",
+}
+
+
+def construir_torres(instancia):
+    """
+    Arma las torres de una instancia del archivo de entrada.
+    Args:
+        instancia (dict): Con "discos" (tamaños apilados en "Origen", de abajo hacia arriba) o "torres" (nombre de
+            torre -> tamaños de abajo hacia arriba), y opcionalmente "fragiles" (tamaño -> max_movimientos) y
+            "realizados" (tamaño -> movimientos ya hechos por ese disco frágil).
+    Returns:
+        dict: Torres con Disco y DiscoFragil.
+    Raises:
+        ValueError: Si los tamaños no son exactamente 1..n sin repetir, alguna torre no decrece de abajo hacia
+            arriba, o "fragiles"/"realizados" nombran un disco que no existe.
+    """
+    if "torres" in instancia:
+        pilas = {nombre: instancia["torres"].get(nombre, []) for nombre in TORRES}
+    else:
+        pilas = {"Origen": instancia["discos"], "Auxiliar": [], "Destino": []}
+    fragiles = {int(tamanio): maximo for tamanio, maximo in instancia.get("fragiles", {}).items()}
+    realizados = {int(tamanio): cantidad for tamanio, cantidad in instancia.get("realizados", {}).items()}
+
+    tamanios = sorted(tamanio for nombre in TORRES for tamanio in pilas[nombre])
+    if tamanios != list(range(1, len(tamanios) + 1)):
+        raise ValueError(f"Los tamaños de los discos deben ser 1..{len(tamanios)} sin repetir: {tamanios}")
+    for nombre in TORRES:
+        pila = pilas[nombre]
+        if any(abajo <= arriba for abajo, arriba in zip(pila, pila[1:])):
+            raise ValueError(f"La torre {nombre} no decrece de abajo hacia arriba: {pila}")
+    for campo, discos in (("fragiles", fragiles), ("realizados", realizados)):
+        desconocidos = sorted(set(discos) - set(tamanios))
+        if desconocidos:
+            raise ValueError(f"'{campo}' nombra discos que no existen: {desconocidos}")
+
+    torres = {}
+    for nombre in TORRES:
+        torres[nombre] = []
+        for tamanio in pilas[nombre]:
+            if tamanio in fragiles:
+                disco = DiscoFragil(tamanio, fragiles[tamanio])
+                disco.movimientos_realizados = realizados.get(tamanio, 0)
+            else:
+                disco = Disco(tamanio)
+            torres[nombre].append(disco)
+    return torres
+
+
+def abrir_cache(ruta):
+    if ruta not in CACHES_ABIERTAS:
+        CACHES_ABIERTAS[ruta] = CacheSoluciones(ruta)
+    return CACHES_ABIERTAS[ruta]
+
+
+def resolver_instancia(instancia, motor_por_defecto=MOTOR_POR_DEFECTO, con_movimientos=True, ruta_cache=None):
+    """
+    Resuelve una instancia y arma su línea de resultado. Los errores de la instancia se devuelven en el resultado
+    en lugar de cortar todo el lote. Si se da 'ruta_cache', primero se busca en esa cache_soluciones.CacheSoluciones.
+    Returns:
+        dict: "id", "motor", "largo" (None si no hay solución), "movimientos" (listas [origen, destino, tamaño]),
+              "estadisticas" (las del motor, por ejemplo 'nodos') y "segundos"; o "error" si la instancia no es válida.
+    """
+    nombre_motor = instancia.get("motor", motor_por_defecto)
+    resultado = {"id": instancia.get("id"), "motor": nombre_motor}
+    try:
+        motor = MOTORES[nombre_motor]
+        torres = construir_torres(instancia)
+        if ruta_cache is not None:
+            motor = con_cache(motor, NOMBRES_CACHE[nombre_motor], abrir_cache(ruta_cache))
+    except (KeyError, TypeError, ValueError) as error:
+        resultado["error"] = f"{type(error).__name__}: {error}"
+        return resultado
+
+    estadisticas = {}
+    inicio = time.perf_counter()
+    try:
+        solucion = motor(torres, estadisticas)
+    except Exception as error:     # un motor que falla en una instancia no corta el resto del lote
+        resultado["error"] = f"{type(error).__name__}: {error}"
+        return resultado
+    resultado["segundos"] = round(time.perf_counter() - inicio, 6)
+    resultado["largo"] = None if solucion is None else len(solucion)
+    if con_movimientos:
+        resultado["movimientos"] = None if solucion is None else [list(movimiento) for movimiento in solucion]
+    resultado["estadisticas"] = estadisticas
+    return resultado
+
+
+def leer_instancias(archivo):
+    """Genera las instancias de un archivo JSONL, salteando líneas vacías y comentarios (#)."""
+    for numero, linea in enumerate(archivo, 1):
+        linea = linea.strip()
+        if not linea or linea.startswith("#"):
+            continue
+        instancia = json.loads(linea)
+        instancia.setdefault("id", numero)
+        yield instancia
+
+
+def resolver_lote(instancias, procesos=1, motor_por_defecto=MOTOR_POR_DEFECTO, con_movimientos=True, ruta_cache=None):
+    """
+    Resuelve las instancias en orden y devuelve cada resultado apenas está listo.
+
+    Todo el lote corre en los mismos procesos, así que lo que queda cargado entre instancias (tablas de patrones
+    mapeadas, cotas de factibilidad memorizadas, la tabla de movimientos) se aprovecha en todas. Con varios
+    procesos se mandan como mucho TAREAS_POR_PROCESO instancias por proceso por adelantado, así que un archivo
+    enorme no se carga entero en memoria.
+    Args:
+        instancias (iterable): Diccionarios como los de leer_instancias.
+        procesos (int): 1 para resolver en este proceso; más para repartir entre varios.
+        ruta_cache (str): Archivo de cache_soluciones compartido por todos los procesos (por defecto, sin cache).
+    Yields:
+        dict: El resultado de resolver_instancia para cada instancia, en el orden de entrada.
+    """
+    if procesos <= 1:
+        for instancia in instancias:
+            yield resolver_instancia(instancia, motor_por_defecto, con_movimientos, ruta_cache)
+        return
+
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        pendientes = deque()
+        for instancia in instancias:
+            pendientes.append(ejecutor.submit(
+                resolver_instancia, instancia, motor_por_defecto, con_movimientos, ruta_cache
+            ))
+            if len(pendientes) >= procesos * TAREAS_POR_PROCESO:
+                yield pendientes.popleft().result()
+        while pendientes:
+            yield pendientes.popleft().result()
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Resuelve un lote de instancias de Hanoi con discos frágiles (JSONL).")
+    parser.add_argument("entrada", nargs="?", default="-", help="Archivo JSONL de instancias ('-' para stdin)")
+    parser.add_argument("-o", "--salida", default="-", help="Archivo JSONL de resultados ('-' para stdout)")
+    parser.add_argument("-p", "--procesos", type=int, default=1, help="Procesos (0 = uno por núcleo)")
+    parser.add_argument("-m", "--motor", default=MOTOR_POR_DEFECTO, choices=sorted(MOTORES),
+                        help="Motor para las instancias que no indican uno")
+    parser.add_argument("--sin-movimientos", action="store_true", help="No escribir la lista de movimientos")
+    parser.add_argument("--cache", nargs="?", const=RUTA_CACHE, default=None,
+                        help=f"Usar la cache de soluciones (por defecto en {RUTA_CACHE})")
+    opciones = parser.parse_args(argumentos)
+
+    procesos = opciones.procesos or os.cpu_count()
+    entrada = sys.stdin if opciones.entrada == "-" else open(opciones.entrada, encoding="utf-8")
+    salida = sys.stdout if opciones.salida == "-" else open(opciones.salida, "w", encoding="utf-8")
+    try:
+        resultados = resolver_lote(
+            leer_instancias(entrada), procesos, opciones.motor, not opciones.sin_movimientos, opciones.cache
+        )
+        for resultado in resultados:
+            salida.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+            salida.flush()
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+        if salida is not sys.stdout:
+            salida.close()
+
+
+# 🔽 Ejemplo de uso:
+#   python resolver_lote.py instancias_ejemplo.jsonl --procesos 4 --sin-movimientos
+
+if __name__ == "__main__":
+    main()
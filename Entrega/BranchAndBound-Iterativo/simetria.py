@@ -0,0 +1,49 @@
+# La meta es tener todos los discos en "Destino", así que la distancia a la meta (con o sin presupuestos) no cambia
+# si se intercambian los nombres de "Origen" y "Auxiliar". Acá se elige un representante para cada par de estados
+# espejados, para que las tablas y caches guarden uno solo, y se traducen los movimientos de un lado al otro.
+
+
+def espejar(clave, bajos):
+    """
+    Intercambia "Origen" (0) y "Auxiliar" (1) en la parte de posiciones de una clave; "Destino" (2) y el campo de
+    presupuestos no cambian. En cada par de bits se invierte el bit bajo solo si el alto es 0.
+    Args:
+        clave (int): Clave de ModeloTorres (o solo sus posiciones).
+        bajos (int): El bit bajo de cada disco encendido (mascara_posiciones // 3).
+    """
+    return clave ^ (bajos & ~(clave >> 1))
+
+
+def canonizador(modelo):
+    """
+    Returns:
+        callable: canonizar(clave), la menor entre la clave y su espejo. Dos estados espejados dan el mismo valor.
+    """
+    bajos = modelo.mascara_posiciones // 3
+
+    def canonizar(clave):
+        espejo = clave ^ (bajos & ~(clave >> 1))
+        return espejo if espejo < clave else clave
+    return canonizar
+
+
+def espejar_movimiento(movimiento):
+    """Lo mismo que espejar para un movimiento empaquetado con empaquetar_movimiento."""
+    return movimiento ^ (0b0101 & ~(movimiento >> 1))
+
+
+def espejar_movimientos(movimientos):
+    """Movimientos (origen, destino, tamanio) con nombres, con "Origen" y "Auxiliar" intercambiados."""
+    nombres = {"Origen": "Auxiliar", "Auxiliar": "Origen", "Destino": "Destino"}
+    return [(nombres[origen], nombres[destino], tamanio) for origen, destino, tamanio in movimientos]
+
+
+def espejar_torres(torres):
+    """Las mismas pilas con "Origen" y "Auxiliar" intercambiadas (los discos no se copian)."""
+    return {"Origen": torres["Auxiliar"], "Auxiliar": torres["Origen"], "Destino": torres["Destino"]}
+
+
+def espejar_posiciones(posiciones):
+    """Lo mismo que espejar para una tupla con el índice de la torre de cada disco."""
+    return tuple(1 - torre if torre < 2 else torre for torre in posiciones)
+
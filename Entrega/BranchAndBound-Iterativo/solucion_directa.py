@@ -0,0 +1,143 @@
+from cache_soluciones import nombre_en_cache, resolver_con_cache
+from e1_byb_heuristica_simple import hanoi_branch_and_bound
+from estado_compacto import TORRES
+from factibilidad import es_factible
+
+
+def torre_completa(cantidad, origen, destino):
+    """
+    Movimientos de la solución clásica (2^cantidad - 1) para pasar los discos 1..cantidad de 'origen' a 'destino',
+    calculados de a uno con la fórmula binaria, sin recursión y sin guardarlos: O(1) por movimiento.
+
+    En el movimiento i se mueve el disco (cantidad de ceros finales de i) + 1, de la torre (i & (i-1)) % 3 a la
+    ((i | (i-1)) + 1) % 3. Esa numeración lleva la torre de 0 a 2 si la cantidad es impar y de 0 a 1 si es par, así
+    que se traduce a las torres pedidas.
+    Args:
+        cantidad (int): Cantidad de discos (los más chicos).
+        origen (int): Índice de la torre donde están, en el orden de TORRES.
+        destino (int): Índice de la torre a donde van.
+    Yields:
+        tuple: (origen, destino, tamanio) con los índices de las torres.
+    """
+    auxiliar = 3 - origen - destino
+    traduccion = (origen, auxiliar, destino) if cantidad % 2 else (origen, destino, auxiliar)
+    for i in range(1, 1 << cantidad):
+        yield (traduccion[(i & (i - 1)) % 3], traduccion[((i | (i - 1)) + 1) % 3], (i & -i).bit_length())
+
+
+def plan_directo(torres, destino=2):
+    """
+    Solución óptima sin presupuestos desde cualquier configuración: se busca el disco más grande que no está en
+    'destino', se juntan los más chicos en la torre libre (el mismo problema, un disco menos), se mueve ese disco y
+    se pasa encima la torre de los más chicos. El disco más grande que está fuera de lugar se mueve una sola vez.
+    Args:
+        torres (dict): Diccionario con las torres iniciales.
+        destino (int): Índice de la torre final.
+    Returns:
+        tuple: (pasos, movimientos_por_disco). 'pasos' es la lista de (tamanio, origen, destino, auxiliar) en el
+               orden en que se ejecutan; movimientos_por_disco[t] es cuántas veces se mueve el disco t.
+    """
+    total_discos = sum(len(pila) for pila in torres.values())
+    posicion = [None] * (total_discos + 1)
+    for indice, nombre in enumerate(TORRES):
+        for disco in torres[nombre]:
+            posicion[disco.tamanio] = indice
+
+    pasos = []
+    tamanio = total_discos
+    objetivo = destino
+    while True:
+        while tamanio >= 1 and posicion[tamanio] == objetivo:
+            tamanio -= 1
+        if tamanio == 0:
+            break
+        auxiliar = 3 - posicion[tamanio] - objetivo
+        pasos.append((tamanio, posicion[tamanio], objetivo, auxiliar))
+        # Los discos más chicos tienen que terminar en la torre libre antes de mover este
+        objetivo = auxiliar
+        tamanio -= 1
+    pasos.reverse()
+
+    movimientos_por_disco = [0] * (total_discos + 1)
+    for tamanio, _, _, _ in pasos:
+        movimientos_por_disco[tamanio] += 1
+        # Después cada disco más chico t se mueve 2^(tamanio - 1 - t) veces con la torre
+        for t in range(1, tamanio):
+            movimientos_por_disco[t] += 1 << (tamanio - 1 - t)
+    return pasos, movimientos_por_disco
+
+
+def es_resoluble_directo(torres):
+    """
+    True si ningún presupuesto molesta: todos los discos son comunes o cada DiscoFragil tiene al menos los
+    movimientos que le pide plan_directo (desde todos en "Origen", 2^(n - tamanio)). En ese caso la solución
+    directa es óptima, porque es la más corta incluso sin límites.
+    """
+    _, movimientos_por_disco = plan_directo(torres)
+    for pila in torres.values():
+        for disco in pila:
+            if hasattr(disco, "max_movimientos"):
+                if disco.max_movimientos - disco.movimientos_realizados < movimientos_por_disco[disco.tamanio]:
+                    return False
+    return True
+
+
+def movimientos_directos(torres):
+    """
+    Genera la solución de plan_directo de a un movimiento, sin armar la lista de 2^n - 1 movimientos.
+    Yields:
+        tuple: (origen, destino, tamanio_disco) con los nombres de las torres, como hanoi_branch_and_bound.
+    """
+    pasos, _ = plan_directo(torres)
+    for tamanio, origen, destino, auxiliar in pasos:
+        yield (TORRES[origen], TORRES[destino], tamanio)
+        for origen_chico, destino_chico, tamanio_chico in torre_completa(tamanio - 1, auxiliar, destino):
+            yield (TORRES[origen_chico], TORRES[destino_chico], tamanio_chico)
+
+
+def resolver(torres_iniciales, motor=hanoi_branch_and_bound, cache=None):
+    """
+    Punto de entrada único: si los presupuestos no molestan responde con la solución directa; si factibilidad
+    demuestra que no alcanzan, responde None sin buscar; si no, usa el motor de búsqueda.
+    Args:
+        torres_iniciales (dict): Diccionario con las torres iniciales
+        motor (callable): Motor a usar cuando los presupuestos sí importan (por defecto hanoi_branch_and_bound).
+        cache (CacheSoluciones): Si se pasa, la búsqueda del motor pasa por esa cache_soluciones.CacheSoluciones. La
+            solución directa y la respuesta de factibilidad no se guardan: calcularlas es más barato que buscarlas.
+    Returns:
+        Un iterable con la secuencia óptima de movimientos (origen, destino, tamanio_disco): un generador en el caso
+        directo o la lista del motor. None si no hay solución.
+    """
+    if es_resoluble_directo(torres_iniciales):
+        return movimientos_directos(torres_iniciales)
+    if not es_factible(torres_iniciales):
+        return None
+    if cache is not None:
+        return resolver_con_cache(
+            cache, nombre_en_cache("directo", motor), torres_iniciales, None, lambda torres, _: motor(torres)
+        )
+    return motor(torres_iniciales)
+
+
+# 🔽 Ejemplo de uso:
+
+if __name__ == "__main__":
+
+    import time
+    from e1_byb_heuristica_simple import Disco, DiscoFragil
+
+    torres = {
+        "Origen": [Disco(s) for s in range(20, 2, -1)] + [DiscoFragil(2, 1 << 18), DiscoFragil(1, 1 << 19)],
+        "Auxiliar": [],
+        "Destino": [],
+    }
+
+    inicio = time.time()
+    solucion = resolver(torres)
+    primero = next(solucion)
+    fin = time.time()
+    print(f"✅ Primer movimiento: {primero} en {(fin - inicio) * 1e6:.1f} microsegundos")
+
+    cantidad = 1 + sum(1 for _ in solucion)
+    fin = time.time()
+    print(f"✅ Solución completa: {cantidad} movimientos en {fin - inicio:.4f} segundos")
@@ -0,0 +1,121 @@
+from simetria import canonizador
+
+
+class TablaEstados:
+    """
+    Tabla de estados abiertos/cerrados compartida por toda la búsqueda (en lugar de un conjunto de visitados por nodo).
+
+    Guarda, para cada clave de estado (ver CodificadorEstado), la menor cantidad de movimientos (g) con la que se
+    llegó. Un estado se vuelve a abrir solo si aparece un camino más corto, así que cada estado se expande como
+    mucho una vez por cada valor distinto de g.
+
+    Si se pasa 'canonizar' (ver simetria.canonizador), un estado y su espejo con "Origen" y "Auxiliar"
+    intercambiados comparten la entrada: están a la misma distancia de la meta, así que llegar al espejo con un g
+    igual o mayor tampoco sirve.
+    """
+
+    __slots__ = ("mejor_g", "cerrados", "reaperturas", "canonizar")
+
+    def __init__(self, canonizar=None):
+        self.mejor_g = {}
+        self.cerrados = set()
+        self.reaperturas = 0
+        self.canonizar = canonizar
+
+    def __len__(self):
+        return len(self.mejor_g)
+
+    def registrar(self, clave, g):
+        """
+        Se llama al generar un nodo.
+        Args:
+            clave (int): Estado generado.
+            g (int): Movimientos realizados para llegar a él.
+        Returns:
+            bool: True si es el mejor camino conocido hasta el estado y hay que agregarlo a los nodos vivos.
+        """
+        if self.canonizar is not None:
+            clave = self.canonizar(clave)
+        anterior = self.mejor_g.get(clave)
+        if anterior is not None and anterior <= g:
+            return False
+        self.mejor_g[clave] = g
+        if clave in self.cerrados:
+            # Ya se había expandido con un g mayor: se reabre
+            self.cerrados.discard(clave)
+            self.reaperturas += 1
+        return True
+
+    def expandir(self, clave, g):
+        """
+        Se llama al sacar un nodo de la cola.
+        Returns:
+            bool: False si el nodo quedó viejo porque después se registró un camino más corto al mismo estado.
+        """
+        if self.canonizar is not None:
+            clave = self.canonizar(clave)
+        if self.mejor_g[clave] != g or clave in self.cerrados:
+            return False
+        self.cerrados.add(clave)
+        return True
+
+
+class TablaDominancia:
+    """
+    Variante de TablaEstados para instancias con discos frágiles, con la misma interfaz.
+
+    Agrupa los estados por posición de los discos y guarda para cada una un frente de Pareto de pares
+    (g, movimientos restantes de cada disco frágil). Una llegada con restantes componente a componente <= a los de
+    un par ya guardado, y con g igual o mayor, no puede llegar más lejos que ese par y se poda. Si no está dominada
+    se agrega al frente y se sacan los pares que ella domina. Con 'canonizar' los frentes se agrupan por la
+    posición canónica (el espejo no cambia los movimientos restantes).
+    """
+
+    __slots__ = ("modelo", "frentes", "podados", "canonizar")
+
+    def __init__(self, modelo, canonizar=None):
+        self.modelo = modelo
+        self.frentes = {}
+        self.podados = 0
+        self.canonizar = canonizar
+
+    def posiciones(self, clave):
+        posiciones = self.modelo.posiciones(clave)
+        return posiciones if self.canonizar is None else self.canonizar(posiciones)
+
+    def __len__(self):
+        return sum(len(frente) for frente in self.frentes.values())
+
+    def registrar(self, clave, g):
+        posiciones = self.posiciones(clave)
+        restantes = self.modelo.restantes(clave)
+        frente = self.frentes.get(posiciones)
+        if frente is None:
+            self.frentes[posiciones] = [(g, restantes)]
+            return True
+        for g_previo, restantes_previos in frente:
+            if g_previo <= g and all(a >= b for a, b in zip(restantes_previos, restantes)):
+                self.podados += 1
+                return False
+        frente[:] = [
+            (g_previo, restantes_previos) for g_previo, restantes_previos in frente
+            if not (g <= g_previo and all(a >= b for a, b in zip(restantes, restantes_previos)))
+        ]
+        frente.append((g, restantes))
+        return True
+
+    def expandir(self, clave, g):
+        """False si el nodo fue dominado por una llegada posterior al mismo estado."""
+        return (g, self.modelo.restantes(clave)) in self.frentes[self.posiciones(clave)]
+
+
+def nueva_tabla(modelo):
+    """
+    Args:
+        modelo (ModeloTorres): Modelo de la instancia.
+    Returns:
+        TablaDominancia si hay discos frágiles, si no TablaEstados (sin presupuestos no hay nada que dominar). Las
+        dos identifican cada estado con su espejo.
+    """
+    canonizar = canonizador(modelo)
+    return TablaDominancia(modelo, canonizar) if modelo.fragiles else TablaEstados(canonizar)
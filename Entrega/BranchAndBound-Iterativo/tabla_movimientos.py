@@ -0,0 +1,30 @@
+def pares_legales(firma, bloqueadas, torres=3):
+    """
+    Pares (origen, destino) legales para una firma, en el orden de los dos for anidados de
+    generar_movimientos_posibles (origen y después destino, en el orden de TORRES).
+    Args:
+        firma (int): 2 bits por torre (en la posición 2 * índice) con el rango de su disco superior: 1 para la cima
+            más chica, 2 para la siguiente, 3 para la más grande y 0 si la torre está vacía.
+        bloqueadas (int): Un bit por torre cuyo disco superior no se puede mover (por ejemplo, un frágil sin
+            movimientos restantes).
+    Returns:
+        tuple: Los pares (origen, destino) con los índices de las torres.
+    """
+    rangos = [(firma >> (2 * torre)) & 3 for torre in range(torres)]
+    pares = []
+    for origen in range(torres):
+        if not rangos[origen] or bloqueadas >> origen & 1:
+            continue
+        for destino in range(torres):
+            if origen == destino:
+                continue
+            # Un disco solo puede ir a una torre vacía o sobre uno más grande
+            if rangos[destino] and rangos[destino] < rangos[origen]:
+                continue
+            pares.append((origen, destino))
+    return tuple(pares)
+
+
+# TABLA[firma << 3 | bloqueadas]: los pares legales ya resueltos, así que generar los movimientos de un estado es
+# calcular la firma y hacer una sola consulta. 64 firmas (13 posibles) por 8 máscaras.
+TABLA = [pares_legales(indice >> 3, indice & 7) for indice in range(64 * 8)]
@@ -33,13 +33,12 @@ class DiscoFragil(Disco):
 
 
 def estado_serializado(torres):
-    estado = []
-    for nombre in ["Origen", "Auxiliar", "Destino"]:
-        if nombre != "Origen":
-            estado.append(0)  # Separador al principio de cada torre
+    # 2 bits por disco con el índice de su torre ("Origen" = 0 no aporta bits)
+    estado = 0
+    for indice, nombre in ((1, "Auxiliar"), (2, "Destino")):
         for d in torres[nombre]:
-            estado.append(d.tamanio)
-    return tuple(estado)
+            estado |= indice << (2 * (d.tamanio - 1))
+    return estado
 
 
 def copiar_torres(torres):
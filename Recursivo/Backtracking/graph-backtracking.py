@@ -1,3 +1,11 @@
+import os
+import sys
+from collections import deque
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from escritor_grafo import abrir_escritor
+
+
 class Disco:
     def __init__(self, tamanio):
         self.tamanio = tamanio
@@ -29,13 +37,47 @@ class DiscoFragil(Disco):
 
 
 def estado_serializado(torres):
-    estado = []
-    for nombre in ["Origen", "Auxiliar", "Destino"]:
-        if nombre != "Origen":
-            estado.append(0)  # Separador al principio de cada torre
+    # 2 bits por disco con el índice de su torre ("Origen" = 0 no aporta bits)
+    estado = 0
+    for indice, nombre in ((1, "Auxiliar"), (2, "Destino")):
         for d in torres[nombre]:
-            estado.append(d.tamanio)
-    return tuple(estado)
+            estado |= indice << (2 * (d.tamanio - 1))
+    return estado
+
+
+def decodificar_estado(estado):
+    # Vuelve al formato de tupla (discos de cada torre separados por 0) para mostrarlo en el label
+    etiqueta = []
+    for indice in range(3):
+        if indice != 0:
+            etiqueta.append(0)
+        for tamanio in range(total_discos, 0, -1):
+            if (estado >> (2 * (tamanio - 1))) & 3 == indice:
+                etiqueta.append(tamanio)
+    return tuple(etiqueta)
+
+
+def estado_con_presupuestos(torres):
+    # estado_serializado y, por encima, los movimientos hechos por cada disco frágil (en base max_movimientos + 1,
+    # de menor a mayor tamaño): dos nodos con la misma clave son el mismo estado del problema
+    estado = estado_serializado(torres)
+    peso = 1 << (2 * total_discos)
+    for disco in sorted((d for pila in torres.values() for d in pila), key=lambda d: d.tamanio):
+        if isinstance(disco, DiscoFragil):
+            estado += disco.movimientos_realizados * peso
+            peso *= disco.max_movimientos + 1
+    return estado
+
+
+def etiqueta_con_presupuestos(estado):
+    # La tupla de decodificar_estado y los movimientos que le quedan a cada disco frágil, de menor a mayor
+    restantes = []
+    resto = estado >> (2 * total_discos)
+    for disco in sorted((d for pila in torres_iniciales.values() for d in pila), key=lambda d: d.tamanio):
+        if isinstance(disco, DiscoFragil):
+            restantes.append(disco.max_movimientos - resto % (disco.max_movimientos + 1))
+            resto //= disco.max_movimientos + 1
+    return f"{decodificar_estado(estado)} {restantes}"
 
 
 def copiar_torres(torres):
@@ -53,16 +95,12 @@ def copiar_torres(torres):
     return nuevas_torres
 
 
-def hanoi_arbol_coloreado(torres, graph_file, nivel=0, nodo_id=[0], padre_id=None, visitados_local=None):
+def hanoi_arbol_coloreado(torres, escritor, nivel=0, padre_id=None, visitados_local=None):
     if visitados_local is None:
         visitados_local = set()
 
     estado_actual = estado_serializado(torres)
-    nodo_actual_id = nodo_id[0]
-    nodo_id[0] += 1
-
-    nombre_nodo = f"n{nodo_actual_id}"
-    label = str(estado_actual)
+    nodo_actual_id = escritor.nuevo_nodo(padre_id)
     color = "black"
 
     if len(torres["Destino"]) == total_discos:
@@ -72,11 +110,8 @@ def hanoi_arbol_coloreado(torres, graph_file, nivel=0, nodo_id=[0], padre_id=Non
     else:
         visitados_local.add(estado_actual)
 
-    graph_file.write(f'    "{nombre_nodo}" [label="{label}", color={color}];\n')
-    if padre_id is not None:
-        graph_file.write(f'    "{padre_id}" -> "{nombre_nodo}";\n')
-
     if color == "red" or len(torres["Destino"]) == total_discos:
+        escritor.terminar_nodo(nodo_actual_id, estado_actual, color)
         return
 
     puedo_avanzar = False # Solo se usa para graficar las interrupciones con dicos fragiles
@@ -101,8 +136,8 @@ def hanoi_arbol_coloreado(torres, graph_file, nivel=0, nodo_id=[0], padre_id=Non
             torres[destino].append(disco)
             disco.mover()
             hanoi_arbol_coloreado(
-                torres, graph_file, nivel + 1, nodo_id,
-                nombre_nodo, visitados_local.copy()
+                torres, escritor, nivel + 1,
+                nodo_actual_id, visitados_local.copy()
             )
             # Deshacer
             torres[destino].pop()
@@ -112,8 +147,53 @@ def hanoi_arbol_coloreado(torres, graph_file, nivel=0, nodo_id=[0], padre_id=Non
     # Si no se pudo avanzar y no fue por visitado o solución, es por disco frágil bloqueado
     if not puedo_avanzar and color == "black":
         color = "yellow"
-        # Reescribimos el nodo con nuevo color
-        graph_file.write(f'    "{nombre_nodo}" [label="{label}", color={color}];\n')
+    # El nodo se escribe recién ahora, una sola vez y con su color final
+    escritor.terminar_nodo(nodo_actual_id, estado_actual, color)
+
+def grafo_de_estados(torres, escritor):
+    """
+    Recorre por anchura el espacio de estados (posición y movimientos restantes de los frágiles) en lugar del árbol
+    de búsqueda: cada estado se expande una sola vez, con todos sus movimientos legales como aristas y sin las podas
+    por camino de la búsqueda. El escritor tiene que ser un GrafoEstados.
+    """
+    pendientes = deque()
+    vistos = set()
+
+    def visitar(torres, padre_id, nivel):
+        # Arista desde el padre; las torres se copian solo la primera vez que aparece el estado
+        clave = estado_con_presupuestos(torres)
+        nodo_id = escritor.nuevo_nodo(padre_id, clave, nivel)
+        if clave not in vistos:
+            vistos.add(clave)
+            pendientes.append((copiar_torres(torres), clave, nodo_id, nivel))
+
+    visitar(torres, None, 0)
+    while pendientes:
+        torres, clave, nodo_id, nivel = pendientes.popleft()
+        if len(torres["Destino"]) == total_discos:
+            escritor.terminar_nodo(nodo_id, clave, "blue")
+            continue
+
+        color = "yellow"    # Sin movimientos legales: lo bloquean los discos frágiles
+        for origen in torres:
+            if not torres[origen] or not torres[origen][-1].puede_moverse():
+                continue
+            disco = torres[origen][-1]
+            for destino in torres:
+                if origen == destino:
+                    continue
+                if torres[destino] and torres[destino][-1].tamanio < disco.tamanio:
+                    continue
+                color = "black"
+                torres[origen].pop()
+                torres[destino].append(disco)
+                disco.mover()
+                visitar(torres, nodo_id, nivel + 1)
+                torres[destino].pop()
+                torres[origen].append(disco)
+                disco.deshacer_movimiento()
+        escritor.terminar_nodo(nodo_id, clave, color)
+
 # -------------------- EJECUCIÓN ------------------------
 
 total_discos = 3
@@ -123,11 +203,17 @@ torres_iniciales = {
     "Destino": []
 }
 
-with open("hanoi_arbol_colores.dot", "w", encoding="utf-8") as f:
-    f.write("digraph Hanoi {\n")
-    f.write("    rankdir=TB;\n")
-    f.write("    node [shape=box, fontname=\"Arial\"];\n")
-    hanoi_arbol_coloreado(copiar_torres(torres_iniciales), f, 0, [0], None, set())
-    f.write("}\n")
-
-print("✅ Archivo 'hanoi_arbol_colores.dot' generado con nodos terminales en rojo.")
\ No newline at end of file
+# Con un argumento se elige el archivo de salida (".dot.gz" para comprimirlo, ".csr" para el formato binario).
+# Con --estados se escribe el grafo de estados (un nodo por posición y presupuestos, con todos sus movimientos) en
+# lugar del árbol: muestra el espacio de estados, no el árbol de búsqueda colapsado por estado.
+con_estados = "--estados" in sys.argv
+argumentos = [argumento for argumento in sys.argv[1:] if argumento != "--estados"]
+ruta_salida = argumentos[0] if argumentos else "hanoi_arbol_colores.dot"
+if con_estados:
+    with abrir_escritor(ruta_salida, etiqueta_con_presupuestos, estados=True) as escritor:
+        grafo_de_estados(copiar_torres(torres_iniciales), escritor)
+else:
+    with abrir_escritor(ruta_salida, etiquetar=lambda estado: str(decodificar_estado(estado))) as escritor:
+        hanoi_arbol_coloreado(copiar_torres(torres_iniciales), escritor, 0, None, set())
+
+print(f"✅ Archivo '{ruta_salida}' generado con nodos terminales en rojo.")
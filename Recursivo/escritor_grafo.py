@@ -0,0 +1,329 @@
+import gzip
+import io
+import json
+import mmap
+import sys
+from array import array
+
+try:
+    import numpy as np
+except ImportError:     # Sin NumPy las aristas se ordenan con un conteo en Python (mismo archivo, más lento)
+    np = None
+
+TAMANIO_BUFFER = 1 << 20    # Caracteres que se juntan en memoria antes de cada escritura al archivo
+NIVEL_GZIP = 1              # El árbol es muy repetitivo: el nivel más rápido ya comprime casi igual que el máximo
+COLORES = ["black", "blue", "red", "yellow"]    # Código de cada color en el archivo de nodos del formato CSR
+
+
+class EscritorDot:
+    """
+    Escribe el árbol de búsqueda en formato DOT para los scripts graph-*.
+
+    - Los nodos se identifican con enteros cortos (0, 1, 2, ...) en lugar de nombres armados con el estado.
+    - La etiqueta de cada estado se arma una sola vez y se guarda en una tabla (muchos nodos repiten el estado).
+    - Cada nodo se escribe una sola vez, con su color final; el color por defecto (negro) no se escribe.
+    - Las líneas se juntan en un buffer y se escriben de a bloques grandes; si la ruta termina en ".gz" el archivo
+      se comprime con gzip.
+    """
+
+    def __init__(self, ruta, etiquetar=str, tamanio_buffer=TAMANIO_BUFFER):
+        """
+        Args:
+            ruta (str): Archivo de salida (".dot" o ".dot.gz").
+            etiquetar (callable): etiquetar(estado) -> texto de la etiqueta del nodo.
+            tamanio_buffer (int): Caracteres acumulados antes de escribir.
+        """
+        if ruta.endswith(".gz"):
+            self.archivo = io.TextIOWrapper(gzip.open(ruta, "wb", compresslevel=NIVEL_GZIP), encoding="utf-8")
+        else:
+            self.archivo = open(ruta, "w", encoding="utf-8")
+        self.etiquetar = etiquetar
+        self.etiquetas = {}
+        self.tamanio_buffer = tamanio_buffer
+        self.pendientes = []
+        self.acumulado = 0
+        self.cantidad_nodos = 0
+        self.escribir('digraph Hanoi {\nrankdir=TB;\nnode [shape=box, fontname="Arial", color=black];\n')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    def escribir(self, texto):
+        self.pendientes.append(texto)
+        self.acumulado += len(texto)
+        if self.acumulado >= self.tamanio_buffer:
+            self.vaciar()
+
+    def vaciar(self):
+        self.archivo.write("".join(self.pendientes))
+        self.pendientes.clear()
+        self.acumulado = 0
+
+    def nuevo_nodo(self, padre=None, estado=None, nivel=None):
+        """
+        Reserva el número del próximo nodo y escribe la arista desde su padre. El nodo en sí se escribe después con
+        terminar_nodo, cuando ya se conoce su color ('estado' y 'nivel' solo los usa GrafoEstados).
+        Returns:
+            int: Identificador del nodo.
+        """
+        nodo = self.cantidad_nodos
+        self.cantidad_nodos += 1
+        if padre is not None:
+            self.agregar_arista(padre, nodo)
+        return nodo
+
+    def agregar_arista(self, origen, destino):
+        self.escribir(f"{origen}->{destino};\n")
+
+    def terminar_nodo(self, nodo, estado, color="black"):
+        etiqueta = self.etiquetas.get(estado)
+        if etiqueta is None:
+            etiqueta = self.etiquetas[estado] = self.etiquetar(estado).replace('"', '\\"')
+        if color == "black":
+            self.escribir(f'{nodo}[label="{etiqueta}"];\n')
+        else:
+            self.escribir(f'{nodo}[label="{etiqueta}",color={color}];\n')
+
+    def nodo(self, estado, color="black", padre=None, nivel=None):
+        """nuevo_nodo y terminar_nodo juntos, para los nodos cuyo color ya se sabe al crearlos."""
+        nodo = self.nuevo_nodo(padre, estado, nivel)
+        self.terminar_nodo(nodo, estado, color)
+        return nodo
+
+    def cerrar(self):
+        if self.archivo.closed:
+            return
+        self.escribir("}\n")
+        self.vaciar()
+        self.archivo.close()
+
+
+class EscritorCSR:
+    """
+    Misma interfaz que EscritorDot, pero guarda el grafo en binario (compressed sparse row) para analizarlo aparte
+    cuando es demasiado grande para Graphviz. Con la ruta "arbol.csr" se escriben:
+
+    - arbol.csr.json: cantidad de nodos y aristas, tipo y orden de bytes de cada arreglo y los códigos de COLORES.
+    - arbol.csr.aristas: 'offsets' (int64, nodos + 1) seguido de 'destinos' (uint32, aristas). Los hijos del nodo
+      i son destinos[offsets[i]:offsets[i + 1]], en el orden en que se generaron.
+    - arbol.csr.nodos: tres columnas seguidas, 'estados' (uint64, la clave que pasó el script), 'niveles'
+      (uint32, profundidad) y 'colores' (uint8, índice en COLORES).
+
+    Cada columna empieza en un múltiplo de su tamaño, así que cargar_csr las devuelve como vistas sobre el archivo
+    mapeado en memoria, sin copiarlas. Mientras se explora solo se guardan arreglos compactos (unos 8 bytes por
+    arista y 13 por nodo); el orden por origen se arma al cerrar.
+    """
+
+    def __init__(self, ruta, etiquetar=None):
+        """
+        Args:
+            ruta (str): Prefijo de los tres archivos.
+            etiquetar: Se ignora (está por compatibilidad con EscritorDot: el estado se guarda como número).
+        """
+        self.ruta = ruta
+        self.origenes = array("I")
+        self.destinos = array("I")
+        self.estados = array("Q")
+        self.niveles = array("I")
+        self.colores = bytearray()
+        self.cerrado = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    @property
+    def cantidad_nodos(self):
+        return len(self.niveles)
+
+    def nuevo_nodo(self, padre=None, estado=None, nivel=None):
+        nodo = len(self.niveles)
+        self.estados.append(estado or 0)
+        self.colores.append(0)
+        if nivel is None:
+            nivel = 0 if padre is None else self.niveles[padre] + 1
+        self.niveles.append(nivel)
+        if padre is not None:
+            self.agregar_arista(padre, nodo)
+        return nodo
+
+    def agregar_arista(self, origen, destino):
+        self.origenes.append(origen)
+        self.destinos.append(destino)
+
+    def terminar_nodo(self, nodo, estado, color="black"):
+        self.estados[nodo] = estado
+        self.colores[nodo] = COLORES.index(color)
+
+    def nodo(self, estado, color="black", padre=None, nivel=None):
+        nodo = self.nuevo_nodo(padre, estado, nivel)
+        self.terminar_nodo(nodo, estado, color)
+        return nodo
+
+    def ordenar_aristas(self):
+        """
+        Returns:
+            tuple: (offsets, destinos) con las aristas agrupadas por origen (orden estable).
+        """
+        cantidad = self.cantidad_nodos
+        if np is not None:
+            origenes = np.frombuffer(self.origenes, dtype=np.uint32)
+            orden = np.argsort(origenes, kind="stable")
+            offsets = np.zeros(cantidad + 1, dtype=np.int64)
+            np.cumsum(np.bincount(origenes, minlength=cantidad), out=offsets[1:])
+            return offsets, np.frombuffer(self.destinos, dtype=np.uint32)[orden]
+
+        # Conteo por origen, sumas acumuladas y cada arista a la siguiente posición libre de su origen
+        offsets = array("q", bytes(8 * (cantidad + 1)))
+        for origen in self.origenes:
+            offsets[origen + 1] += 1
+        for i in range(cantidad):
+            offsets[i + 1] += offsets[i]
+        libres = offsets[:-1]
+        destinos = array("I", bytes(4 * len(self.destinos)))
+        for origen, destino in zip(self.origenes, self.destinos):
+            destinos[libres[origen]] = destino
+            libres[origen] += 1
+        return offsets, destinos
+
+    def cerrar(self):
+        if self.cerrado:
+            return
+        self.cerrado = True
+        offsets, destinos = self.ordenar_aristas()
+        with open(self.ruta + ".aristas", "wb") as archivo:
+            offsets.tofile(archivo)
+            destinos.tofile(archivo)
+        with open(self.ruta + ".nodos", "wb") as archivo:
+            self.estados.tofile(archivo)
+            self.niveles.tofile(archivo)
+            archivo.write(self.colores)
+        with open(self.ruta + ".json", "w", encoding="utf-8") as archivo:
+            json.dump({
+                "nodos": self.cantidad_nodos,
+                "aristas": len(self.destinos),
+                "orden_bytes": sys.byteorder,
+                "aristas_archivo": {"offsets": "int64", "destinos": "uint32"},
+                "nodos_archivo": {"estados": "uint64", "niveles": "uint32", "colores": "uint8"},
+                "colores": COLORES,
+            }, archivo, indent=2)
+
+
+class GrafoEstados:
+    """
+    Junta un recorrido del espacio de estados (no el árbol de búsqueda): un nodo por estado distinto (la clave que
+    se pasa a nuevo_nodo, que debe incluir los movimientos de los discos frágiles) y una arista por movimiento, sin
+    repetir. Tiene la misma interfaz que los escritores y al cerrar escribe el grafo con 'salida' (EscritorDot o
+    EscritorCSR).
+
+    Lo usan los recorridos por anchura de los scripts graph-* con --estados, que expanden cada estado una sola vez
+    con todos sus movimientos legales, sin las podas por camino de la búsqueda. El color es azul si es solución,
+    amarillo si los discos frágiles no dejan mover nada y negro si no; el nivel es la menor profundidad con la que
+    se llegó.
+    """
+
+    PRIORIDAD = {"red": 0, "black": 1, "yellow": 2, "blue": 3}
+
+    def __init__(self, salida):
+        self.salida = salida
+        self.indices = {}
+        self.estados = []
+        self.niveles = []
+        self.colores = []
+        self.aristas = {}       # (origen, destino) -> None: un conjunto que recuerda el orden de llegada
+        self.cerrado = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    @property
+    def cantidad_nodos(self):
+        return len(self.estados)
+
+    def nuevo_nodo(self, padre=None, estado=None, nivel=0):
+        nodo = self.indices.get(estado)
+        if nodo is None:
+            nodo = self.indices[estado] = len(self.estados)
+            self.estados.append(estado)
+            self.niveles.append(nivel)
+            self.colores.append("red")
+        elif nivel < self.niveles[nodo]:
+            self.niveles[nodo] = nivel
+        if padre is not None:
+            self.aristas[padre, nodo] = None
+        return nodo
+
+    def agregar_arista(self, origen, destino):
+        self.aristas[origen, destino] = None
+
+    def terminar_nodo(self, nodo, estado=None, color="black"):
+        if self.PRIORIDAD[color] > self.PRIORIDAD[self.colores[nodo]]:
+            self.colores[nodo] = color
+
+    def nodo(self, estado, color="black", padre=None, nivel=0):
+        nodo = self.nuevo_nodo(padre, estado, nivel)
+        self.terminar_nodo(nodo, estado, color)
+        return nodo
+
+    def cerrar(self):
+        if self.cerrado:
+            return
+        self.cerrado = True
+        for estado, nivel, color in zip(self.estados, self.niveles, self.colores):
+            self.salida.nodo(estado, color, nivel=nivel)
+        for origen, destino in self.aristas:
+            self.salida.agregar_arista(origen, destino)
+        self.salida.cerrar()
+
+
+def abrir_escritor(ruta, etiquetar=str, estados=False):
+    """
+    EscritorCSR si la ruta termina en ".csr", si no EscritorDot (".dot" o ".dot.gz"). Con 'estados' se envuelve
+    en un GrafoEstados, para escribir el grafo de estados en lugar del árbol.
+    """
+    if ruta.endswith(".csr"):
+        escritor = EscritorCSR(ruta)
+    else:
+        escritor = EscritorDot(ruta, etiquetar)
+    return GrafoEstados(escritor) if estados else escritor
+
+
+def cargar_csr(ruta):
+    """
+    Abre un grafo escrito por EscritorCSR sin copiarlo: cada arreglo es un memoryview sobre el archivo mapeado
+    (np.frombuffer los convierte en arreglos de NumPy, también sin copiar).
+    Args:
+        ruta (str): El mismo prefijo que se le pasó a EscritorCSR.
+    Returns:
+        dict: Lo del archivo .json más 'offsets', 'destinos', 'estados', 'niveles' y 'colores'.
+    """
+    with open(ruta + ".json", encoding="utf-8") as archivo:
+        grafo = json.load(archivo)
+    if grafo["orden_bytes"] != sys.byteorder:
+        raise ValueError(f"El grafo se escribió con orden de bytes {grafo['orden_bytes']}")
+    nodos, aristas = grafo["nodos"], grafo["aristas"]
+
+    def mapear(sufijo):
+        with open(ruta + sufijo, "rb") as archivo:
+            if archivo.seek(0, 2) == 0:
+                return memoryview(b"")
+            return memoryview(mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ))
+
+    datos = mapear(".aristas")
+    grafo["offsets"] = datos[:8 * (nodos + 1)].cast("q")
+    grafo["destinos"] = datos[8 * (nodos + 1):].cast("I")
+    datos = mapear(".nodos")
+    grafo["estados"] = datos[:8 * nodos].cast("Q")
+    grafo["niveles"] = datos[8 * nodos:12 * nodos].cast("I")
+    grafo["colores"] = datos[12 * nodos:13 * nodos]
+    if len(grafo["destinos"]) != aristas:
+        raise ValueError(f"Se esperaban {aristas} aristas y el archivo tiene {len(grafo['destinos'])}")
+    return grafo
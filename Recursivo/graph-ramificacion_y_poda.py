@@ -1,6 +1,11 @@
 import heapq
 import itertools
+import sys
 import time
+from collections import deque
+
+from escritor_grafo import abrir_escritor
+from tabla_movimientos import TABLA_EURISTICA, generar_movimientos_posibles
 
 class Disco:
     def __init__(self, tamanio):
@@ -33,13 +38,47 @@ class DiscoFragil(Disco):
 
 
 def estado_serializado(torres):
-    estado = []
-    for nombre in ["Origen", "Auxiliar", "Destino"]:
-        if nombre != "Origen":
-            estado.append(0)  # Separador al principio de cada torre
+    # 2 bits por disco con el índice de su torre ("Origen" = 0 no aporta bits)
+    estado = 0
+    for indice, nombre in ((1, "Auxiliar"), (2, "Destino")):
         for d in torres[nombre]:
-            estado.append(d.tamanio)
-    return tuple(estado)
+            estado |= indice << (2 * (d.tamanio - 1))
+    return estado
+
+
+def decodificar_estado(estado):
+    # Vuelve al formato de tupla (discos de cada torre separados por 0) para mostrarlo en el label
+    etiqueta = []
+    for indice in range(3):
+        if indice != 0:
+            etiqueta.append(0)
+        for tamanio in range(total_discos, 0, -1):
+            if (estado >> (2 * (tamanio - 1))) & 3 == indice:
+                etiqueta.append(tamanio)
+    return tuple(etiqueta)
+
+
+def estado_con_presupuestos(torres):
+    # estado_serializado y, por encima, los movimientos hechos por cada disco frágil (en base max_movimientos + 1,
+    # de menor a mayor tamaño): dos nodos con la misma clave son el mismo estado del problema
+    estado = estado_serializado(torres)
+    peso = 1 << (2 * total_discos)
+    for disco in sorted((d for pila in torres.values() for d in pila), key=lambda d: d.tamanio):
+        if isinstance(disco, DiscoFragil):
+            estado += disco.movimientos_realizados * peso
+            peso *= disco.max_movimientos + 1
+    return estado
+
+
+def etiqueta_con_presupuestos(estado):
+    # La tupla de decodificar_estado y los movimientos que le quedan a cada disco frágil, de menor a mayor
+    restantes = []
+    resto = estado >> (2 * total_discos)
+    for disco in sorted((d for pila in torres_iniciales.values() for d in pila), key=lambda d: d.tamanio):
+        if isinstance(disco, DiscoFragil):
+            restantes.append(disco.max_movimientos - resto % (disco.max_movimientos + 1))
+            resto //= disco.max_movimientos + 1
+    return f"{decodificar_estado(estado)} {restantes}"
 
 
 def copiar_torres(torres):
@@ -57,80 +96,31 @@ def copiar_torres(torres):
     return nuevas_torres
 
 
-def ordenar_por_euristica(torres, movimientos_posibles):
-    movimientos_posibles.sort(key=lambda mov: estimar_beneficio_movimiento(torres, mov), reverse=True)
-
-
-def estimar_beneficio_movimiento(torres, movimiento):
-    """Simula el movimiento y calcula cuantos discos quedan en la torre destino"""
-    origen, destino, disco = movimiento
-    torres[origen].pop()
-    torres[destino].append(disco)
-    ordenados = len(torres["Destino"]) # Discos ordenados en destino
-    torres[destino].pop()
-    torres[origen].append(disco)
-    return ordenados
-
-
-def generar_movimientos_posibles(torres):
-    movimientos = []
-    for origen in torres:
-        if not torres[origen]:
-            continue
-        disco = torres[origen][-1]
-        if not disco.puede_moverse():
-            continue
-        for destino in torres:
-            if origen == destino:
-                continue
-            if torres[destino] and torres[destino][-1].tamanio < disco.tamanio:
-                continue
-            movimientos.append((origen, destino, disco))
-    return movimientos
-
-
-def hanoi_arbol_coloreado_ramificacion_y_poda(torres, total_discos, movimientos, soluciones, visitados, mejor_solucion_len, graph_file, nivel=0, padre_id=None, visitados_local=None, contador_nodos=[0]):
+def hanoi_arbol_coloreado_ramificacion_y_poda(torres, total_discos, movimientos, soluciones, visitados, mejor_solucion_len, escritor, nivel=0, padre_id=None, visitados_local=None):
     if visitados_local is None:
         visitados_local = set()
 
     estado_actual = estado_serializado(torres)
-    contador_nodos[0] += 1
-    # ID único: estado + nivel + contador (pero el label solo muestra el estado)
-    nombre_nodo = f"{estado_actual}_n{nivel}_c{contador_nodos[0]}"
-    label = str(estado_actual)  # Label solo muestra el estado serializado
-    color = "black"
 
     if estado_actual in visitados:
-        color = "red"
-        graph_file.write(f'    "{nombre_nodo}" [label="{label}", color={color}];\n')
-        if padre_id is not None:
-            graph_file.write(f'    "{padre_id}" -> "{nombre_nodo}";\n')
+        escritor.nodo(estado_actual, "red", padre_id)
         return
     visitados.add(estado_actual)
 
     if mejor_solucion_len[0] is not None and len(movimientos) >= mejor_solucion_len[0]:
-        color = "red"
-        graph_file.write(f'    "{nombre_nodo}" [label="{label}", color={color}];\n')
-        if padre_id is not None:
-            graph_file.write(f'    "{padre_id}" -> "{nombre_nodo}";\n')
+        escritor.nodo(estado_actual, "red", padre_id)
         return
 
     if len(torres["Destino"]) == total_discos:
-        color = "blue"
         soluciones.append(list(movimientos))
         if mejor_solucion_len[0] is None or len(movimientos) < mejor_solucion_len[0]:
             mejor_solucion_len[0] = len(movimientos)
-        graph_file.write(f'    "{nombre_nodo}" [label="{label}", color={color}];\n')
-        if padre_id is not None:
-            graph_file.write(f'    "{padre_id}" -> "{nombre_nodo}";\n')
+        escritor.nodo(estado_actual, "blue", padre_id)
         return
 
-    movimientos_posibles = generar_movimientos_posibles(torres)
-    ordenar_por_euristica(torres, movimientos_posibles)
-        
-    graph_file.write(f'    "{nombre_nodo}" [label="{label}", color={color}];\n')
-    if padre_id is not None:
-        graph_file.write(f'    "{padre_id}" -> "{nombre_nodo}";\n')
+    movimientos_posibles = generar_movimientos_posibles(torres, TABLA_EURISTICA)
+
+    nodo_actual_id = escritor.nodo(estado_actual, "black", padre_id)
 
     for origen, destino, disco in movimientos_posibles:
         torres[origen].pop()
@@ -145,11 +135,10 @@ def hanoi_arbol_coloreado_ramificacion_y_poda(torres, total_discos, movimientos,
             soluciones,
             visitados.copy(),
             mejor_solucion_len,
-            graph_file,
+            escritor,
             nivel + 1,
-            nombre_nodo,  # Padre ahora tiene ID único (pero el label es limpio)
-            visitados_local,
-            contador_nodos
+            nodo_actual_id,
+            visitados_local
         )
 
         movimientos.pop()
@@ -159,6 +148,43 @@ def hanoi_arbol_coloreado_ramificacion_y_poda(torres, total_discos, movimientos,
 
 
 
+def grafo_de_estados(torres, escritor):
+    """
+    Recorre por anchura el espacio de estados (posición y movimientos restantes de los frágiles) en lugar del árbol
+    de búsqueda: cada estado se expande una sola vez, con todos sus movimientos legales como aristas y sin las podas
+    por camino de la búsqueda. El escritor tiene que ser un GrafoEstados.
+    """
+    pendientes = deque()
+    vistos = set()
+
+    def visitar(torres, padre_id, nivel):
+        # Arista desde el padre; las torres se copian solo la primera vez que aparece el estado
+        clave = estado_con_presupuestos(torres)
+        nodo_id = escritor.nuevo_nodo(padre_id, clave, nivel)
+        if clave not in vistos:
+            vistos.add(clave)
+            pendientes.append((copiar_torres(torres), clave, nodo_id, nivel))
+
+    visitar(torres, None, 0)
+    while pendientes:
+        torres, clave, nodo_id, nivel = pendientes.popleft()
+        if len(torres["Destino"]) == total_discos:
+            escritor.terminar_nodo(nodo_id, clave, "blue")
+            continue
+
+        color = "yellow"    # Sin movimientos legales: lo bloquean los discos frágiles
+        for origen, destino, disco in generar_movimientos_posibles(torres):
+            color = "black"
+            torres[origen].pop()
+            torres[destino].append(disco)
+            disco.mover()
+            visitar(torres, nodo_id, nivel + 1)
+            torres[destino].pop()
+            torres[origen].append(disco)
+            disco.deshacer_movimiento()
+        escritor.terminar_nodo(nodo_id, clave, color)
+
+
 # -------------------- EJECUCIÓN ------------------------
 
 total_discos = 3
@@ -171,24 +197,28 @@ torres_iniciales = {
 soluciones = []
 visitados = set()
 
-# En la parte de EJECUCIÓN (cambia solo la llamada a la función):
-with open("hanoi_arbol_colores_ramificacion_y_poda.dot", "w", encoding="utf-8") as f:
-    f.write("digraph Hanoi {\n")
-    f.write("    rankdir=TB;\n")
-    f.write("    node [shape=box, fontname=\"Arial\"];\n")
-    hanoi_arbol_coloreado_ramificacion_y_poda(
-        torres=copiar_torres(torres_iniciales), 
-        total_discos=total_discos, 
-        movimientos=[], 
-        soluciones=soluciones, 
-        visitados=visitados, 
-        mejor_solucion_len=[None], 
-        graph_file=f, 
-        nivel=0, 
-        padre_id=None, 
-        visitados_local=set(),
-        contador_nodos=[0]  # Contador inicializado aquí
-    )
-    f.write("}\n")
-
-print("\n✅ Archivo 'hanoi_arbol_colores_ramificacion_y_poda.dot' generado con jerarquía y colores.")
+# Con un argumento se elige el archivo de salida (".dot.gz" para comprimirlo, ".csr" para el formato binario).
+# Con --estados se escribe el grafo de estados (un nodo por posición y presupuestos, con todos sus movimientos) en
+# lugar del árbol: muestra el espacio de estados, no el árbol de búsqueda colapsado por estado.
+con_estados = "--estados" in sys.argv
+argumentos = [argumento for argumento in sys.argv[1:] if argumento != "--estados"]
+ruta_salida = argumentos[0] if argumentos else "hanoi_arbol_colores_ramificacion_y_poda.dot"
+if con_estados:
+    with abrir_escritor(ruta_salida, etiqueta_con_presupuestos, estados=True) as escritor:
+        grafo_de_estados(copiar_torres(torres_iniciales), escritor)
+else:
+    with abrir_escritor(ruta_salida, etiquetar=lambda estado: str(decodificar_estado(estado))) as escritor:
+        hanoi_arbol_coloreado_ramificacion_y_poda(
+            torres=copiar_torres(torres_iniciales), 
+            total_discos=total_discos, 
+            movimientos=[], 
+            soluciones=soluciones, 
+            visitados=visitados, 
+            mejor_solucion_len=[None], 
+            escritor=escritor, 
+            nivel=0, 
+            padre_id=None, 
+            visitados_local=set()
+        )
+
+print(f"\n✅ Archivo '{ruta_salida}' generado con jerarquía y colores.")
@@ -1,3 +1,6 @@
+from tabla_movimientos import empaquetar_movimiento, generar_movimientos_posibles
+
+
 class Disco:
     def __init__(self, tamanio):
         self.tamanio = tamanio
@@ -29,16 +32,24 @@ class DiscoFragil(Disco):
 
 
 def estado_serializado(torres):
-    estado = []
-    for nombre in ["Origen", "Auxiliar", "Destino"]:
-        if nombre != "Origen":
-            estado.append(0)  # Separador entre torres
+    # 2 bits por disco con el índice de su torre ("Origen" = 0 no aporta bits)
+    estado = 0
+    for indice, nombre in ((1, "Auxiliar"), (2, "Destino")):
         for d in torres[nombre]:
-            estado.append(d.tamanio)
-    return tuple(estado)
+            estado |= indice << (2 * (d.tamanio - 1))
+    return estado
 
 
-def hanoi_backtracking(torres, total_discos, movimientos, soluciones, visitados, mejor_solucion_len):
+def iter_soluciones(torres, total_discos, movimientos=None, visitados=None, mejor_solucion_len=None, empaquetados=False):
+    # Generador con el mismo recorrido que hanoi_backtracking: devuelve cada solución apenas la encuentra.
+    # Si se corta con break/close() se deshacen los movimientos pendientes y las torres quedan como estaban.
+    if movimientos is None:
+        movimientos = []
+    if visitados is None:
+        visitados = set()
+    if mejor_solucion_len is None:
+        mejor_solucion_len = [None]
+
     estado_actual = estado_serializado(torres)
 
     if estado_actual in visitados:
@@ -50,40 +61,34 @@ def hanoi_backtracking(torres, total_discos, movimientos, soluciones, visitados,
         return
 
     if len(torres["Destino"]) == total_discos:
-        soluciones.append(list(movimientos))
         # Actualizamos mejor solución
         if mejor_solucion_len[0] is None or len(movimientos) < mejor_solucion_len[0]:
             mejor_solucion_len[0] = len(movimientos)
+        yield [empaquetar_movimiento(m) for m in movimientos] if empaquetados else list(movimientos)
         return
 
-    for origen in torres:
-        if not torres[origen]:
-            continue
-        disco = torres[origen][-1]
-        for destino in torres:
-            if origen == destino:
-                continue
-            if torres[destino] and torres[destino][-1].tamanio < disco.tamanio:
-                continue
-            if not disco.puede_moverse():
-                continue
-
-            torres[origen].pop()
-            torres[destino].append(disco)
-            disco.mover()
-            movimientos.append((origen, destino, disco.tamanio))
-
-            hanoi_backtracking(
+    # Los movimientos legales salen de la tabla, en el mismo orden que los dos for sobre las torres
+    for origen, destino, disco in generar_movimientos_posibles(torres):
+        torres[origen].pop()
+        torres[destino].append(disco)
+        disco.mover()
+        movimientos.append((origen, destino, disco.tamanio))
+
+        try:
+            yield from iter_soluciones(
                 torres,
                 total_discos,
                 movimientos,
-                soluciones,
                 visitados.copy(),
-                mejor_solucion_len
+                mejor_solucion_len,
+                empaquetados
             )
-
+        finally:
             movimientos.pop()
             torres[destino].pop()
             disco.deshacer_movimiento()
             torres[origen].append(disco)
 
+
+def hanoi_backtracking(torres, total_discos, movimientos, soluciones, visitados, mejor_solucion_len):
+    soluciones.extend(iter_soluciones(torres, total_discos, movimientos, visitados, mejor_solucion_len))
@@ -1,5 +1,7 @@
 # prueba de Ramificacion ordenando como mejor camino el que tenga mas fichas colocadas en orden en la torre destino
 
+from tabla_movimientos import TABLA_EURISTICA, empaquetar_movimiento, generar_movimientos_posibles
+
 class Disco:
     def __init__(self, tamanio):
         self.tamanio = tamanio
@@ -31,62 +33,33 @@ class DiscoFragil(Disco):
 
 
 def estado_serializado(torres):
-    estado = []
-    for nombre in ["Origen", "Auxiliar", "Destino"]:
-        if nombre != "Origen":
-            estado.append(0)  # Separador entre torres
+    # 2 bits por disco con el índice de su torre ("Origen" = 0 no aporta bits)
+    estado = 0
+    for indice, nombre in ((1, "Auxiliar"), (2, "Destino")):
         for d in torres[nombre]:
-            estado.append(d.tamanio)
-    return tuple(estado)
-
-
-def ordenar_por_euristica(torres, movimientos_posibles):
-    movimientos_posibles.sort(key=lambda mov: obtener_cantidad_discos_ordenados(torres, mov), reverse=True)
-
-
-def obtener_cantidad_discos_ordenados(torres, movimiento):
-    """Simula el movimiento y calcula cuantos discos quedan en la torre destino"""
-    origen, destino, disco = movimiento
-    torres[origen].pop()
-    torres[destino].append(disco)
-    ordenados = len(torres["Destino"]) # Discos ordenados en destino
-    torres[destino].pop()
-    torres[origen].append(disco)
-    return ordenados
-
-
-def generar_movimientos_posibles(torres):
-    movimientos = []
-    for origen in torres:
-        if not torres[origen]:
-            continue
-        disco = torres[origen][-1]
-        if not disco.puede_moverse():
-            continue
-        for destino in torres:
-            if origen == destino:
-                continue
-            if torres[destino] and torres[destino][-1].tamanio < disco.tamanio:
-                continue
-            movimientos.append((origen, destino, disco))
-    return movimientos
+            estado |= indice << (2 * (d.tamanio - 1))
+    return estado
 
 
-def hanoi_backtracking(torres, total_discos, movimientos, soluciones, visitados):
+def iter_soluciones(torres, total_discos, movimientos=None, visitados=None, empaquetados=False):
+    # Generador con el mismo recorrido que hanoi_backtracking: devuelve cada solución apenas la encuentra.
+    # Si se corta con break/close() se deshacen los movimientos pendientes y las torres quedan como estaban.
+    if movimientos is None:
+        movimientos = []
+    if visitados is None:
+        visitados = set()
+
     estado_actual = estado_serializado(torres)
     if estado_actual in visitados:
         return
     visitados.add(estado_actual)
 
     if len(torres["Destino"]) == total_discos:
-        soluciones.append(list(movimientos))
+        yield [empaquetar_movimiento(m) for m in movimientos] if empaquetados else list(movimientos)
         return
 
-    movimientos_posibles = generar_movimientos_posibles(torres)
-
-    #Ordeno segun euristica,
-    ordenar_por_euristica(torres, movimientos_posibles)
-        
+    #Ordeno segun euristica: la tabla ya tiene los movimientos en ese orden
+    movimientos_posibles = generar_movimientos_posibles(torres, TABLA_EURISTICA)
 
     for origen, destino, disco in movimientos_posibles:
         torres[origen].pop()
@@ -94,16 +67,20 @@ def hanoi_backtracking(torres, total_discos, movimientos, soluciones, visitados)
         disco.mover()
         movimientos.append((origen, destino, disco.tamanio))
 
-        hanoi_backtracking(
-            torres,
-            total_discos,
-            movimientos,
-            soluciones,
-            visitados.copy()
-        )
+        try:
+            yield from iter_soluciones(
+                torres,
+                total_discos,
+                movimientos,
+                visitados.copy(),
+                empaquetados
+            )
+        finally:
+            movimientos.pop()
+            torres[destino].pop()
+            disco.deshacer_movimiento()
+            torres[origen].append(disco)
 
-        movimientos.pop()
-        torres[destino].pop()
-        disco.deshacer_movimiento()
-        torres[origen].append(disco)
 
+def hanoi_backtracking(torres, total_discos, movimientos, soluciones, visitados):
+    soluciones.extend(iter_soluciones(torres, total_discos, movimientos, visitados))
@@ -0,0 +1,88 @@
+TORRES = ("Origen", "Auxiliar", "Destino")
+INDICE_TORRE = {nombre: indice for indice, nombre in enumerate(TORRES)}
+DESTINO = 2
+
+
+def pares_legales(firma, bloqueadas, torres=3):
+    """
+    Pares (origen, destino) legales para una firma, en el orden de los dos for anidados sobre las torres (origen y
+    después destino, en el orden de TORRES).
+    Args:
+        firma (int): 2 bits por torre (en la posición 2 * índice) con el rango de su disco superior: 1 para la cima
+            más chica, 2 para la siguiente, 3 para la más grande y 0 si la torre está vacía.
+        bloqueadas (int): Un bit por torre cuyo disco superior no se puede mover (un frágil sin movimientos
+            restantes).
+    Returns:
+        tuple: Los pares (origen, destino) con los índices de las torres.
+    """
+    rangos = [(firma >> (2 * torre)) & 3 for torre in range(torres)]
+    pares = []
+    for origen in range(torres):
+        if not rangos[origen] or bloqueadas >> origen & 1:
+            continue
+        for destino in range(torres):
+            if origen == destino:
+                continue
+            # Un disco solo puede ir a una torre vacía o sobre uno más grande
+            if rangos[destino] and rangos[destino] < rangos[origen]:
+                continue
+            pares.append((origen, destino))
+    return tuple(pares)
+
+
+def ordenar_por_euristica(pares):
+    """
+    La heurística de los scripts de ramificación: primero los movimientos que dejan más discos en "Destino", y los
+    empates en el orden de los for (el sort es estable). Esa cuenta solo depende del par (entra a Destino, sale de
+    Destino o ninguna de las dos), así que no hace falta simular cada movimiento: la permutación se guarda en la
+    tabla.
+    """
+    return tuple(sorted(pares, key=lambda par: (par[1] == DESTINO) - (par[0] == DESTINO), reverse=True))
+
+
+# TABLA[firma << 3 | bloqueadas]: los pares legales ya resueltos, con los nombres de las torres. 64 firmas (13
+# posibles) por 8 máscaras. TABLA_EURISTICA tiene los mismos pares en el orden de ordenar_por_euristica.
+TABLA = [
+    tuple((TORRES[origen], TORRES[destino]) for origen, destino in pares_legales(indice >> 3, indice & 7))
+    for indice in range(64 * 8)
+]
+TABLA_EURISTICA = [
+    tuple((TORRES[origen], TORRES[destino]) for origen, destino in ordenar_por_euristica(pares_legales(indice >> 3, indice & 7)))
+    for indice in range(64 * 8)
+]
+
+
+def generar_movimientos_posibles(torres, tabla=TABLA):
+    """
+    Los movimientos legales con una sola consulta a la tabla: la firma sale de comparar los tres discos superiores
+    y los frágiles agotados se filtran con la máscara de torres bloqueadas.
+    Args:
+        torres (dict): Las torres, con las claves de TORRES.
+        tabla (list): TABLA (orden de los for anidados) o TABLA_EURISTICA (orden de ordenar_por_euristica).
+    Returns:
+        list: Tuplas (origen, destino, disco) con los nombres de las torres.
+    """
+    cimas = [torres[nombre][-1] if torres[nombre] else None for nombre in TORRES]
+    firma = 0
+    bloqueadas = 0
+    for torre, disco in enumerate(cimas):
+        if disco is None:
+            continue
+        # Rango de la cima: 1 más las cimas más chicas que ella
+        rango = 1
+        for otro in cimas:
+            if otro is not None and otro.tamanio < disco.tamanio:
+                rango += 1
+        firma |= rango << (2 * torre)
+        if not disco.puede_moverse():
+            bloqueadas |= 1 << torre
+    return [(origen, destino, torres[origen][-1]) for origen, destino in tabla[firma << 3 | bloqueadas]]
+
+
+def empaquetar_movimiento(movimiento):
+    """
+    Empaqueta un movimiento (origen, destino, tamaño) en un entero: 2 bits para cada torre (su índice en TORRES) y
+    el tamaño del disco por encima. Es el formato de las soluciones con empaquetados=True de todos los scripts.
+    """
+    origen, destino, tamanio = movimiento
+    return (tamanio << 4) | (INDICE_TORRE[origen] << 2) | INDICE_TORRE[destino]
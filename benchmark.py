@@ -0,0 +1,373 @@
+import argparse
+import inspect
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+BACKTRACKING = os.path.join("Entrega", "Backtracking-Recursivo")
+BRANCH_AND_BOUND = os.path.join("Entrega", "BranchAndBound-Iterativo")
+
+# nombre -> (carpeta, módulo, tipo, motor de resolver_lote). Cada corrida es un proceso nuevo con solo la carpeta del
+# motor en el path, así que los módulos con el mismo nombre en carpetas distintas no se pisan.
+MOTORES = {
+    "bt_e1": (BACKTRACKING, "e1_backtracking_estados_visitados", "backtracking", None),
+    "bt_e2": (BACKTRACKING, "e2_backtracking_sin_repeticion", "backtracking", None),
+    "bt_e3": (BACKTRACKING, "e3_backtracking_solucion_unica", "backtracking", None),
+    "bt_e4": (BACKTRACKING, "e4_backtracking_limite_movimientos", "backtracking", None),
+    "bt_e5": (BACKTRACKING, "e5_backtracking_nueva_serializacion", "backtracking", None),
+    "bt_e6": (BACKTRACKING, "e6_backtracking_iterativo", "backtracking", None),
+    "rec_ramificacion_y_poda": ("Recursivo", "ramificacion_y_poda", "backtracking", None),
+    "rec_solo_poda": ("Recursivo", "solo_poda", "backtracking", None),
+    "rec_solo_ramificacion": ("Recursivo", "solo_ramificacion", "backtracking", None),
+    "byb_e2": (BRANCH_AND_BOUND, "e2_byb_heuristica_mejorada", "branch_and_bound", None),
+    "byb_e3": (BRANCH_AND_BOUND, "e3_byb_sin_visitados", "branch_and_bound", None),
+    "byb_simple": (BRANCH_AND_BOUND, "resolver_lote", "lote", "simple"),
+    "byb_patrones": (BRANCH_AND_BOUND, "resolver_lote", "lote", "patrones"),
+    "byb_capas": (BRANCH_AND_BOUND, "resolver_lote", "lote", "capas"),
+    "byb_ida": (BRANCH_AND_BOUND, "resolver_lote", "lote", "ida"),
+    "byb_bidireccional": (BRANCH_AND_BOUND, "resolver_lote", "lote", "bidireccional"),
+    "byb_directo": (BRANCH_AND_BOUND, "resolver_lote", "lote", "directo"),
+}
+
+# Presupuestos de los discos frágiles según la cantidad de discos n (tamaño -> max_movimientos). En la solución
+# clásica el disco t se mueve 2^(n - t) veces.
+PATRONES = {
+    "comunes": lambda n: {},
+    "justos": lambda n: {t: 2 ** (n - t) for t in range(1, n + 1)},
+    "holgados": lambda n: {t: 2 ** (n - t + 1) for t in range(1, n + 1)},
+    "chico_fragil": lambda n: {1: 2 ** (n - 1)},
+}
+
+UMBRAL = 0.10       # Cambio relativo mínimo de la mediana para contar como regresión o mejora
+SIGMAS = 3.0        # ... y además tiene que superar esta cantidad de desvíos (MAD) de las dos corridas juntas
+
+
+class Disco:
+    def __init__(self, tamanio):
+        self.tamanio = tamanio
+
+    def puede_moverse(self):
+        return True
+
+    def mover(self):
+        pass
+
+    def deshacer_movimiento(self):
+        pass
+
+
+class DiscoFragil(Disco):
+    def __init__(self, tamanio, max_movimientos):
+        super().__init__(tamanio)
+        self.max_movimientos = max_movimientos
+        self.movimientos_realizados = 0
+
+    def puede_moverse(self):
+        return self.movimientos_realizados < self.max_movimientos
+
+    def mover(self):
+        self.movimientos_realizados += 1
+
+    def deshacer_movimiento(self):
+        self.movimientos_realizados -= 1
+
+
+def construir_torres(discos, patron):
+    fragiles = PATRONES[patron](discos)
+    return {
+        "Origen": [
+            DiscoFragil(t, fragiles[t]) if t in fragiles else Disco(t) for t in range(discos, 0, -1)
+        ],
+        "Auxiliar": [],
+        "Destino": [],
+    }
+
+
+def rss_pico_kb():
+    import resource
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico // 1024 if sys.platform == "darwin" else pico    # macOS lo da en bytes, Linux en KB
+
+
+def preparar_corrida(caso):
+    """
+    Importa el motor del caso y arma la llamada, sin correrla (la importación y las torres no se miden).
+    Returns:
+        callable: correr() -> dict con 'largo' (None sin solución) y, según el motor, 'nodos' o 'soluciones'.
+        Con caso["cache"] los motores de Branch and Bound pasan por esa cache_soluciones.CacheSoluciones (los de
+        backtracking no la usan).
+    """
+    carpeta, nombre_modulo, tipo, nombre_motor = MOTORES[caso["motor"]]
+    sys.path.insert(0, os.path.join(RAIZ, carpeta))
+    modulo = __import__(nombre_modulo)
+    discos = caso["discos"]
+    torres = construir_torres(discos, caso["patron"])
+    cache = None
+    if caso.get("cache") is not None and tipo != "backtracking":
+        cache_soluciones = __import__("cache_soluciones")
+        cache = cache_soluciones.CacheSoluciones(caso["cache"] or cache_soluciones.RUTA_CACHE)
+
+    if tipo == "backtracking":
+        parametros = inspect.signature(modulo.iter_soluciones).parameters
+        opcionales = {"movimientos": [], "visitados": set(), "copiar": False}
+        argumentos = {nombre: valor for nombre, valor in opcionales.items() if nombre in parametros}
+        if "max_movimientos_permitidos" in parametros and \
+                parametros["max_movimientos_permitidos"].default is inspect.Parameter.empty:
+            argumentos["max_movimientos_permitidos"] = (2 ** discos) * 2  # el mismo límite que pruebas_backtracking
+
+        def correr():
+            soluciones = 0
+            minimo = None
+            for solucion in modulo.iter_soluciones(torres, discos, **argumentos):
+                soluciones += 1
+                if minimo is None or len(solucion) < minimo:
+                    minimo = len(solucion)
+            return {"largo": minimo, "soluciones": soluciones}
+        return correr
+
+    if tipo == "branch_and_bound":
+        def correr():
+            solucion = modulo.hanoi_branch_and_bound(torres, cache=cache)
+            return {"largo": None if solucion is None else len(solucion)}
+        return correr
+
+    motor = modulo.MOTORES[nombre_motor]
+    if cache is not None:
+        motor = modulo.con_cache(motor, modulo.NOMBRES_CACHE[nombre_motor], cache)
+
+    def correr():
+        estadisticas = {}
+        solucion = motor(torres, estadisticas)
+        resultado = {"largo": None if solucion is None else len(solucion)}
+        if "nodos" in estadisticas:
+            resultado["nodos"] = estadisticas["nodos"]
+        elif "nodos_ida" in estadisticas:     # e5_byb_bidireccional cuenta cada lado por separado
+            resultado["nodos"] = estadisticas["nodos_ida"] + estadisticas["nodos_vuelta"]
+        if estadisticas.get("cache"):
+            resultado["cache"] = True
+        return resultado
+    return correr
+
+
+def ejecutar_caso(caso):
+    """
+    Corre una sola vez el caso en este proceso (lo llama el proceso hijo). En las corridas de tiempo solo se mide
+    perf_counter_ns alrededor del motor; en las de memoria se activa tracemalloc y se mide el pico de RSS.
+    """
+    correr = preparar_corrida(caso)
+    if caso["memoria"]:
+        import tracemalloc
+        rss_inicio = rss_pico_kb()
+        tracemalloc.start()
+        resultado = correr()
+        resultado["pico_python_kb"] = tracemalloc.get_traced_memory()[1] // 1024
+        tracemalloc.stop()
+        resultado["rss_inicio_kb"] = rss_inicio
+        resultado["rss_pico_kb"] = rss_pico_kb()
+    else:
+        inicio = time.perf_counter_ns()
+        resultado = correr()
+        resultado["ns"] = time.perf_counter_ns() - inicio
+    return resultado
+
+
+def correr_en_subproceso(caso, limite):
+    """
+    Returns:
+        dict: Lo que devolvió ejecutar_caso en el proceso hijo, o {'error': ...} si falló o pasó el 'limite' (segundos).
+    """
+    comando = [sys.executable, os.path.abspath(__file__), "--caso", json.dumps(caso)]
+    try:
+        proceso = subprocess.run(comando, capture_output=True, text=True, timeout=limite)
+    except subprocess.TimeoutExpired:
+        return {"error": "limite"}
+    if proceso.returncode != 0:
+        return {"error": (proceso.stderr.strip().splitlines() or ["código " + str(proceso.returncode)])[-1]}
+    return json.loads(proceso.stdout.strip().splitlines()[-1])
+
+
+def mad(valores):
+    """Desvío absoluto mediano: una medida de ruido que no se deja llevar por una corrida lenta aislada."""
+    mediana = statistics.median(valores)
+    return statistics.median(abs(valor - mediana) for valor in valores)
+
+
+def medir(motor, discos, patron, repeticiones, corridas_memoria, limite, calentar=True, cache=None):
+    """
+    Mide un caso de la matriz: una corrida de calentamiento (que, por ejemplo, deja generadas las tablas de
+    patrones en disco), 'repeticiones' corridas de tiempo y 'corridas_memoria' corridas de memoria, cada una en
+    su propio proceso. Si una corrida falla o pasa el límite, el caso se corta ahí. Con 'cache' (la ruta de una
+    cache_soluciones.CacheSoluciones, o "" para RUTA_CACHE) el calentamiento guarda la solución y las corridas
+    medidas la leen de ahí.
+    Returns:
+        dict: El resultado del caso, como se guarda en el JSON.
+    """
+    caso = {"motor": motor, "discos": discos, "patron": patron, "memoria": False}
+    resultado = {"motor": motor, "discos": discos, "patron": patron, "estado": "ok"}
+    if cache is not None:
+        caso["cache"] = cache
+
+    corridas = [correr_en_subproceso(caso, limite) for _ in range(1 if calentar else 0)]
+    for _ in range(repeticiones):
+        if any("error" in corrida for corrida in corridas):
+            break
+        corridas.append(correr_en_subproceso(caso, limite))
+    fallida = next((corrida for corrida in corridas if "error" in corrida), None)
+    if fallida is not None:
+        resultado["estado"] = fallida["error"]
+        return resultado
+    tiempos = [corrida["ns"] for corrida in corridas[1 if calentar else 0:]]
+    resultado.update(
+        tiempos_ns=tiempos,
+        mediana_ns=int(statistics.median(tiempos)),
+        minimo_ns=min(tiempos),
+        mad_ns=int(mad(tiempos)),
+    )
+    for clave in ("largo", "nodos", "soluciones", "cache"):
+        if clave in corridas[-1]:
+            resultado[clave] = corridas[-1][clave]
+
+    caso["memoria"] = True
+    memorias = [correr_en_subproceso(caso, limite) for _ in range(corridas_memoria)]
+    memorias = [memoria for memoria in memorias if "error" not in memoria]
+    if memorias:
+        for clave in ("rss_pico_kb", "rss_inicio_kb", "pico_python_kb"):
+            resultado[clave] = max(memoria[clave] for memoria in memorias)
+    return resultado
+
+
+def clave_caso(caso):
+    return caso["motor"], caso["discos"], caso["patron"]
+
+
+def comparar(resultados, base, umbral=UMBRAL, sigmas=SIGMAS):
+    """
+    Compara cada caso con el mismo (motor, discos, patrón) de 'base'. Un cambio de la mediana cuenta solo si
+    supera 'umbral' (relativo) y también 'sigmas' veces la suma de los MAD de las dos corridas, así que los casos
+    ruidosos necesitan un cambio mayor.
+    Returns:
+        list: Diccionarios con 'motor', 'discos', 'patron', 'base_ns', 'actual_ns', 'cambio' (relativo) y
+              'veredicto' ('regresion', 'mejora', 'igual', 'nodos_distintos' o 'sin_datos').
+    """
+    anteriores = {clave_caso(caso): caso for caso in base["casos"]}
+    comparaciones = []
+    for caso in resultados["casos"]:
+        anterior = anteriores.get(clave_caso(caso))
+        comparacion = {"motor": caso["motor"], "discos": caso["discos"], "patron": caso["patron"]}
+        comparaciones.append(comparacion)
+        if anterior is None or "mediana_ns" not in anterior or "mediana_ns" not in caso:
+            comparacion["veredicto"] = "sin_datos"
+            continue
+        base_ns, actual_ns = anterior["mediana_ns"], caso["mediana_ns"]
+        diferencia = actual_ns - base_ns
+        ruido = sigmas * (anterior["mad_ns"] + caso["mad_ns"])
+        comparacion.update(base_ns=base_ns, actual_ns=actual_ns, cambio=diferencia / base_ns if base_ns else 0.0)
+        if anterior.get("nodos") != caso.get("nodos") or anterior.get("largo") != caso.get("largo"):
+            comparacion["veredicto"] = "nodos_distintos"
+        elif abs(diferencia) > max(umbral * base_ns, ruido):
+            comparacion["veredicto"] = "regresion" if diferencia > 0 else "mejora"
+        else:
+            comparacion["veredicto"] = "igual"
+    return comparaciones
+
+
+def imprimir_comparacion(comparaciones):
+    iconos = {"regresion": "🔺", "mejora": "🔻", "igual": "▫️", "nodos_distintos": "⚠️", "sin_datos": "·"}
+    for comparacion in comparaciones:
+        linea = f"{iconos[comparacion['veredicto']]} {comparacion['motor']:<24} n={comparacion['discos']:<2} " \
+                f"{comparacion['patron']:<13}"
+        if "cambio" in comparacion:
+            linea += f" {comparacion['base_ns'] / 1e6:10.3f} ms -> {comparacion['actual_ns'] / 1e6:10.3f} ms " \
+                     f"({comparacion['cambio']:+.1%})"
+        print(f"{linea} {comparacion['veredicto']}")
+
+    por_motor = {}
+    for comparacion in comparaciones:
+        if comparacion["veredicto"] in ("regresion", "nodos_distintos"):
+            por_motor[comparacion["motor"]] = por_motor.get(comparacion["motor"], 0) + 1
+    if por_motor:
+        print("\n❌ Regresiones por motor: " + ", ".join(f"{motor}: {n}" for motor, n in sorted(por_motor.items())))
+    else:
+        print("\n✅ Sin regresiones")
+    return bool(por_motor)
+
+
+def entorno():
+    return {
+        "python": platform.python_version(),
+        "implementacion": platform.python_implementation(),
+        "plataforma": platform.platform(),
+        "procesador": platform.processor() or platform.machine(),
+        "nucleos": os.cpu_count(),
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Benchmark de todas las estrategias (motores x discos x presupuestos).")
+    parser.add_argument("-m", "--motores", nargs="+", default=sorted(MOTORES), choices=sorted(MOTORES), metavar="MOTOR",
+                        help="Motores a medir (por defecto, todos): " + ", ".join(sorted(MOTORES)))
+    parser.add_argument("-n", "--discos", nargs="+", type=int, default=[3, 4, 5], help="Cantidades de discos")
+    parser.add_argument("-f", "--patrones", nargs="+", default=sorted(PATRONES), choices=sorted(PATRONES),
+                        help="Patrones de presupuestos de los discos frágiles")
+    parser.add_argument("-r", "--repeticiones", type=int, default=5, help="Corridas de tiempo por caso")
+    parser.add_argument("--memoria", type=int, default=1, help="Corridas de memoria por caso (0 para no medirla)")
+    parser.add_argument("--limite", type=float, default=60.0, help="Segundos máximos por corrida")
+    parser.add_argument("-o", "--salida", help="Archivo JSON donde guardar los resultados")
+    parser.add_argument("--base", help="JSON de una corrida anterior para comparar")
+    parser.add_argument("--umbral", type=float, default=UMBRAL, help="Cambio relativo mínimo para marcar una regresión")
+    parser.add_argument("--comparar", nargs=2, metavar=("ACTUAL", "BASE"),
+                        help="Solo comparar dos JSON ya guardados, sin correr nada")
+    parser.add_argument("--cache", nargs="?", const="", default=None, metavar="RUTA",
+                        help="Resolver los motores de Branch and Bound a través de la cache de soluciones (por "
+                             "defecto, cache_soluciones.RUTA_CACHE)")
+    parser.add_argument("--caso", help=argparse.SUPPRESS)     # Uso interno: el proceso hijo de cada corrida
+    opciones = parser.parse_args(argumentos)
+
+    if opciones.caso is not None:
+        print(json.dumps(ejecutar_caso(json.loads(opciones.caso))))
+        return 0
+
+    if opciones.comparar is not None:
+        with open(opciones.comparar[0], encoding="utf-8") as actual, open(opciones.comparar[1], encoding="utf-8") as base:
+            return int(imprimir_comparacion(comparar(json.load(actual), json.load(base), opciones.umbral)))
+
+    resultados = {"entorno": entorno(), "casos": []}
+    for motor in opciones.motores:
+        for discos in opciones.discos:
+            for patron in opciones.patrones:
+                caso = medir(motor, discos, patron, opciones.repeticiones, opciones.memoria, opciones.limite,
+                             cache=opciones.cache)
+                resultados["casos"].append(caso)
+                if caso["estado"] != "ok":
+                    print(f"⚠️  {motor:<24} n={discos:<2} {patron:<13} {caso['estado']}")
+                    continue
+                memoria = f"   🚀 {caso['rss_pico_kb'] / 1024:.1f} MB RSS" if "rss_pico_kb" in caso else ""
+                nodos = f"   nodos: {caso['nodos']}" if "nodos" in caso else ""
+                nodos += "   (cache)" if caso.get("cache") else ""
+                print(f"🔹 {motor:<24} n={discos:<2} {patron:<13} 🕒 {caso['mediana_ns'] / 1e6:10.3f} ms "
+                      f"(± {caso['mad_ns'] / 1e6:.3f}){memoria}   largo: {caso['largo']}{nodos}")
+
+    if opciones.salida:
+        with open(opciones.salida, "w", encoding="utf-8") as archivo:
+            json.dump(resultados, archivo, indent=2)
+        print(f"\n✅ Resultados guardados en '{opciones.salida}'")
+    if opciones.base:
+        with open(opciones.base, encoding="utf-8") as archivo:
+            print()
+            return int(imprimir_comparacion(comparar(resultados, json.load(archivo), opciones.umbral)))
+    return 0
+
+
+# 🔽 Ejemplo de uso:
+#   python benchmark.py -m byb_simple byb_ida bt_e3 -n 3 4 5 -o resultados.json
+#   python benchmark.py -m byb_simple byb_ida bt_e3 -n 3 4 5 --base resultados.json
+#   python benchmark.py -m byb_simple byb_ida -n 5 6 --cache /tmp/soluciones.sqlite
+
+if __name__ == "__main__":
+    sys.exit(main())